@@ -0,0 +1,38 @@
+# Bytes served for the repo's photos before and after the image pipeline.
+#
+#   python -m benchmarks.bench_images
+
+import glob
+import os
+import tempfile
+import time
+
+from sibuskerz.images import ImagePipeline
+
+PHOTOS = sorted(glob.glob("*.png") + glob.glob("*.jpg") + glob.glob("*.JPG") + glob.glob("*.gif"))
+
+
+def main(width=640):
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = ImagePipeline(tmp)
+        before = after = 0
+        start = time.perf_counter()
+        for path in PHOTOS:
+            thumb = pipeline.thumbnail(path, width)
+            size, small = os.path.getsize(path), os.path.getsize(thumb)
+            before += size
+            after += small
+            print(f"{path:28} {size / 1024:8.0f} KB -> {small / 1024:6.0f} KB")
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in PHOTOS:
+            pipeline.thumbnail(path, width)
+        warm = time.perf_counter() - start
+
+    print(f"total {before / 1024:.0f} KB -> {after / 1024:.0f} KB ({after / before:.1%})")
+    print(f"first render {cold:.2f} s, cached lookups {warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# A shared performance with a dozen phones following: what one follower tick
+# (the timed fragment) costs, whether it touches the sheets, and that every
+# phone shows the driver's song after a move. Runs the real fragment through
+# streamlit's AppTest on the in-process fake sheets.
+#
+#   python -m benchmarks.bench_live [followers]
+
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_rerun import make_worksheets
+from sibuskerz.setlist import Setlist
+from views import resources
+
+ROUNDS = 5
+
+
+def _live_follower():
+    from views.performance import live_follower
+    live_follower()
+
+
+def follower(code, device):
+    resources.get_live_hub().join(code, device)  # what typing the code does
+    at = AppTest.from_function(_live_follower, default_timeout=60)
+    at.session_state["live_code"] = code
+    at.session_state["device_id"] = device
+    return at
+
+
+def main(n_followers=12):
+    worksheets = make_worksheets(2_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        resources.SNAPSHOT_DB = f"{tmp}/snapshots.sqlite3"
+        resources.get_worksheets = lambda: worksheets
+
+        song_index = resources.get_song_index(resources.get_repository())
+        live = resources.get_live_hub().start(Setlist.build(song_index, song_index.order[:ROUNDS + 1]), "driver")
+        phones = [follower(live.code, f"phone{i}") for i in range(n_followers)]
+        for at in phones:
+            at.run()
+
+        samples = []
+        calls = sum(ws.calls for ws in worksheets)
+        for _ in range(ROUNDS):
+            live.next()
+            expected = f"**{live.setlist.current.title}**"
+            for at in phones:
+                start = time.perf_counter()
+                at.run()
+                samples.append(time.perf_counter() - start)
+                assert any(expected in md.value for md in at.markdown), "follower missed the move"
+        calls = sum(ws.calls for ws in worksheets) - calls
+
+    ticks_per_second = n_followers / resources.FOLLOW_INTERVAL
+    tick = statistics.median(samples)
+    print(f"followers: {n_followers}, one tick every {resources.FOLLOW_INTERVAL}s each")
+    print(f"follower tick         {tick * 1000:7.1f}ms median, {max(samples) * 1000:.1f}ms max")
+    print(f"server time spent     {tick * ticks_per_second * 100:7.1f}% of one core")
+    print(f"sheet calls           {calls:7d}")
+    print(f"phones following      {live.following():7d}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,80 @@
+# Lyrics.ovh client against a local stub server with a slow upstream:
+# sequential vs concurrent lookups, then the same setlist from the cache.
+#
+#   python -m benchmarks.bench_lyrics_ovh [num_songs]
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+from sibuskerz.lyrics_ovh import LyricsClient, ResponseCache
+
+LATENCY = 0.2  # seconds per upstream request
+
+
+class StubLyricsOvh(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        StubLyricsOvh.hits += 1
+        time.sleep(LATENCY)
+        artist, title = [unquote(part) for part in self.path.split("/")[-2:]]
+        if title.startswith("missing"):
+            self._reply(404, {"error": "No lyrics found"})
+        elif title.startswith("flaky") and StubLyricsOvh.hits % 2:
+            self._reply(503, {"error": "busy"})
+        else:
+            self._reply(200, {"lyrics": f"lyrics of {title} by {artist}"})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(n=24):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLyricsOvh)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    pairs = [(f"Artist {i % 5}", f"{'missing' if i % 6 == 0 else 'flaky' if i % 7 == 0 else 'song'} {i}") for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential = LyricsClient(base_url, cache=ResponseCache(), backoff=0.01)
+        start = time.perf_counter()
+        for artist, title in pairs:
+            sequential.lookup(artist, title)
+        seq = time.perf_counter() - start
+
+        client = LyricsClient(base_url, cache=ResponseCache(f"{tmp}/cache.sqlite3"), backoff=0.01)
+        start = time.perf_counter()
+        results = client.lookup_many(pairs)
+        par = time.perf_counter() - start
+
+        # fresh client, same cache file: as after a restart
+        restarted = LyricsClient(base_url, cache=ResponseCache(f"{tmp}/cache.sqlite3"))
+        hits_before = StubLyricsOvh.hits
+        start = time.perf_counter()
+        cached = restarted.lookup_many(pairs)
+        warm = time.perf_counter() - start
+
+    server.shutdown()
+    print(f"songs:                  {n} ({LATENCY * 1000:.0f} ms upstream latency)")
+    print(f"sequential:             {seq:.2f} s")
+    print(f"concurrent:             {par:.2f} s")
+    print(f"cached after restart:   {warm * 1000:.1f} ms, {StubLyricsOvh.hits - hits_before} upstream requests")
+    print(f"found / not found:      {sum(r.found for r in results)} / {sum(r.status == 'not_found' for r in results)}")
+    print(f"served from cache:      {sum(r.cached for r in cached)}/{n}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 24)
@@ -0,0 +1,57 @@
+# Cold start from the local snapshot store, and Performance Mode reads while
+# the sheets are unreachable.
+#
+#   python -m benchmarks.bench_offline [num_songs]
+
+import sys
+import tempfile
+import time
+
+from benchmarks.data import make_records
+from benchmarks.fake_gspread import FakeWorksheet
+from sibuskerz.offline import SnapshotStore
+from sibuskerz.sheets import SheetRepository
+from sibuskerz.songs import SongIndex
+
+
+def make_repo(worksheets, path):
+    names = list(worksheets)
+    return SheetRepository(names, lambda: worksheets, store=SnapshotStore(path), store_names=names)
+
+
+def main(n=2_000):
+    records = make_records(n)
+    header = ["Title", "Artist", "Lyrics"]
+    lyrics_ws = FakeWorksheet("lyrics", header, ([r[h] for h in header] for r in records))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/snapshots.sqlite3"
+        # first run online fills the store
+        make_repo({"lyrics": lyrics_ws}, path).records("lyrics")
+
+        # next start has no network at all
+        lyrics_ws.offline = True
+        lyrics_ws.calls = 0
+        start = time.perf_counter()
+        repo = make_repo({"lyrics": lyrics_ws}, path)
+        repo.load_local()
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = repo.local("lyrics").derived("song_index", SongIndex)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for sid in index.order[:30]:  # a full set, song by song
+            repo.local("lyrics").derived("song_index", SongIndex).lyrics(sid)
+        walk = time.perf_counter() - start
+
+        print(f"songs:                     {n}")
+        print(f"load from local store:     {load * 1000:.1f} ms")
+        print(f"song index build:          {build * 1000:.1f} ms")
+        print(f"30-song walk:              {walk * 1000:.2f} ms")
+        print(f"sheet calls while offline: {lyrics_ws.calls}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
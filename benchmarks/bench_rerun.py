@@ -0,0 +1,140 @@
+# Per-interaction rerun cost: a full script run of lyrics.py (what every
+# keypress used to cost) against a run of just the fragment that owns the
+# widget, plus which worksheets each page reads. Runs the real app through
+# streamlit's AppTest on the in-process fake sheets.
+#
+#   python -m benchmarks.bench_rerun [num_songs]
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.data import MEMBERS, make_performances, make_records
+from benchmarks.fake_gspread import FakeSpreadsheet, FakeWorksheet
+from sibuskerz.setlist import Setlist
+from sibuskerz.songs import LYRICS_HEADER, lyrics_row
+from views import PAGES, resources
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lyrics.py")
+PASSWORD = "bench"
+PHOTOS = ["anuar.png", "com.png", "faizal.png", "halim.png", "kay.png", "midon.png", "mizio.jpg", "patrick-patrick-star.gif"]
+REPEAT = 7
+
+
+def make_worksheets(n):
+    spreadsheet = FakeSpreadsheet()
+    songs = make_records(n)
+    performances = make_performances(200).to_dict("records")
+    members_header = ["Name", "Role", "Bio", "Photo"]
+    videos_header = ["Title", "Description", "VideoLink"]
+    perf_header = ["ID", "Version", "Date", "Venue", "Status", "TotalToken", "SharedPerPerson",
+                   "EquipmentShare", "Notes", "Performers", "PaidStatus"]
+    return (
+        FakeWorksheet(resources.WORKSHEET_NAME1, LYRICS_HEADER,
+                      (lyrics_row(song["Title"], song["Artist"], song["Lyrics"]) for song in songs), spreadsheet),
+        FakeWorksheet(resources.WORKSHEET_NAME2, members_header,
+                      ([name, "Vocal", "", photo] for name, photo in zip(MEMBERS, PHOTOS)), spreadsheet),
+        FakeWorksheet(resources.WORKSHEET_NAME3, videos_header,
+                      ([f"Gig {i}", "", f"https://www.youtube.com/watch?v=vid{i:05d}"] for i in range(6)), spreadsheet),
+        FakeWorksheet(resources.WORKSHEET_NAME4, perf_header,
+                      ([f"p{i:08x}", 1, p["Date"], p["Venue"], p["Status"], p["TotalToken"], "", "", "",
+                        p["Performers"], ""] for i, p in enumerate(performances)), spreadsheet),
+    )
+
+
+def timed(fn, repeat=REPEAT):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def app(page):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets["admin_password"] = PASSWORD
+    at.run()
+    at.sidebar.selectbox[0].select(page).run()
+    return at
+
+
+# fragment scripts: exactly what a fragment rerun executes
+def _song_browser():
+    from views.view_lyrics import song_browser
+    song_browser()
+
+
+def _setlist_controller():
+    from views.performance import setlist_controller
+    setlist_controller()
+
+
+def _performance_form():
+    from views.resources import WORKSHEET_NAME2, WORKSHEET_NAME4, get_repository
+    from sibuskerz.performances import PerformanceTable
+    from views.tokens import performance_form
+    repo = get_repository()
+    performance_form(PerformanceTable(repo, WORKSHEET_NAME4), repo.frame(WORKSHEET_NAME2)["Name"].tolist())
+
+
+def fragment(script, **state):
+    at = AppTest.from_function(script, default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    return at
+
+
+def main(n=5_000):
+    worksheets = make_worksheets(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        # keep the benchmark's data out of the real .cache
+        resources.SNAPSHOT_DB = f"{tmp}/snapshots.sqlite3"
+        resources.LEDGER_DB = f"{tmp}/ledger.sqlite3"
+        resources.SETLIST_DB = f"{tmp}/setlists.sqlite3"
+        resources.IMAGE_CACHE_DIR = f"{tmp}/images"
+        resources.LYRICS_CACHE_DB = f"{tmp}/lyrics_ovh.sqlite3"
+        resources.get_worksheets = lambda: worksheets
+        os.chdir(os.path.dirname(APP))  # sidebar images and member photos
+
+        repo = resources.get_repository()
+        song_index = resources.get_song_index(repo)
+
+        print(f"songs: {n}\n")
+        print(f"{'page':<42} {'full run':>9}  worksheets read")
+        for label in PAGES:
+            at = app(label)
+            if at.text_input and at.text_input[0].label.startswith("Enter admin password"):
+                at.text_input[0].input(PASSWORD).run()
+            repo.invalidate()
+            before = [ws.calls for ws in worksheets]
+            at.run()
+            read = [ws.title for ws, calls in zip(worksheets, before) if ws.calls > calls]
+            print(f"{label:<42} {timed(at.run):>7.1f}ms  {', '.join(read) or '-'}")
+
+        print(f"\n{'interaction':<42} {'full run':>9} {'fragment':>9}")
+        at = app("📖 View Lyrics/Lihat Lirik")
+        at.text_input[0].input("cinta").run()
+        frag = fragment(_song_browser)
+        frag.text_input[0].input("cinta").run()
+        print(f"{'search keystroke (View Lyrics)':<42} {timed(at.run):>7.1f}ms {timed(frag.run):>7.1f}ms")
+
+        setlist = Setlist.build(song_index, song_index.order[:30])
+        at = app("🎤 Performance Mode")
+        at.session_state["setlist"] = setlist
+        frag = fragment(_setlist_controller, setlist=setlist)
+        print(f"{'next song (Performance Mode)':<42} {timed(at.run):>7.1f}ms {timed(frag.run):>7.1f}ms")
+
+        at = app("📍 Performance Venues & Tokens")
+        at.text_input[0].input(PASSWORD).run()
+        frag = fragment(_performance_form)
+        print(f"{'token form submit (Venues & Tokens)':<42} {timed(at.run):>7.1f}ms {timed(frag.run):>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,51 @@
+# Full-text search benchmark over a synthetic catalogue.
+#
+#   python -m benchmarks.bench_search [num_songs]
+
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.data import make_queries, make_records
+from sibuskerz.songs import SongIndex
+
+
+def main(n=10_000):
+    records = make_records(n)
+
+    start = time.perf_counter()
+    index = SongIndex(records)
+    build = time.perf_counter() - start
+
+    queries = make_queries(records)
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=50)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f"songs:          {n}")
+    print(f"index build:    {build:.2f} s")
+    print(f"queries:        {len(timings)}")
+    print(f"p50 / p95 / max {statistics.median(timings):.2f} / {p95:.2f} / {timings[-1]:.2f} ms")
+    print("target p95 < 10 ms:", "OK" if p95 < 10 else "MISSED")
+
+    rng = random.Random(2)
+    fuzzy = []
+    for _ in range(200):
+        title = records[rng.randrange(n)]["Title"].lower()
+        pos = rng.randrange(len(title))
+        typo = title[:pos] + title[pos + 1:]  # drop a letter
+        start = time.perf_counter()
+        index.closest(typo, k=10)
+        fuzzy.append((time.perf_counter() - start) * 1000)
+    fuzzy.sort()
+    print(f"fuzzy p50 / p95 {statistics.median(fuzzy):.2f} / {fuzzy[int(len(fuzzy) * 0.95)]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
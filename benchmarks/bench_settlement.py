@@ -0,0 +1,54 @@
+# Token settlement over synthetic performance history, against the original
+# apply/iterrows implementation from lyrics.py.
+#
+#   python -m benchmarks.bench_settlement [num_performances]
+
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.data import make_performances
+from sibuskerz.settlement import settle
+
+
+def legacy(done_perf):
+    done_perf = done_perf.copy()
+    done_perf["TotalToken"] = pd.to_numeric(done_perf["TotalToken"], errors="coerce").fillna(0)
+    done_perf["Performers"] = done_perf["Performers"].fillna("")
+    done_perf["NumPerformers"] = done_perf["Performers"].apply(
+        lambda x: len([p.strip() for p in x.split(",") if p.strip()])
+    )
+    done_perf["TotalShares"] = done_perf["NumPerformers"] + 1
+    done_perf["SharedPerPerson"] = done_perf.apply(
+        lambda row: round(row["TotalToken"] / row["TotalShares"], 2) if row["TotalShares"] > 0 else 0, axis=1
+    )
+    member_earnings = {}
+    for _, row in done_perf.iterrows():
+        performers = [name.strip() for name in str(row["Performers"]).split(",") if name.strip()]
+        for performer in performers:
+            member_earnings[performer] = member_earnings.get(performer, 0) + row["SharedPerPerson"]
+    return done_perf, member_earnings
+
+
+def main(n=50_000):
+    perf = make_performances(n)
+
+    start = time.perf_counter()
+    settlement = settle(perf)
+    fast = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, old_members = legacy(perf)
+    slow = time.perf_counter() - start
+
+    worst = max(abs(float(settlement.earned(m)) - total) for m, total in old_members.items())
+    print(f"performances:       {n}")
+    print(f"vectorised settle:  {fast * 1000:.0f} ms")
+    print(f"legacy apply loop:  {slow * 1000:.0f} ms ({slow / fast:.0f}x)")
+    print(f"total tokens:       RM {settlement.totals['total_token']}")
+    print(f"max member drift vs legacy float rounding: RM {worst:.4f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
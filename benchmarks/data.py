@@ -0,0 +1,105 @@
+# Synthetic, seeded data for the benchmarks: song catalogues (1k-100k songs),
+# band members, videos and years of performance history, and a fake
+# spreadsheet holding all four worksheets.
+
+import datetime
+import random
+
+import pandas as pd
+
+from benchmarks.fake_gspread import FakeSpreadsheet, FakeWorksheet
+from sibuskerz.songs import LYRICS_HEADER, lyrics_row
+
+WORDS = (
+    "cinta kasih rindu hati sayang bulan bintang malam hujan jalan pulang "
+    "kau aku dia kita selamanya jiwa mimpi air mata senyum lagu "
+    "love heart night rain dream forever baby tonight home road fire "
+    "light dance sky stay alone together never again remember"
+).split()
+
+MEMBERS = ["Anuar", "Com", "Faizal", "Halim", "Kay", "Midon", "Mizio", "Patrick", "Ayu", "Zul", "Ros", "Din"]
+
+MEMBERS_HEADER = ["Name", "Role", "Bio", "Photo"]
+VIDEOS_HEADER = ["Title", "Description", "VideoLink"]
+PERFORMANCES_HEADER = ["ID", "Version", "Date", "Venue", "Status", "TotalToken", "SharedPerPerson",
+                       "EquipmentShare", "Notes", "Performers", "PaidStatus"]
+
+
+def make_vocabulary(rng, size=6000):
+    # common words first, then a long tail of made-up ones (Zipf-like use)
+    syllables = ["ka", "si", "ra", "ma", "ti", "lu", "na", "be", "ri", "yo", "da", "hu", "an", "ng", "es"]
+    tail = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size * 2)}
+    vocab = WORDS + sorted(tail - set(WORDS))[:size]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    return vocab, weights
+
+
+def make_records(n, seed=1, lines=(20, 40)):
+    rng = random.Random(seed)
+    vocab, weights = make_vocabulary(rng)
+    records = []
+    for i in range(n):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title()
+        artist = f"Artist {rng.randint(1, n // 20 + 1)}"
+        text = [" ".join(rng.choices(vocab, weights, k=rng.randint(4, 9))) for _ in range(rng.randint(*lines))]
+        records.append({"Title": f"{title} {i}", "Artist": artist, "Lyrics": "\n".join(text)})
+    return records
+
+
+def make_queries(records, seed=2, n=200):
+    # a phrase from a random song's lyrics, and the prefix typed on the way
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        lyrics = records[rng.randrange(len(records))]["Lyrics"].split("\n")
+        line = rng.choice(lyrics).split()
+        queries.append(" ".join(line[:3]))
+        queries.append(line[0][:3])
+    return queries + ["Siti Nurhaliza", "kerana", "rindu", "cinta hati"]
+
+
+def make_performances(n, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        performers = rng.sample(MEMBERS, rng.randint(0, 6))
+        rows.append({
+            "Date": f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "Venue": f"Venue {rng.randint(1, 40)}",
+            "Status": "Done",
+            "TotalToken": rng.choice(["", rng.randint(0, 600), round(rng.uniform(0, 600), 2)]),
+            "Performers": " , ".join(performers),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_gigs(years, per_week=2, unpaid_weeks=8, seed=4, today=datetime.date(2025, 6, 30)):
+    # performances sheet rows, oldest first: everything before the last
+    # `unpaid_weeks` weeks is paid, and one upcoming gig at the end
+    rng = random.Random(seed)
+    rows = []
+    weeks = years * 52
+    for week in range(weeks):
+        for _ in range(per_week):
+            date = today - datetime.timedelta(weeks=weeks - week, days=rng.randint(0, 6))
+            performers = rng.sample(MEMBERS, rng.randint(2, 6))
+            token = round(rng.uniform(50, 600), 2)
+            paid = "Paid" if week < weeks - unpaid_weeks else ""
+            rows.append([f"p{len(rows):08x}", 1, str(date), f"Venue {rng.randint(1, 40)}", "Done", token,
+                         "", "", "", ", ".join(performers), paid])
+    rows.append([f"p{len(rows):08x}", 1, str(today + datetime.timedelta(days=7)), "Venue 1", "Upcoming",
+                 "", "", "", "", "", ""])
+    return rows
+
+
+def make_spreadsheet(songs=1_000, years=3, videos=60, latency=0.0, quota_rate=0.0, seed=1):
+    # the four worksheets the app reads, on one fake spreadsheet
+    spreadsheet = FakeSpreadsheet(latency=latency, quota_rate=quota_rate, seed=seed)
+    records = make_records(songs, seed=seed)
+    FakeWorksheet("lyrics", LYRICS_HEADER, (lyrics_row(r["Title"], r["Artist"], r["Lyrics"]) for r in records),
+                  spreadsheet)
+    FakeWorksheet("members", MEMBERS_HEADER, ([name, "Vocal", "", ""] for name in MEMBERS), spreadsheet)
+    FakeWorksheet("videos", VIDEOS_HEADER,
+                  ([f"Gig {i}", "", f"https://www.youtube.com/watch?v=v{i:010d}"] for i in range(videos)), spreadsheet)
+    FakeWorksheet("performances", PERFORMANCES_HEADER, make_gigs(years, seed=seed), spreadsheet)
+    return spreadsheet
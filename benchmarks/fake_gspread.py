@@ -0,0 +1,167 @@
+# In-process stand-in for the gspread worksheets the app uses, so the data
+# layer can be exercised without Google credentials or a network. Every call
+# can be slowed by a fixed latency and fail with a 429 quota error at a given
+# rate (seeded, so runs are repeatable). Reads count the characters they
+# return, a stand-in for the bytes Google would send.
+
+import random
+import re
+import time
+
+
+class FakeAPIError(Exception):
+    # what sibuskerz.writes.error_status looks for on a gspread APIError
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeSpreadsheet:
+    def __init__(self, latency=0.0, quota_rate=0.0, seed=0, sleep=time.sleep):
+        self.worksheets = {}
+        self.latency = latency  # seconds added to every call
+        self.quota_rate = quota_rate  # share of calls failing with 429
+        self.sleep = sleep
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.quota_errors = 0
+        self.chars_read = 0
+
+    def worksheet(self, title):
+        return next(ws for ws in self.worksheets.values() if ws.title == title)
+
+    def by_title(self):
+        return {ws.title: ws for ws in self.worksheets.values()}
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            self.sleep(self.latency)
+        if self.quota_rate and self.rng.random() < self.quota_rate:
+            self.quota_errors += 1
+            raise FakeAPIError(429, "Quota exceeded for quota metric 'Read requests'")
+
+    def batch_update(self, body):
+        for request in body["requests"]:
+            rng = request["deleteDimension"]["range"]
+            ws = self.worksheets[rng["sheetId"]]
+            ws._call()
+            del ws.rows[rng["startIndex"] - 1:rng["endIndex"] - 1]
+        return {}
+
+
+class FakeWorksheet:
+    def __init__(self, title, header, rows=(), spreadsheet=None):
+        self.title = title
+        self.spreadsheet = spreadsheet or FakeSpreadsheet()
+        self.id = len(self.spreadsheet.worksheets)
+        self.spreadsheet.worksheets[self.id] = self
+        self.header = list(header)
+        self.rows = [list(row) for row in rows]
+        self.offline = False
+        self.calls = 0
+
+    def _call(self):
+        self.calls += 1
+        if self.offline:
+            raise ConnectionError(f"{self.title}: network unreachable")
+        self.spreadsheet._call()
+
+    # --- reads ---
+    def get_all_records(self):
+        self._call()
+        width = len(self.header)
+        records = [dict(zip(self.header, list(row) + [""] * (width - len(row)))) for row in self.rows]
+        self._sent([self.header] + self.rows)
+        return records
+
+    def _sent(self, rows):
+        self.spreadsheet.chars_read += sum(len(str(value)) for row in rows for value in row)
+
+    def row_values(self, row):
+        self._call()
+        return list(self.header) if row == 1 else list(self.rows[row - 2])
+
+    def batch_get(self, ranges, **kwargs):
+        # "A5", "A5:D9", "D2:D" or "1:1"; like Sheets, values come back as
+        # strings with trailing empty cells and rows left out
+        self._call()
+        values = [self._range(label) for label in ranges]
+        for rows in values:
+            self._sent(rows)
+        return values
+
+    def _range(self, label):
+        first, _, last = label.partition(":")
+        row1, col1 = a1_to_rowcol(first)
+        row2, col2 = a1_to_rowcol(last or first)
+        lines = [self.header] + self.rows
+        row2 = min(row2 or len(lines), len(lines))
+        result = []
+        for line in lines[row1 - 1:row2]:
+            cells = [str(value) for value in line[(col1 or 1) - 1:col2 or None]]
+            while cells and cells[-1] == "":
+                cells.pop()
+            result.append(cells)
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    # --- writes ---
+    def append_row(self, values, **kwargs):
+        self._call()
+        self.rows.append(list(values))
+        return {}
+
+    def append_rows(self, values, **kwargs):
+        self._call()
+        self.rows.extend(list(row) for row in values)
+        return {}
+
+    def update_cell(self, row, col, value):
+        self._call()
+        self._set(row, col, value)
+        return {}
+
+    def update(self, values, range_name=None, **kwargs):
+        self._call()
+        self._update(values, range_name)
+        return {}
+
+    def _update(self, values, range_name):
+        row, col = a1_to_rowcol(range_name.split(":")[0])
+        for r, line in enumerate(values):
+            for c, value in enumerate(line):
+                self._set(row + r, col + c, value)
+
+    def batch_update(self, data, **kwargs):
+        self._call()
+        for item in data:
+            self._update(item["values"], item["range"])
+        return {}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._call()
+        end_index = end_index or start_index
+        del self.rows[start_index - 2:end_index - 1]
+        return {}
+
+    def _set(self, row, col, value):
+        if row == 1:
+            while len(self.header) < col:
+                self.header.append("")
+            self.header[col - 1] = value
+            return
+        line = self.rows[row - 2]
+        while len(line) < col:
+            line.append("")
+        line[col - 1] = value
+
+
+def a1_to_rowcol(label):
+    # 0 for a missing part: "D" is a whole column, "1" a whole row
+    letters, digits = re.match(r"([A-Z]*)(\d*)", label.upper()).groups()
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - ord("A") + 1
+    return int(digits or 0), col
@@ -0,0 +1,294 @@
+# Reproducible end-to-end benchmark suite on the fake spreadsheet: search,
+# settlement, the mark-as-paid flow, a Performance Mode walk-through and a
+# lyrics refresh after a handful of edits (full pull vs delta sync) and the
+# memory held by the song catalogue and by each performing session over
+# synthetic catalogues. Every run writes a JSON report; pass --compare with
+# an earlier report to see what changed.
+#
+#   python -m benchmarks.suite [--songs 1000,10000] [--years 3]
+#                              [--latency 0.05] [--quota-rate 0.02]
+#                              [--seed 1] [--out report.json] [--compare old.json]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.data import make_queries, make_spreadsheet
+from sibuskerz.catalogue import Catalogue
+from sibuskerz.delta import DeltaSync
+from sibuskerz.ledger import Ledger
+from sibuskerz.metrics import REGISTRY
+from sibuskerz.performances import PerformanceTable
+from sibuskerz.setlist import MAX_SONGS, Setlist
+from sibuskerz.settlement import settle
+from sibuskerz.sheets import SheetRepository
+from sibuskerz.songs import SongIndex, lyrics_row
+
+REPORT_DIR = ".cache/bench"
+NAMES = ["lyrics", "members", "videos", "performances"]
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentiles(samples):
+    p50, p95 = np.percentile(samples, [50, 95])
+    return {"p50_ms": ms(p50), "p95_ms": ms(p95), "max_ms": ms(max(samples))}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# --- SCENARIOS ---
+# each takes the bench context and returns {metric: number}
+
+def scenario_load(ctx):
+    snapshot, fetch = timed(ctx.repo.snapshot, "lyrics")
+    index, build = timed(snapshot.derived, "song_index", SongIndex)
+    return {"fetch_ms": ms(fetch), "index_build_ms": ms(build), "songs": len(index)}
+
+
+def scenario_search(ctx):
+    index = ctx.repo.snapshot("lyrics").derived("song_index", SongIndex)
+    queries = make_queries(ctx.repo.records("lyrics"), seed=ctx.seed)
+    samples = [timed(index.search, query)[1] for query in queries]
+    fuzzy = [timed(index.closest, query[::-1], 10)[1] for query in queries[:100]]
+    result = {f"search_{key}": value for key, value in percentiles(samples).items()}
+    result.update({f"fuzzy_{key}": value for key, value in percentiles(fuzzy).items()})
+    return result
+
+
+def unpaid(frame):
+    return frame[(frame["Status"] == "Done") & (frame["PaidStatus"] != "Paid")]
+
+
+def scenario_settlement(ctx):
+    frame = ctx.repo.frame("performances")
+    done = frame[frame["Status"] == "Done"]
+    unpaid_runs = [timed(settle, unpaid(frame))[1] for _ in range(5)]
+    history_runs = [timed(settle, done)[1] for _ in range(3)]
+    return {
+        "performances": len(done),
+        "unpaid": len(unpaid(frame)),
+        "settle_unpaid_ms": ms(statistics.median(unpaid_runs)),
+        "settle_history_ms": ms(statistics.median(history_runs)),
+    }
+
+
+def scenario_mark_as_paid(ctx):
+    # what the "mark all as paid" button does, ledger included
+    table = PerformanceTable(ctx.repo, "performances")
+    ledger = Ledger(os.path.join(ctx.tmp, "ledger.sqlite3"))
+    _, backfill = timed(ledger.backfill, table.snapshot().records)
+
+    done = unpaid(table.frame())
+    changes = {perf_id: {"PaidStatus": "Paid"} for perf_id in done["ID"]}
+    versions = dict(zip(done["ID"], done["Version"]))
+    report, write = timed(table.update_many, changes, versions)
+
+    start = time.perf_counter()
+    for _, row in done[["ID", "Date", "TotalToken", "Performers"]].iterrows():
+        ledger.record_paid(*row)
+    record = time.perf_counter() - start
+    return {
+        "rows": len(done),
+        "ok": int(report.ok),
+        "ledger_backfill_ms": ms(backfill),
+        "sheet_write_ms": ms(write),
+        "ledger_record_ms": ms(record),
+    }
+
+
+def scenario_performance_mode(ctx):
+    # pick a set from search results, then step through every song
+    index = ctx.repo.local("lyrics").derived("song_index", SongIndex)
+    picks = []
+    for query in make_queries(ctx.repo.records("lyrics"), seed=ctx.seed + 1)[:MAX_SONGS]:
+        picks.extend(sid for sid in index.search(query, limit=3) if sid not in picks)
+    setlist, build = timed(Setlist.build, index, picks[:MAX_SONGS])
+
+    steps = []
+    while not setlist.finished:
+        start = time.perf_counter()
+        setlist.current.html
+        setlist.upcoming
+        setlist.next()
+        steps.append(time.perf_counter() - start)
+    return {"songs": len(setlist), "build_ms": ms(build), **{f"step_{k}": v for k, v in percentiles(steps).items()}}
+
+
+def scenario_refresh(ctx):
+    # two warm copies of the lyrics, one refreshed with a full pull and one
+    # with the delta sync, after 10 songs were edited and 5 added
+    ws = ctx.spreadsheet.worksheet("lyrics")
+    repos = {}
+    for mode in ("full", "delta"):
+        repo = repos[mode] = SheetRepository(["lyrics"], ctx.spreadsheet.by_title)
+        delta = repo.use_delta(DeltaSync(repo, "lyrics"))
+        repo.snapshot("lyrics").derived("song_index", SongIndex)
+    for i in range(0, len(ws.rows), max(1, len(ws.rows) // 10))[:10]:
+        ws.rows[i] = lyrics_row(ws.rows[i][0], ws.rows[i][1], ws.rows[i][2] + "\nencore")
+    for i in range(5):
+        ws.rows.append(lyrics_row(f"Lagu Baru {i}", "Artist 1", "cinta kasih rindu"))
+
+    result = {}
+    for mode, repo in repos.items():
+        repo.invalidate("lyrics", full=mode == "full")
+        chars = ctx.spreadsheet.chars_read
+        snapshot, elapsed = timed(repo.snapshot, "lyrics")
+        index, build = timed(snapshot.derived, "song_index", SongIndex)
+        result[f"{mode}_ms"] = ms(elapsed + build)
+        result[f"{mode}_kb"] = round((ctx.spreadsheet.chars_read - chars) / 1024, 1)
+    result["rows_fetched"] = delta.last_report["fetched"]
+    return result
+
+
+def traced(fn, *args):
+    # -> (result, bytes still allocated by fn once it returns)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn(*args)
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def scenario_memory(ctx):
+    # the lyrics as plain records and as a compact catalogue, the song index,
+    # then what one more performing session adds on top
+    payload = json.dumps([dict(record) for record in ctx.repo.records("lyrics")])
+    result = {}
+    for mode, factory in (("plain", list), ("compact", Catalogue)):
+        records, held = traced(lambda: factory(json.loads(payload)))
+        result[f"{mode}_records_mb"] = round(held / 1e6, 2)
+    index, held = traced(SongIndex, records)
+    result["index_mb"] = round(held / 1e6, 2)
+    picks = index.order[::max(1, len(index) // MAX_SONGS)][:MAX_SONGS]
+    setlist, session = traced(Setlist.build, index, picks)
+    result["session_setlist_kb"] = round(session / 1024, 1)
+    return result
+
+
+SCENARIOS = {
+    "load": scenario_load,
+    "search": scenario_search,
+    "settlement": scenario_settlement,
+    "mark_as_paid": scenario_mark_as_paid,
+    "performance_mode": scenario_performance_mode,
+    "refresh": scenario_refresh,
+    "memory": scenario_memory,
+}
+
+
+class Context:
+    def __init__(self, songs, years, latency, quota_rate, seed, tmp):
+        self.seed = seed
+        self.tmp = tmp
+        self.spreadsheet = make_spreadsheet(songs, years, latency=latency, quota_rate=quota_rate, seed=seed)
+        self.repo = SheetRepository(NAMES, self.spreadsheet.by_title, compact={"lyrics": Catalogue})
+
+
+def run_size(songs, args, tmp):
+    ctx = Context(songs, args.years, args.latency, args.quota_rate, args.seed, os.path.join(tmp, str(songs)))
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        calls, quota_errors = ctx.spreadsheet.calls, ctx.spreadsheet.quota_errors
+        with REGISTRY.rerun(f"bench:{name}") as rerun:
+            start = time.perf_counter()
+            try:
+                result = scenario(ctx)
+            except Exception as exc:  # a quota error on a read is a result too
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            result["total_ms"] = ms(time.perf_counter() - start)
+        result["sheet_calls"] = ctx.spreadsheet.calls - calls
+        result["quota_errors"] = ctx.spreadsheet.quota_errors - quota_errors
+        result["api_calls"] = rerun["counters"].get("sheets_api_calls", 0)
+        results[name] = result
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    old = {}
+    for run in (baseline or {}).get("runs", []):
+        for scenario, metrics in run["scenarios"].items():
+            for metric, value in metrics.items():
+                old[(run["songs"], scenario, metric)] = value
+
+    for run in report["runs"]:
+        print(f"\n== {run['songs']} songs ==")
+        for scenario, metrics in run["scenarios"].items():
+            for metric, value in metrics.items():
+                line = f"{scenario + '.' + metric:<42} {value!s:>12}"
+                before = old.get((run["songs"], scenario, metric))
+                if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+                    line += f"   was {before!s:>10}  ({(value - before) / before:+.0%})"
+                print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite on the fake spreadsheet.")
+    parser.add_argument("--songs", default="1000,10000", help="comma-separated catalogue sizes (1k-100k)")
+    parser.add_argument("--years", type=int, default=3, help="years of performance history, two gigs a week")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every sheet call")
+    parser.add_argument("--quota-rate", type=float, default=0.0, help="share of sheet calls failing with 429")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help=f"report path (default: {REPORT_DIR}/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        },
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for songs in (int(n) for n in args.songs.split(",")):
+            report["runs"].append({"songs": songs, "scenarios": run_size(songs, args, tmp)})
+
+    out = args.out or os.path.join(REPORT_DIR, f"{report['meta']['created'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if baseline["meta"]["params"] != report["meta"]["params"]:
+            print("note: the baseline was run with different parameters")
+    print_report(report, baseline)
+    print(f"\nreport: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+
+from sibuskerz.cli import main
+
+sys.exit(main())
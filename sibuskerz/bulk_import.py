@@ -0,0 +1,123 @@
+import csv
+import io
+import re
+
+from sibuskerz.fuzzy import squash
+from sibuskerz.lyrics_ovh import FOUND, NOT_FOUND as LOOKUP_NOT_FOUND
+from sibuskerz.songs import LYRICS_HEADER, lyrics_row
+from sibuskerz.writes import WriteQueue
+
+# --- BULK SETLIST IMPORT ---
+# A pasted setlist or a CSV of title/artist pairs becomes new rows in the
+# lyrics sheet: duplicates (within the list and against the catalogue) are
+# skipped, missing lyrics are looked up concurrently on Lyrics.ovh and every
+# new song is written in a single append_rows request.
+
+ADDED = "added"
+DUPLICATE = "duplicate"
+NOT_FOUND = "not found"
+ERROR = "error"
+INVALID = "invalid"
+
+SEPARATOR_RE = re.compile(r"\s+(?:-|–|—|by)\s+", re.IGNORECASE)
+NUMBERING_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+
+class ImportItem:
+    def __init__(self, title, artist, lyrics=None, source=""):
+        self.title = title.strip()
+        self.artist = artist.strip()
+        self.lyrics = (lyrics or "").strip() or None
+        self.source = source  # original line, for the report
+        self.status = None
+        self.detail = ""
+
+    def as_row(self):
+        return {"Title": self.title, "Artist": self.artist, "Status": self.status, "Detail": self.detail}
+
+
+def parse_setlist(text):
+    # one song per line: "Title - Artist" (also "Title by Artist"); list
+    # numbering and bullets are ignored; the last separator splits, so a
+    # title may itself contain " - "
+    items = []
+    for line in text.splitlines():
+        line = NUMBERING_RE.sub("", line).strip()
+        if not line:
+            continue
+        parts = SEPARATOR_RE.split(line)
+        if len(parts) < 2:
+            item = ImportItem(line, "", source=line)
+            item.status, item.detail = INVALID, "expected 'Title - Artist'"
+        else:
+            separators = SEPARATOR_RE.findall(line)
+            title = line[: line.rfind(separators[-1])]
+            item = ImportItem(title, parts[-1], source=line)
+        items.append(item)
+    return items
+
+
+def parse_csv(data):
+    # needs Title and Artist columns (any case); Lyrics is optional
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    reader = csv.DictReader(io.StringIO(data))
+    columns = {name.strip().casefold(): name for name in reader.fieldnames or []}
+    if "title" not in columns or "artist" not in columns:
+        raise ValueError("CSV needs 'Title' and 'Artist' columns.")
+    items = []
+    for row in reader:
+        title = row.get(columns["title"]) or ""
+        artist = row.get(columns["artist"]) or ""
+        lyrics = row.get(columns["lyrics"]) if "lyrics" in columns else None
+        item = ImportItem(title, artist, lyrics, source=f"{title},{artist}")
+        if not item.title or not item.artist:
+            item.status, item.detail = INVALID, "missing title or artist"
+        items.append(item)
+    return items
+
+
+def import_songs(repo, name, items, song_index, client, on_progress=None, dry_run=False):
+    # returns (items with status/detail filled in, WriteReport or None)
+    seen = set()
+    pending = []
+    for item in items:
+        if item.status is not None:
+            continue
+        key = (squash(item.title), squash(item.artist))
+        duplicates = song_index.find_duplicates(item.title, item.artist)
+        if key in seen:
+            item.status, item.detail = DUPLICATE, "listed twice"
+        elif duplicates:
+            item.status, item.detail = DUPLICATE, f"already have '{song_index.label(duplicates[0])}'"
+        else:
+            seen.add(key)
+            pending.append(item)
+
+    lookups = [item for item in pending if item.lyrics is None]
+    results = client.lookup_many([(item.artist, item.title) for item in lookups], on_result=on_progress)
+    for item, result in zip(lookups, results):
+        if result.status == FOUND:
+            item.lyrics = result.lyrics
+        elif result.status == LOOKUP_NOT_FOUND:
+            item.status, item.detail = NOT_FOUND, "no lyrics on Lyrics.ovh"
+        else:
+            item.status, item.detail = ERROR, str(result.error)
+
+    new = [item for item in pending if item.status is None]
+    if not new or dry_run:
+        for item in new:
+            item.status, item.detail = ADDED, "dry run: would be added"
+        return items, None
+
+    queue = WriteQueue(repo, name)
+    for item in new:
+        row = lyrics_row(item.title, item.artist, item.lyrics)
+        queue.append(row, record=dict(zip(LYRICS_HEADER, row)))
+    report = queue.flush()
+    for item in new:
+        if report.ok:
+            item.status = ADDED
+        else:
+            item.status, item.detail = ERROR, report.summary()
+    return items, report
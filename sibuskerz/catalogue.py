@@ -0,0 +1,183 @@
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, MutableSequence
+
+import pandas as pd
+
+# --- COMPACT CATALOGUE ---
+# The lyrics snapshot is shared by every session, so it is kept compact: the
+# short columns are stored column by column (artists as category codes,
+# titles and the rest interned) and the lyrics are compressed, one zlib
+# stream per song, into a single contiguous buffer. A song's lyrics are only
+# decoded when something reads them: the search index once at build time,
+# then the song on screen. Sessions hold song ids and rows, never text.
+#
+# A Catalogue stands in for the list of dicts get_all_records returns (see
+# SheetRepository(compact=...)): rows are read-only mappings, and the
+# append / replace / remove patches of Snapshot work on it unchanged.
+
+LAZY_COLUMNS = ("Lyrics",)
+CATEGORICAL_COLUMNS = ("Artist",)
+ZDICT_SIZE = 4096  # bytes of sample lyrics primed into every stream
+COMPRESS_LEVEL = 6
+
+
+class TextStore:
+    # append-only: a replaced song's old bytes stay until the next rebuild,
+    # so a row handed out earlier still decodes to what it showed
+    def __init__(self, samples=()):
+        self.zdict = _train(samples)
+        self.blob = bytearray()
+        self.offsets = array("Q", [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return len(self.blob) + self.offsets.itemsize * len(self.offsets) + len(self.zdict)
+
+    def put(self, text):
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zdict=self.zdict) if self.zdict else zlib.compressobj(COMPRESS_LEVEL)
+        self.blob += compressor.compress(str(text).encode("utf-8")) + compressor.flush()
+        self.offsets.append(len(self.blob))
+        return len(self.offsets) - 2
+
+    def get(self, slot):
+        data = bytes(self.blob[self.offsets[slot]:self.offsets[slot + 1]])
+        decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+        return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+
+def _train(samples):
+    # evenly spread lyrics, most common material last (zlib favours the end)
+    samples = [str(text).encode("utf-8") for text in samples if text]
+    if not samples:
+        return b""
+    step = max(1, len(samples) // 16)
+    return b"".join(samples[::step])[-ZDICT_SIZE:]
+
+
+class Row(Mapping):
+    __slots__ = ("catalogue", "values")
+
+    def __init__(self, catalogue, values):
+        self.catalogue = catalogue
+        self.values = values  # header order; lazy columns hold a TextStore slot
+
+    def __getitem__(self, key):
+        i = self.catalogue.header_index[key]
+        if key in self.catalogue.lazy:
+            return self.catalogue.store.get(self.values[i])
+        return self.values[i]
+
+    def __iter__(self):
+        return iter(self.catalogue.header)
+
+    def __len__(self):
+        return len(self.catalogue.header)
+
+    def __repr__(self):
+        return f"Row({dict((key, self.values[i]) for i, key in enumerate(self.catalogue.header))})"
+
+
+class Catalogue(MutableSequence):
+    def __init__(self, records=(), lazy=LAZY_COLUMNS, categorical=CATEGORICAL_COLUMNS):
+        records = list(records)
+        self.lazy = set(lazy)
+        self.categorical = set(categorical)
+        self.header = []
+        self.header_index = {}
+        self.columns = {}  # name -> list, or array of codes / slots
+        self.categories = {}  # categorical name -> [values]
+        self._codes = {}  # categorical name -> {value: code}
+        self.store = TextStore(record.get(name) for record in records for name in self.lazy if name in record)
+        for record in records:
+            self.append(record)
+
+    def _add_column(self, name):
+        # a column first seen on a later record is blank for the earlier ones
+        n = len(self)
+        if name in self.lazy:
+            self.columns[name] = array("I", [self.store.put("")]) * n
+        elif name in self.categorical:
+            self.categories[name] = [""]
+            self._codes[name] = {"": 0}
+            self.columns[name] = array("I", [0]) * n
+        else:
+            self.columns[name] = [""] * n
+        self.header_index[name] = len(self.header)
+        self.header.append(name)
+
+    def _encode(self, name, value):
+        if name in self.lazy:
+            return self.store.put(value)
+        if name in self.categorical:
+            codes = self._codes[name]
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.categories[name])
+                self.categories[name].append(value)
+            return code
+        return sys.intern(value) if isinstance(value, str) else value
+
+    def _decode(self, name, value):
+        return self.categories[name][value] if name in self.categorical else value
+
+    def _encoded(self, record):
+        for name in record:
+            if name not in self.header_index:
+                self._add_column(name)
+        return [self._encode(name, record.get(name, "")) for name in self.header]
+
+    def copy(self):
+        # for a snapshot draft: columns are copied, the text store is shared
+        # (append-only, so rows of this catalogue keep decoding)
+        other = Catalogue.__new__(Catalogue)
+        other.lazy = self.lazy
+        other.categorical = self.categorical
+        other.header = list(self.header)
+        other.header_index = dict(self.header_index)
+        other.columns = {name: column[:] for name, column in self.columns.items()}
+        other.categories = {name: list(values) for name, values in self.categories.items()}
+        other._codes = {name: dict(codes) for name, codes in self._codes.items()}
+        other.store = self.store
+        return other
+
+    # --- sequence of rows ---
+    def __len__(self):
+        return len(self.columns[self.header[0]]) if self.header else 0
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        return Row(self, tuple(self._decode(name, self.columns[name][position]) for name in self.header))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __setitem__(self, position, record):
+        for name, value in zip(self.header, self._encoded(record)):
+            self.columns[name][position] = value
+
+    def __delitem__(self, position):
+        for column in self.columns.values():
+            del column[position]
+
+    def insert(self, position, record):
+        for name, value in zip(self.header, self._encoded(record)):
+            self.columns[name].insert(position, value)
+
+    def frame(self):
+        # titles, artists and the rest; lyrics stay compressed (read them a
+        # song at a time through the rows)
+        data = {}
+        for name in self.header:
+            if name in self.categorical:
+                data[name] = pd.Categorical.from_codes(self.columns[name], self.categories[name])
+            elif name not in self.lazy:
+                data[name] = self.columns[name]
+        return pd.DataFrame(data)
@@ -0,0 +1,292 @@
+# --- COMMAND LINE ---
+# Batch jobs without the app: list and search the catalogue, write song
+# books, settle and mark performances paid, reconcile the ledger with the
+# sheet, bulk import songs and refresh the offline copy. Uses the app's own
+# repository (sibuskerz.connect), so reads go through the snapshot cache, the
+# offline copy and the delta sync, and writes through the batched WriteQueue.
+# Every command streams one JSON object per line to stdout as results come
+# in; progress and the sheet call count go to stderr. Commands that write
+# take --dry-run.
+#
+#   python -m sibuskerz [--credentials key.json] [--offline] <command> ...
+#   python -m sibuskerz songs --search "cinta" --limit 20
+#   python -m sibuskerz export books/ --by artist --jobs 8
+#   python -m sibuskerz settle --mark-paid --dry-run
+#   python -m sibuskerz reconcile
+#   python -m sibuskerz import setlist.txt --dry-run
+#   python -m sibuskerz sync
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sibuskerz.bulk_import import import_songs, parse_csv, parse_setlist
+from sibuskerz.config import (
+    LEDGER_DB, LYRICS_CACHE_DB, OFFLINE_SHEETS, SETLIST_DB, WORKSHEET_NAME1, WORKSHEET_NAME4,
+)
+from sibuskerz.connect import load_service_account, open_repository, open_worksheets
+from sibuskerz.ledger import Ledger, posting
+from sibuskerz.lyrics_ovh import LyricsClient, ResponseCache
+from sibuskerz.performances import ID_COLUMN, PAID_COLUMN, PerformanceTable, StaleRowError
+from sibuskerz.setlist import SetlistSong, SetlistStore
+from sibuskerz.settlement import settle
+from sibuskerz.songbook import FORMATS, slug, write_book
+from sibuskerz.songs import SongIndex
+
+EXPORT_JOBS = min(8, (os.cpu_count() or 1) + 4)  # song books written at once
+
+
+class CommandError(Exception):
+    pass
+
+
+def song_index(repo, offline=False):
+    # the same derived index the app builds per lyrics snapshot
+    snapshot = repo.local(WORKSHEET_NAME1) if offline else repo.snapshot(WORKSHEET_NAME1)
+    return snapshot.derived("song_index", SongIndex)
+
+
+# --- CATALOGUE ---
+def cmd_songs(repo, args):
+    index = song_index(repo, args.offline)
+    sids = index.search(args.search, limit=args.limit) if args.search else index.order
+    for sid in sids[:args.limit]:
+        song = {"id": sid, "title": index.title(sid), "artist": index.artist(sid)}
+        if args.lyrics:
+            song["lyrics"] = index.lyrics(sid)
+        yield song
+
+
+def song_books(index, args):
+    # -> [(book title, setlist songs)]
+    if args.setlist:
+        setlist = SetlistStore(SETLIST_DB).load(args.setlist)
+        if setlist is None:
+            raise CommandError(f"No saved setlist called '{args.setlist}'.")
+        return [(args.setlist, setlist.refreshed(index).songs)]
+
+    sids = index.search(args.search) if args.search else index.order
+    if args.by == "all":
+        return [(args.title, [SetlistSong.from_index(index, sid) for sid in sids])]
+    groups = {}
+    for sid in sids:
+        groups.setdefault(index.artist(sid) or "Unknown artist", []).append(sid)
+    return [
+        (artist, [SetlistSong.from_index(index, sid) for sid in groups[artist]])
+        for artist in sorted(groups, key=str.casefold)
+    ]
+
+
+def cmd_export(repo, args):
+    # one file per book, written by a thread pool; lyrics are decoded by the
+    # worker writing the book, so nothing holds the whole catalogue as text
+    extension, _ = FORMATS[args.format]
+    jobs = []
+    paths = set()
+    for title, songs in song_books(song_index(repo, args.offline), args):
+        name, n = slug(title), 2
+        while name in paths:
+            name, n = f"{slug(title)}-{n}", n + 1
+        paths.add(name)
+        jobs.append((os.path.join(args.out, name + extension), title, songs))
+
+    if args.dry_run:
+        for path, title, songs in jobs:
+            yield {"book": title, "songs": len(songs), "path": path, "dry_run": True}
+        return
+
+    os.makedirs(args.out, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(write_book, path, title, songs, args.format): (path, title, songs)
+                   for path, title, songs in jobs}
+        for future in as_completed(futures):
+            path, title, songs = futures[future]
+            yield {"book": title, "songs": len(songs), "path": path, "bytes": future.result()}
+
+
+# --- SETTLEMENT ---
+def open_ledger(path, table):
+    ledger = Ledger(path)
+    if ledger.is_empty():
+        for perf_id, exc in ledger.backfill(table.snapshot().records):
+            print(f"{perf_id} not added to the ledger: {exc}", file=sys.stderr)
+    return ledger
+
+
+def cmd_settle(repo, args):
+    # what the Tokens page shows for unpaid performances; --mark-paid is its
+    # "mark all as paid" button
+    table = PerformanceTable(repo, WORKSHEET_NAME4)
+    if args.mark_paid and not args.dry_run:
+        migration = table.ensure_ids(extra_columns=[PAID_COLUMN])
+        if migration is not None and not migration.ok:
+            raise CommandError(f"Could not add the ID/Version columns: {migration.summary()}")
+
+    done = table.unpaid()
+    if done.empty:
+        yield {"kind": "totals", "performances": 0}
+        return
+    settlement = settle(done)
+    for member in settlement.members["Member"]:
+        yield {"kind": "member", "member": member, "earned": settlement.earned(member)}
+    yield {"kind": "totals", **settlement.totals}
+
+    if not args.mark_paid:
+        return
+    if args.dry_run:
+        for _, row in done.iterrows():
+            yield {"kind": "paid", "id": row.get(ID_COLUMN), "date": row.get("Date"), "dry_run": True}
+        return
+    try:
+        report = table.mark_paid(done, open_ledger(args.ledger, table))
+    except StaleRowError as exc:
+        raise CommandError(str(exc)) from None
+    if not report.ok:
+        raise CommandError(report.summary())
+    for perf_id, date in zip(done[ID_COLUMN], done["Date"]):
+        yield {"kind": "paid", "id": perf_id, "date": date}
+
+
+def cmd_reconcile(repo, args):
+    # the ledger against the sheet's Status/PaidStatus, one line per
+    # mismatch; the ledger is brought in line unless --dry-run. A gig the
+    # ledger has as paid but the sheet doesn't is only reported: payouts are
+    # never reversed automatically.
+    table = PerformanceTable(repo, WORKSHEET_NAME4)
+    ledger = Ledger(args.ledger)
+    states = ledger.states()
+    seen = set()
+    for record in table.snapshot().records:
+        perf_id = str(record.get(ID_COLUMN) or "")
+        if record.get("Status") != "Done" or not perf_id:
+            continue
+        seen.add(perf_id)
+        entry = (perf_id, record.get("Date"), record.get("TotalToken"), record.get("Performers"))
+        sheet = "paid" if record.get(PAID_COLUMN) == "Paid" else "unpaid"
+        status, fingerprint = states.get(perf_id, (None, None))
+        try:
+            posted = posting(*entry[1:])
+        except ValueError as exc:
+            # a date the ledger can't book; fixed in the sheet, not here
+            yield {"id": perf_id, "date": record.get("Date"), "sheet": sheet, "ledger": status, "issue": str(exc),
+                   "fixed": False}
+            continue
+
+        if status is None:
+            issue, fix = "missing from ledger", ledger.record_paid if sheet == "paid" else ledger.record_done
+        elif status == "paid":
+            if sheet == "paid":
+                continue
+            issue, fix = "paid in ledger only", None
+        elif sheet == "paid":
+            issue, fix = "not paid in ledger", ledger.record_paid
+        elif fingerprint != posted[3]:
+            issue, fix = "edited since settled", ledger.record_done
+        else:
+            continue
+
+        fixed = fix is not None and not args.dry_run
+        if fixed:
+            fix(*entry)
+        yield {"id": perf_id, "date": record.get("Date"), "sheet": sheet, "ledger": status, "issue": issue,
+               "fixed": fixed}
+
+    for perf_id in sorted(set(states) - seen):
+        yield {"id": perf_id, "sheet": None, "ledger": states[perf_id][0], "issue": "not a Done row in the sheet",
+               "fixed": False}
+
+
+# --- SHEETS ---
+def cmd_import(repo, args):
+    with open(args.file, "rb") as f:
+        data = f.read()
+    try:
+        items = parse_csv(data) if args.file.lower().endswith(".csv") else parse_setlist(data.decode("utf-8-sig"))
+    except ValueError as exc:
+        raise CommandError(str(exc)) from None
+
+    def progress(done, total, result):
+        print(f"lyrics lookup {done}/{total}: {result.title} - {result.artist}", file=sys.stderr)
+
+    client = LyricsClient(cache=ResponseCache(LYRICS_CACHE_DB))
+    items, report = import_songs(repo, WORKSHEET_NAME1, items, song_index(repo), client,
+                                 on_progress=progress, dry_run=args.dry_run)
+    for item in items:
+        yield item.as_row()
+    if report is not None and not report.ok:
+        raise CommandError(report.summary())
+
+
+def cmd_sync(repo, args):
+    # what the app's background sync does: refresh the offline copy
+    for name in OFFLINE_SHEETS:
+        snapshot = repo.refresh(name)
+        yield {"sheet": name, "rows": len(snapshot.records)}
+
+
+COMMANDS = {
+    "songs": cmd_songs,
+    "export": cmd_export,
+    "settle": cmd_settle,
+    "reconcile": cmd_reconcile,
+    "import": cmd_import,
+    "sync": cmd_sync,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m sibuskerz", description="SIBuskerz batch jobs.")
+    parser.add_argument("--credentials", help="service account key file (default: .streamlit/secrets.toml)")
+    parser.add_argument("--offline", action="store_true", help="read songs from the offline copy only")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    songs = commands.add_parser("songs", help="list or search the catalogue")
+    songs.add_argument("--search", help="full-text search over title, artist and lyrics")
+    songs.add_argument("--limit", type=int)
+    songs.add_argument("--lyrics", action="store_true", help="include the lyrics")
+
+    export = commands.add_parser("export", help="write song books")
+    export.add_argument("out", help="output directory")
+    export.add_argument("--by", choices=["artist", "all"], default="artist", help="one book per artist, or one book")
+    export.add_argument("--title", default="SIBuskerz Song Book", help="book title with --by all")
+    export.add_argument("--search", help="only songs matching this search")
+    export.add_argument("--setlist", help="one book from a saved setlist")
+    export.add_argument("--format", choices=sorted(FORMATS), default="html")
+    export.add_argument("--jobs", type=int, default=EXPORT_JOBS, help="books written in parallel")
+    export.add_argument("--dry-run", action="store_true")
+
+    settle_ = commands.add_parser("settle", help="settle unpaid performances")
+    settle_.add_argument("--mark-paid", action="store_true", help="then mark them paid, sheet and ledger")
+    settle_.add_argument("--ledger", default=LEDGER_DB)
+    settle_.add_argument("--dry-run", action="store_true")
+
+    reconcile = commands.add_parser("reconcile", help="bring the ledger in line with the performances sheet")
+    reconcile.add_argument("--ledger", default=LEDGER_DB)
+    reconcile.add_argument("--dry-run", action="store_true")
+
+    import_ = commands.add_parser("import", help="add songs from a setlist (.txt) or CSV")
+    import_.add_argument("file")
+    import_.add_argument("--dry-run", action="store_true")
+
+    commands.add_parser("sync", help="refresh the offline copy of the sheets")
+    return parser
+
+
+def main(argv=None, repo=None):
+    # repo: an already opened SheetRepository (tests, benchmarks)
+    args = build_parser().parse_args(argv)
+    if repo is None:
+        credentials = args.credentials
+        repo = open_repository(lambda: open_worksheets(load_service_account(credentials)))
+    baseline = dict(repo.stats)
+    try:
+        for result in COMMANDS[args.command](repo, args):
+            print(json.dumps(result, ensure_ascii=False, default=str), flush=True)
+    except (CommandError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        print(f"sheet calls: {repo.stats_since(baseline)['api_calls']}", file=sys.stderr)
+    return 0
@@ -0,0 +1,22 @@
+# --- CONFIG ---
+# Where the band's data lives. Shared by the Streamlit app (views.resources)
+# and the command line (sibuskerz.cli), so both read the same sheets and the
+# same local caches.
+
+SHEET_ID = "1xDkePn-ka6xvfoInEGe0PRWLPd39j7fhigQNEpOFkDw"
+WORKSHEET_NAME1 = "lyrics"
+WORKSHEET_NAME2 = "members"
+WORKSHEET_NAME3 = "videos"
+WORKSHEET_NAME4 = "performances"
+WORKSHEET_NAMES = [WORKSHEET_NAME1, WORKSHEET_NAME2, WORKSHEET_NAME3, WORKSHEET_NAME4]
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+SECRETS_FILE = ".streamlit/secrets.toml"  # holds gcp_service_account for the app
+CACHE_TTL = 300  # seconds a sheet snapshot is reused before refetching
+SHEETS_TIMEOUT = 15  # seconds before a Sheets API call is given up
+SNAPSHOT_DB = ".cache/snapshots.sqlite3"  # offline copy of the sheets below
+OFFLINE_SHEETS = [WORKSHEET_NAME1, WORKSHEET_NAME2, WORKSHEET_NAME3]
+SYNC_INTERVAL = 120  # seconds between background syncs of the offline copy
+LEDGER_DB = ".cache/ledger.sqlite3"  # running member earnings
+IMAGE_CACHE_DIR = ".cache/images"  # resized WebP copies of the photos
+LYRICS_CACHE_DB = ".cache/lyrics_ovh.sqlite3"  # Lyrics.ovh responses
+SETLIST_DB = ".cache/setlists.sqlite3"  # saved setlists for repeat gigs
@@ -0,0 +1,66 @@
+import json
+import os
+import tomllib
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+from sibuskerz import metrics
+from sibuskerz.catalogue import Catalogue
+from sibuskerz.config import (
+    CACHE_TTL, OFFLINE_SHEETS, SCOPES, SECRETS_FILE, SHEET_ID, SHEETS_TIMEOUT, SNAPSHOT_DB, WORKSHEET_NAME1,
+    WORKSHEET_NAMES,
+)
+from sibuskerz.delta import DeltaSync
+from sibuskerz.offline import SnapshotStore
+from sibuskerz.sheets import SheetRepository
+
+# --- OPENING THE SHEETS ---
+# The one place that turns a service account into worksheets and worksheets
+# into the repository every page and command reads through: snapshot cache,
+# offline copy, compact lyrics catalogue and delta refresh. No Streamlit here;
+# the app passes st.secrets in, the command line a key file.
+
+
+def load_service_account(path=None):
+    # a service account key file (JSON), or gcp_service_account from the
+    # app's secrets file; GOOGLE_APPLICATION_CREDENTIALS is used if no path
+    path = path or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS") or SECRETS_FILE
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No credentials at {path}; pass a service account key file.")
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            secrets = tomllib.load(f)
+        if "gcp_service_account" not in secrets:
+            raise ValueError(f"{path} has no [gcp_service_account] section.")
+        return dict(secrets["gcp_service_account"])
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_worksheets(service_account, sheet_id=SHEET_ID, names=WORKSHEET_NAMES, on_response=None):
+    # -> {name: worksheet}; on_response is a requests hook seeing every HTTP call
+    creds = Credentials.from_service_account_info(service_account, scopes=SCOPES)
+    client = gspread.authorize(creds)
+    client.set_timeout(SHEETS_TIMEOUT)
+    if on_response is not None:
+        client.http_client.session.hooks["response"].append(on_response)
+    with metrics.span("sheets.open"):
+        sheet = client.open_by_key(sheet_id)
+        return {name: sheet.worksheet(name) for name in names}
+
+
+def open_repository(open_worksheets, names=WORKSHEET_NAMES, snapshot_db=SNAPSHOT_DB, ttl=CACHE_TTL):
+    # open_worksheets: () -> {name: worksheet}, called on first sheet access
+    repo = SheetRepository(
+        names,
+        open_worksheets,
+        ttl=ttl,
+        store=SnapshotStore(snapshot_db),
+        store_names=OFFLINE_SHEETS,
+        compact={WORKSHEET_NAME1: Catalogue},  # one compressed copy of the lyrics for all sessions
+    )
+    # lyrics refresh by fetching only new or changed rows
+    repo.use_delta(DeltaSync(repo, WORKSHEET_NAME1))
+    repo.load_local()
+    return repo
@@ -0,0 +1,206 @@
+import difflib
+import hashlib
+import time
+
+from gspread.utils import numericise, numericise_all, rowcol_to_a1
+
+from sibuskerz import metrics
+from sibuskerz.writes import with_retry
+
+# --- DELTA SYNC ---
+# A full refresh of the lyrics sheet downloads every lyric of every song. Each
+# row also carries a hash of its content (the Hash column), so a refresh first
+# reads only the header and the title, artist and hash columns, diffs them
+# against the cached snapshot and then fetches just the new or changed rows in
+# one batch_get. The snapshot and its song index are patched (on a draft
+# copy, see Snapshot.draft) rather than rebuilt, so refresh time and transfer
+# follow the size of the change, not the catalogue.
+#
+# Our own writes fill the hash in (see sibuskerz.songs.lyrics_row). Edits made
+# by hand in the Sheets UI don't, so every FULL_SYNC_EVERY seconds, and on an
+# explicit refresh, a full pull re-checks every hash and rewrites wrong ones.
+
+HASH_COLUMN = "Hash"
+FULL_SYNC_EVERY = 3600  # seconds between full pulls
+MAX_FETCH_SHARE = 0.25  # past this share of changed rows a full pull is cheaper
+MAX_PATCHES = 200  # past this many changed rows, rebuild instead of patching
+
+
+def row_hash(values):
+    # prefixed so Sheets never reads it back as a number
+    text = "\x1f".join(str(value) for value in values)
+    return "h" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def column_letter(col):
+    return rowcol_to_a1(1, col)[:-1]
+
+
+class FullSyncNeeded(Exception):
+    pass
+
+
+class DeltaSync:
+    def __init__(self, repo, name, key_columns=("Title", "Artist"), hash_column=HASH_COLUMN,
+                 full_every=FULL_SYNC_EVERY, clock=time.monotonic):
+        self.repo = repo
+        self.name = name
+        self.hash_column = hash_column
+        self.meta_columns = [*key_columns, hash_column]
+        self.full_every = full_every
+        self.clock = clock
+        self.last_full = clock()  # the local copy was checked when it was saved
+        self.force_full = False
+        self.last_report = None
+
+    def wants_full(self, snap):
+        if self.force_full or not snap.records or self.clock() - self.last_full >= self.full_every:
+            return True
+        return not all(column in snap.records[0] for column in self.meta_columns)
+
+    def hash_of(self, record):
+        return row_hash(value for column, value in record.items() if column != self.hash_column)
+
+    def _meta(self, record):
+        return tuple(str(record.get(column, "")) for column in self.meta_columns)
+
+    # --- INCREMENTAL PULL ---
+    def sync(self, snap):
+        # -> the new records, or a patched draft of snap (snap itself when
+        # nothing changed)
+        header = list(snap.records[0])
+        ws = self.repo.worksheet(self.name)
+        letters = [column_letter(header.index(column) + 1) for column in self.meta_columns]
+        with metrics.span("sheets.delta_meta"):
+            first, *columns = with_retry(ws.batch_get, ["1:1"] + [f"{L}2:{L}" for L in letters],
+                                         on_attempt=self.repo.count_call)
+        if not first or first[0] != header:
+            raise FullSyncNeeded("the header row changed")
+
+        n = max(len(values) for values in columns)
+        cells = [[_cell(row[0]) if row else "" for row in values] + [""] * (n - len(values)) for values in columns]
+        remote = list(zip(*cells))
+        local = [self._meta(record) for record in snap.records]
+
+        ops = _diff(local, remote)
+        wanted = [j for _, _, _, j1, j2 in ops for j in range(j1, j2)]
+        if len(wanted) > MAX_FETCH_SHARE * len(remote):
+            raise FullSyncNeeded(f"{len(wanted)} of {len(remote)} rows changed")
+        fetched = self._fetch_rows(ws, header, wanted)
+
+        removed = sum(max(0, (i2 - i1) - (j2 - j1)) for _, i1, i2, j1, j2 in ops)
+        metrics.count("delta_rows_fetched", len(wanted))
+        self.last_report = {"mode": "delta", "rows": len(remote), "fetched": len(wanted), "removed": removed}
+
+        # rows inserted above the end of the sheet shift every position after
+        # them, which the patch methods don't model
+        in_place = len(wanted) + removed <= MAX_PATCHES and all(
+            i2 == len(local) for _, i1, i2, j1, j2 in ops if j2 - j1 > i2 - i1
+        )
+        if not in_place:
+            records = []
+            previous = 0
+            for _, i1, i2, j1, j2 in ops:
+                records.extend(snap.records[previous:i1])
+                records.extend(fetched[j] for j in range(j1, j2))
+                previous = i2
+            records.extend(snap.records[previous:])
+            return records
+
+        if not ops:
+            return snap
+        # bottom-up, so each step leaves the positions of the earlier ones alone
+        draft = snap.draft()
+        for _, i1, i2, j1, j2 in reversed(ops):
+            common = min(i2 - i1, j2 - j1)
+            for position in range(i2 - 1, i1 + common - 1, -1):
+                draft.remove(position)
+            for k in range(common):
+                draft.replace(i1 + k, fetched[j1 + k])
+            for j in range(j1 + common, j2):
+                draft.append(fetched[j])
+        return draft
+
+    def _fetch_rows(self, ws, header, wanted):
+        # one range per run of consecutive rows, all in one request
+        runs = []
+        for j in wanted:
+            if runs and runs[-1][1] == j - 1:
+                runs[-1][1] = j
+            else:
+                runs.append([j, j])
+        if not runs:
+            return {}
+        last = column_letter(len(header))
+        ranges = [f"A{start + 2}:{last}{end + 2}" for start, end in runs]
+        with metrics.span("sheets.delta_rows"):
+            results = with_retry(ws.batch_get, ranges, on_attempt=self.repo.count_call)
+        fetched = {}
+        for (start, end), rows in zip(runs, results):
+            rows = list(rows) + [[]] * (end - start + 1 - len(rows))
+            for j, row in zip(range(start, end + 1), rows):
+                values = numericise_all(list(row) + [""] * (len(header) - len(row)))
+                fetched[j] = dict(zip(header, values))
+        return fetched
+
+    # --- FULL PULL ---
+    def full_loaded(self, records):
+        # fill in missing or outdated hashes after get_all_records, in one
+        # batched write; a failure only means the next full pull tries again
+        self.last_full = self.clock()
+        self.force_full = False
+        self.last_report = {"mode": "full", "rows": len(records), "hashes_written": 0}
+        if not records:
+            return
+        header = list(records[0])
+        col = header.index(self.hash_column) + 1 if self.hash_column in header else len(header) + 1
+        letter = column_letter(col)
+
+        stale = []
+        for position, record in enumerate(records):
+            value = self.hash_of(record)
+            if record.get(self.hash_column) != value:
+                record[self.hash_column] = value
+                stale.append(position)
+        if not stale:
+            return
+
+        if len(stale) > len(records) // 2:
+            data = [{"range": f"{letter}2:{letter}{len(records) + 1}",
+                     "values": [[record[self.hash_column]] for record in records]}]
+        else:
+            data = [{"range": f"{letter}{position + 2}", "values": [[records[position][self.hash_column]]]}
+                    for position in stale]
+        if self.hash_column not in header:
+            data.append({"range": f"{letter}1", "values": [[self.hash_column]]})
+        try:
+            with metrics.span("sheets.write"):
+                with_retry(self.repo.worksheet(self.name).batch_update, data, on_attempt=self.repo.count_call)
+        except Exception as exc:
+            self.last_report["error"] = exc
+            return
+        self.last_report["hashes_written"] = len(stale)
+
+
+def _cell(text):
+    # as get_all_records would hand it back, then as _meta compares it
+    return str(numericise(text)) if text[:1] in NUMERIC_START else text
+
+
+NUMERIC_START = set("0123456789+-.")
+
+
+def _diff(local, remote):
+    # non-equal opcodes turning local into remote; the common head and tail
+    # are skipped first, since most refreshes change a few rows at the end
+    n = min(len(local), len(remote))
+    start = 0
+    while start < n and local[start] == remote[start]:
+        start += 1
+    end = 0
+    while end < n - start and local[-1 - end] == remote[-1 - end]:
+        end += 1
+    matcher = difflib.SequenceMatcher(None, local[start:len(local) - end], remote[start:len(remote) - end],
+                                      autojunk=False)
+    return [(tag, i1 + start, i2 + start, j1 + start, j2 + start)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
@@ -0,0 +1,119 @@
+import re
+from array import array
+
+import numpy as np
+
+from sibuskerz.search import fold
+
+# --- TRIGRAM INDEX ---
+# Typo-tolerant matching for titles and artists typed on a phone
+# ("siti nurhalzia", "kerana mu"). Spaces are dropped before splitting into
+# trigrams so "keranamu" and "kerana mu" still line up.
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+MIN_SIMILARITY = 0.3
+DUPLICATE_SIMILARITY = 0.8
+
+
+def squash(text):
+    return NON_ALNUM_RE.sub("", fold(text))
+
+
+def trigrams(text):
+    text = squash(text)
+    if not text:
+        return set()
+    padded = f"$${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    a, b = trigrams(a), trigrams(b)
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+class TrigramIndex:
+    def __init__(self):
+        self.keys = []  # entry position -> song id
+        self.sizes = []  # entry position -> number of trigrams
+        self.postings = {}  # trigram -> array of entry positions
+        self.entries = {}  # key -> [entry positions]
+        self._arrays = {}
+        self._sizes = None
+        self._owned = None  # trigrams whose postings aren't shared with a copy (None: all)
+
+    def add(self, key, *texts):
+        # one entry per text; a key scores as its best-matching entry
+        for text in texts:
+            grams = trigrams(text)
+            if not grams:
+                continue
+            entry = len(self.keys)
+            self.keys.append(key)
+            self.sizes.append(len(grams))
+            self.entries[key] = [*self.entries.get(key, ()), entry]
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("i")
+                elif self._owned is not None and gram not in self._owned:
+                    posting = self.postings[gram] = array("i", posting)
+                if self._owned is not None:
+                    self._owned.add(gram)
+                posting.append(entry)
+                self._arrays.pop(gram, None)
+        self._sizes = None
+
+    def remove(self, key):
+        # tombstone: the entries stay in the postings but never match
+        for entry in self.entries.pop(key, ()):
+            self.keys[entry] = None
+
+    def copy(self):
+        # for a snapshot draft; postings are shared until next appended to
+        other = TrigramIndex.__new__(TrigramIndex)
+        other.keys = list(self.keys)
+        other.sizes = list(self.sizes)
+        other.postings = dict(self.postings)
+        other.entries = dict(self.entries)
+        other._arrays = dict(self._arrays)
+        other._sizes = self._sizes
+        self._owned, other._owned = set(), set()
+        return other
+
+    def _posting(self, gram):
+        entries = self._arrays.get(gram)
+        if entries is None:
+            entries = self._arrays[gram] = np.array(self.postings[gram], dtype=np.int32)
+        return entries
+
+    def closest(self, text, k=10, min_similarity=MIN_SIMILARITY):
+        grams = trigrams(text)
+        if not grams or not self.keys:
+            return []
+        if self._sizes is None:
+            self._sizes = np.array(self.sizes, dtype=np.float64)
+
+        shared = np.zeros(len(self.keys))
+        for gram in grams:
+            if gram in self.postings:
+                shared[self._posting(gram)] += 1
+
+        # Dice coefficient between the query and each entry
+        similarity = 2.0 * shared / (self._sizes + len(grams))
+        entries = np.flatnonzero(similarity >= min_similarity)
+        entries = entries[np.argsort(-similarity[entries], kind="stable")]
+
+        results = []
+        seen = set()
+        for entry in entries:
+            key = self.keys[entry]
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            results.append((key, float(similarity[entry])))
+            if len(results) == k:
+                break
+        return results
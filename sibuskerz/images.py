@@ -0,0 +1,83 @@
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageOps, ImageSequence
+
+# --- IMAGE PIPELINE ---
+# Member photos and banners are multi-megabyte originals. They are resized
+# once to a few standard widths, re-encoded as WebP (or JPEG) and cached on
+# disk under a hash of the file's contents, so an edited photo gets new
+# thumbnails and an unchanged one is never re-encoded.
+
+WIDTHS = (320, 640, 960)
+QUALITY = 80
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+class ImagePipeline:
+    def __init__(self, cache_dir, widths=WIDTHS, fmt="WEBP", quality=QUALITY):
+        self.cache_dir = cache_dir
+        self.widths = tuple(sorted(widths))
+        self.fmt = fmt
+        self.quality = quality
+        self._hashes = {}  # (path, mtime, size) -> content hash
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def content_hash(self, path):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(key)
+        if digest is None:
+            with open(path, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()[:16]
+            self._hashes[key] = digest
+        return digest
+
+    def pick_width(self, display_width):
+        # smallest standard width that still covers the slot
+        for width in self.widths:
+            if width >= display_width:
+                return width
+        return self.widths[-1]
+
+    def thumbnail(self, path, display_width):
+        # local file -> cached thumbnail path; URLs and missing files are
+        # returned untouched for st.image to handle
+        if not isinstance(path, str) or not os.path.isfile(path):
+            return path
+        width = self.pick_width(display_width)
+        target = os.path.join(self.cache_dir, f"{self.content_hash(path)}-{width}.{EXTENSIONS[self.fmt]}")
+        if not os.path.exists(target):
+            with self._lock:
+                if not os.path.exists(target):
+                    self._render(path, width, target)
+        return target
+
+    def _render(self, path, width, target):
+        tmp = f"{target}.tmp"
+        with Image.open(path) as img:
+            if getattr(img, "is_animated", False) and self.fmt == "WEBP":
+                frames = [self._resize(frame.copy(), width) for frame in ImageSequence.Iterator(img)]
+                frames[0].save(
+                    tmp, self.fmt, save_all=True, append_images=frames[1:], quality=self.quality,
+                    duration=img.info.get("duration", 100), loop=img.info.get("loop", 0),
+                )
+            else:
+                self._resize(ImageOps.exif_transpose(img), width).save(tmp, self.fmt, quality=self.quality)
+        os.replace(tmp, target)
+
+    def _resize(self, img, width):
+        if self.fmt == "JPEG":
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                background = Image.new("RGB", img.size, "white")
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        if img.width > width:  # never upscale
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        return img
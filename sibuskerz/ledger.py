@@ -0,0 +1,210 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from sibuskerz.settlement import split_performance, to_ringgit
+
+# --- EARNINGS LEDGER ---
+# Append-only record of every settlement, fed one performance at a time when
+# it flips to Done or Paid. Running balances per (member, bucket) are updated
+# in the same transaction, so "what has X earned this year / unpaid / total"
+# is a single primary-key lookup and the performances sheet is never
+# rescanned. Buckets: "total", "unpaid", "paid" and "year:YYYY".
+
+EQUIPMENT = "__equipment__"  # the audio equipment fund's share
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    perf_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    member TEXT NOT NULL,
+    amount_sen INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS performances (
+    perf_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    share_sen INTEGER NOT NULL,
+    members TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    member TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    amount_sen INTEGER NOT NULL,
+    PRIMARY KEY (member, bucket)
+);
+"""
+
+
+def perf_year(date):
+    # the year a gig is booked under. Sheet dates may be typed by hand, so
+    # anything but ISO is read day first (4/1/2024 is 4 January); a date
+    # that can't be read raises ValueError rather than guessing a year
+    text = str(date).strip()
+    try:
+        try:
+            parsed = pd.to_datetime(text, format="ISO8601")
+        except ValueError:
+            parsed = pd.to_datetime(text, dayfirst=True)
+    except (ValueError, OverflowError):
+        parsed = pd.NaT
+    if pd.isna(parsed):
+        raise ValueError(f"Unreadable performance date: {date!r}")
+    return parsed.year
+
+
+def posting(date, total_token, performers):
+    # -> (year, share in sen, members incl. the equipment fund, fingerprint)
+    _, share_sen, names = split_performance(total_token, performers)
+    year = perf_year(date)
+    members = [*names, EQUIPMENT]
+    return year, share_sen, members, f"{year}|{share_sen}|{'|'.join(members)}"
+
+
+class Ledger:
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock before the status is read, so
+        # check-then-post is atomic across sessions, threads and the CLI
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    # --- POSTING ---
+    def _post(self, conn, perf_id, event, members, share_sen, year, buckets):
+        # buckets: {bucket: sign}; one entry per member, balances moved in step
+        now = time.time()
+        for member in members:
+            for bucket, sign in buckets.items():
+                conn.execute(
+                    "INSERT INTO balances (member, bucket, amount_sen) VALUES (?, ?, ?) "
+                    "ON CONFLICT (member, bucket) DO UPDATE SET amount_sen = amount_sen + excluded.amount_sen",
+                    (member, bucket.format(year=year), sign * share_sen),
+                )
+            conn.execute(
+                "INSERT INTO entries (perf_id, event, member, amount_sen, year, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (perf_id, event, member, share_sen, year, now),
+            )
+
+    def _record_done(self, conn, perf_id, date, total_token, performers):
+        year, share_sen, members, fingerprint = posting(date, total_token, performers)
+        earn = {"total": 1, "unpaid": 1, "year:{year}": 1}
+        row = conn.execute(
+            "SELECT status, year, share_sen, members, fingerprint FROM performances WHERE perf_id = ?", (perf_id,)
+        ).fetchone()
+        if row is not None:
+            status, old_year, old_share, old_members, old_fingerprint = row
+            if old_fingerprint == fingerprint or status == "paid":
+                return False
+            self._post(conn, perf_id, "reversed", old_members.split("\x1f"), -old_share, old_year, earn)
+
+        self._post(conn, perf_id, "earned", members, share_sen, year, earn)
+        conn.execute(
+            "INSERT OR REPLACE INTO performances (perf_id, status, year, share_sen, members, fingerprint) "
+            "VALUES (?, 'unpaid', ?, ?, ?, ?)",
+            (perf_id, year, share_sen, "\x1f".join(members), fingerprint),
+        )
+        return True
+
+    def record_done(self, perf_id, date, total_token, performers):
+        # idempotent; if the gig was edited after Done, the old settlement is
+        # reversed (new entries, nothing rewritten) and the new one posted
+        with self._transaction() as conn:
+            return self._record_done(conn, perf_id, date, total_token, performers)
+
+    def record_paid(self, perf_id, date=None, total_token=None, performers=None):
+        # performances paid before the ledger knew them are settled first
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM performances WHERE perf_id = ?", (perf_id,)).fetchone()
+            if row is None:
+                if total_token is None:
+                    raise KeyError(f"Performance {perf_id} was never recorded as Done.")
+                self._record_done(conn, perf_id, date, total_token, performers)
+            elif row[0] == "paid":
+                return False
+
+            year, share_sen, members = conn.execute(
+                "SELECT year, share_sen, members FROM performances WHERE perf_id = ?", (perf_id,)
+            ).fetchone()
+            self._post(conn, perf_id, "paid", members.split("\x1f"), share_sen, year, {"unpaid": -1, "paid": 1})
+            conn.execute("UPDATE performances SET status = 'paid' WHERE perf_id = ?", (perf_id,))
+        return True
+
+    def is_empty(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM performances LIMIT 1").fetchone() is None
+
+    def backfill(self, records):
+        # first run only: seed the ledger from the existing sheet history;
+        # -> [(perf_id, error)] for rows left out (an unreadable date), which
+        # reconcile picks up once the sheet is fixed
+        skipped = []
+        for record in records:
+            if record.get("Status") != "Done" or not record.get("ID"):
+                continue
+            args = (record["ID"], record.get("Date"), record.get("TotalToken"), record.get("Performers"))
+            try:
+                if record.get("PaidStatus") == "Paid":
+                    self.record_paid(*args)
+                else:
+                    self.record_done(*args)
+            except ValueError as exc:
+                skipped.append((record["ID"], exc))
+        return skipped
+
+    # --- QUERIES ---
+    def states(self):
+        # perf_id -> ("unpaid" / "paid", fingerprint), for reconciling with the sheet
+        with self._connect() as conn:
+            rows = conn.execute("SELECT perf_id, status, fingerprint FROM performances").fetchall()
+        return {perf_id: (status, fingerprint) for perf_id, status, fingerprint in rows}
+
+    def balance(self, member, bucket="total"):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT amount_sen FROM balances WHERE member = ? AND bucket = ?", (member, bucket)
+            ).fetchone()
+        return to_ringgit(row[0] if row else 0)
+
+    def earned(self, member, year=None):
+        year = year or datetime.date.today().year
+        return {
+            "year": self.balance(member, f"year:{year}"),
+            "unpaid": self.balance(member, "unpaid"),
+            "total": self.balance(member, "total"),
+        }
+
+    def balances(self, bucket="total"):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT member, amount_sen FROM balances WHERE bucket = ? AND member != ? ORDER BY amount_sen DESC, member",
+                (bucket, EQUIPMENT),
+            ).fetchall()
+        return [(member, to_ringgit(amount)) for member, amount in rows]
@@ -0,0 +1,122 @@
+import secrets
+import threading
+import time
+
+# --- SHARED PERFORMANCES ---
+# One phone drives a performance and the rest of the band follows it. A live
+# session wraps the driver's Setlist (whose songs are rows of the shared song
+# index) and a version number bumped on every move. Followers poll it from a
+# timed fragment: reading the cursor is an in-memory lookup, so a dozen
+# phones cost no sheet reads and no full reruns. Sessions live in the server
+# process and end with it. The app is public, so sessions are never listed:
+# a phone joins by typing the code the driver reads out, and only phones
+# that joined can take over.
+
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # no 0/O or 1/I
+CODE_LENGTH = 4
+IDLE_TIMEOUT = 6 * 3600  # seconds without a move before a session is dropped
+FOLLOWER_TIMEOUT = 10  # seconds without a poll before a phone counts as gone
+
+
+class LiveSession:
+    def __init__(self, code, setlist, driver, clock=time.monotonic):
+        self.code = code
+        self.setlist = setlist
+        self.driver = driver  # device id of the phone in control
+        self.clock = clock
+        self.version = 0
+        self.started_at = self.updated_at = clock()
+        self.followers = {}  # device id -> last poll
+        self.members = {driver}  # device ids that started or joined with the code
+        self._lock = threading.Lock()
+
+    def _publish(self, move, *args):
+        with self._lock:
+            move(*args)
+            self.version += 1
+            self.updated_at = self.clock()
+
+    # the driver's controls; same names as Setlist, so the controller can use
+    # either one
+    def next(self):
+        self._publish(self.setlist.next)
+
+    def previous(self):
+        self._publish(self.setlist.previous)
+
+    def jump(self, index):
+        self._publish(self.setlist.jump, index)
+
+    def restart(self):
+        self._publish(self.setlist.restart)
+
+    def take_over(self, device):
+        # when the driving phone dies or leaves the stage
+        if device not in self.members:
+            raise PermissionError(f"{device} did not join {self.code} with its code.")
+
+        def hand_over():
+            self.followers.pop(device, None)
+            self.driver = device
+        self._publish(hand_over)
+
+    def join(self, device):
+        with self._lock:
+            self.members.add(device)
+
+    def poll(self, device):
+        # marks the phone as following
+        with self._lock:
+            if device != self.driver:
+                self.followers[device] = self.clock()
+
+    def leave(self, device):
+        with self._lock:
+            self.followers.pop(device, None)
+
+    def following(self):
+        cutoff = self.clock() - FOLLOWER_TIMEOUT
+        return sum(seen >= cutoff for seen in list(self.followers.values()))
+
+
+class LiveHub:
+    # process-wide registry of live sessions (see get_live_hub)
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        cutoff = self.clock() - self.idle_timeout
+        for code in [code for code, live in self._sessions.items() if live.updated_at < cutoff]:
+            del self._sessions[code]
+
+    def start(self, setlist, driver):
+        with self._lock:
+            self._prune()
+            code = _new_code()
+            while code in self._sessions:
+                code = _new_code()
+            live = self._sessions[code] = LiveSession(code, setlist, driver, clock=self.clock)
+            return live
+
+    def get(self, code):
+        with self._lock:
+            self._prune()
+            return self._sessions.get(code)
+
+    def join(self, code, device):
+        # -> the session, or None for a wrong or expired code
+        live = self.get(str(code).strip().upper())
+        if live is not None:
+            live.join(device)
+        return live
+
+    def end(self, code):
+        with self._lock:
+            self._sessions.pop(code, None)
+
+
+def _new_code():
+    return "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- LYRICS.OVH CLIENT ---
+# One pooled session with strict timeouts and retry/backoff, a response
+# cache that survives restarts (found lyrics for a month, "not found" for a
+# day) and concurrent lookups for whole setlists.
+
+BASE_URL = "https://api.lyrics.ovh/v1"
+TIMEOUT = (3.05, 10)  # connect, read (seconds)
+RETRIES = 3
+BACKOFF = 0.5
+MAX_WORKERS = 8
+FOUND_TTL = 30 * 24 * 3600
+NOT_FOUND_TTL = 24 * 3600
+CACHE_SIZE = 2000
+
+FOUND = "found"
+NOT_FOUND = "not_found"
+ERROR = "error"
+
+
+class LookupResult:
+    def __init__(self, artist, title, status, lyrics=None, error=None, cached=False):
+        self.artist = artist
+        self.title = title
+        self.status = status
+        self.lyrics = lyrics
+        self.error = error
+        self.cached = cached
+
+    @property
+    def found(self):
+        return self.status == FOUND
+
+
+class ResponseCache:
+    # LRU in memory in front of a SQLite table; entries expire by TTL and the
+    # least recently used ones are dropped past max_entries
+    def __init__(self, path=None, max_entries=CACHE_SIZE, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.clock = clock
+        self._memory = OrderedDict()  # key -> (status, lyrics, expires_at)
+        self._lock = threading.Lock()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, status TEXT NOT NULL, lyrics TEXT, "
+                    "expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def key(artist, title):
+        return json.dumps([artist.strip().casefold(), title.strip().casefold()])
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._memory.move_to_end(key)
+                    return entry
+                del self._memory[key]
+        if not self.path:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, lyrics, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+        if row is not None:
+            self._remember(key, tuple(row))
+        return tuple(row) if row is not None else None
+
+    def put(self, key, status, lyrics, ttl):
+        now = self.clock()
+        entry = (status, lyrics, now + ttl)
+        self._remember(key, entry)
+        if not self.path:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status, lyrics, expires_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, status, lyrics, entry[2], now),
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+class LyricsClient:
+    def __init__(self, base_url=BASE_URL, cache=None, timeout=TIMEOUT, retries=RETRIES,
+                 backoff=BACKOFF, max_workers=MAX_WORKERS):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache or ResponseCache()
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        # a read timeout is final and Retry-After is ignored, so one lookup is
+        # bounded: at most retries + 1 attempts, each within the timeout
+        retry = Retry(
+            total=retries,
+            read=0,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def lookup(self, artist, title):
+        key = self.cache.key(artist, title)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return LookupResult(artist, title, entry[0], lyrics=entry[1], cached=True)
+
+        url = f"{self.base_url}/{quote(artist.strip(), safe='')}/{quote(title.strip(), safe='')}"
+        try:
+            res = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as exc:
+            return LookupResult(artist, title, ERROR, error=exc)
+
+        lyrics = None
+        if res.status_code == 200:
+            try:
+                lyrics = (res.json().get("lyrics") or "").strip() or None
+            except ValueError:
+                return LookupResult(artist, title, ERROR, error="invalid response")
+        elif res.status_code != 404:
+            # upstream trouble is not an answer; don't cache it
+            return LookupResult(artist, title, ERROR, error=f"HTTP {res.status_code}")
+
+        if lyrics:
+            self.cache.put(key, FOUND, lyrics, FOUND_TTL)
+            return LookupResult(artist, title, FOUND, lyrics=lyrics)
+        self.cache.put(key, NOT_FOUND, None, NOT_FOUND_TTL)
+        return LookupResult(artist, title, NOT_FOUND)
+
+    def lookup_many(self, pairs, on_result=None):
+        # [(artist, title), ...] -> results in the same order; on_result is
+        # called as each lookup finishes (e.g. to move a progress bar)
+        pairs = list(pairs)
+        results = [None] * len(pairs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.lookup, artist, title): i for i, (artist, title) in enumerate(pairs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if on_result is not None:
+                    on_result(done, len(pairs), results[futures[future]])
+        return results
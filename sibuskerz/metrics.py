@@ -0,0 +1,154 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# --- INSTRUMENTATION ---
+# Timing spans around the hot paths (sheet reads and writes, settlement) and
+# counters for API calls and bytes, kept in one process-wide registry. Spans
+# and counters are also attributed to the rerun they happen in: each rerun
+# ends with one JSON line on the "sibuskerz.metrics" logger, and the whole
+# registry can be exported as Prometheus text.
+
+WINDOW = 500  # most recent samples kept per (page, operation)
+RECENT = 200  # most recent reruns kept for the dashboard
+BACKGROUND = "background"  # work done outside any rerun (snapshot sync)
+
+log = logging.getLogger("sibuskerz.metrics")
+
+
+class Metrics:
+    def __init__(self, window=WINDOW, recent=RECENT, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self._samples = defaultdict(lambda: deque(maxlen=window))  # (page, op) -> seconds
+        self._totals = defaultdict(lambda: [0, 0.0])  # op -> [count, seconds], never trimmed
+        self._counters = defaultdict(int)
+        self.recent = deque(maxlen=recent)  # finished rerun records, newest last
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --- RECORDING ---
+    def current(self):
+        return getattr(self._local, "rerun", None)
+
+    @contextmanager
+    def rerun(self, page):
+        # wraps one script or fragment run; a fragment drawn during a full
+        # run is simply part of that run
+        if self.current() is not None:
+            yield self.current()
+            return
+        record = {"page": page, "started_at": time.time(), "counters": defaultdict(int), "spans": defaultdict(float)}
+        self._local.rerun = record
+        start = self.clock()
+        try:
+            yield record
+        finally:
+            self._local.rerun = None
+            elapsed = self.clock() - start
+            self._observe(page, "rerun", elapsed)
+            record.update(duration_ms=round(elapsed * 1000, 2), counters=dict(record["counters"]),
+                          spans={op: round(seconds * 1000, 2) for op, seconds in record["spans"].items()})
+            with self._lock:
+                self.recent.append(record)
+            log.info(json.dumps(record, ensure_ascii=False))
+
+    @contextmanager
+    def span(self, op):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            rerun = self.current()
+            if rerun is not None:
+                rerun["spans"][op] += elapsed
+            self._observe(rerun["page"] if rerun else BACKGROUND, op, elapsed)
+
+    def count(self, name, n=1):
+        rerun = self.current()
+        if rerun is not None:
+            rerun["counters"][name] += n
+        with self._lock:
+            self._counters[name] += n
+
+    def _observe(self, page, op, seconds):
+        with self._lock:
+            self._samples[(page, op)].append(seconds)
+            total = self._totals[op]
+            total[0] += 1
+            total[1] += seconds
+
+    # --- QUERIES ---
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def percentiles(self, by="op"):
+        # {page or op: (samples, p50 ms, p95 ms)}; by="page" covers whole
+        # reruns only, by="op" merges every page
+        with self._lock:
+            groups = defaultdict(list)
+            for (page, op), samples in self._samples.items():
+                if by == "page" and op == "rerun":
+                    groups[page].extend(samples)
+                elif by == "op" and op != "rerun":
+                    groups[op].extend(samples)
+        result = {}
+        for key, samples in sorted(groups.items()):
+            p50, p95 = np.percentile(np.asarray(samples) * 1000, [50, 95])
+            result[key] = (len(samples), float(p50), float(p95))
+        return result
+
+    def reruns(self):
+        # the finished rerun records, newest last; a copy, as reruns in other
+        # sessions append while the caller iterates
+        with self._lock:
+            return list(self.recent)
+
+    def per_rerun(self, name):
+        # mean of a counter per finished rerun, by page
+        pages = defaultdict(list)
+        for record in self.reruns():
+            pages[record["page"]].append(record["counters"].get(name, 0))
+        return {page: sum(values) / len(values) for page, values in pages.items()}
+
+    def prometheus(self, prefix="sibuskerz"):
+        lines = [f"# TYPE {prefix}_operation_seconds summary"]
+        with self._lock:
+            ops = sorted({op for _, op in self._samples})
+            samples = {op: [s for (_, o), values in self._samples.items() if o == op for s in values] for op in ops}
+            totals = {op: tuple(self._totals[op]) for op in ops}
+            counters = sorted(self._counters.items())
+        for op in ops:
+            p50, p95 = np.percentile(samples[op], [50, 95])
+            lines.append(f'{prefix}_operation_seconds{{op="{op}",quantile="0.5"}} {p50:.6f}')
+            lines.append(f'{prefix}_operation_seconds{{op="{op}",quantile="0.95"}} {p95:.6f}')
+            lines.append(f'{prefix}_operation_seconds_sum{{op="{op}"}} {totals[op][1]:.6f}')
+            lines.append(f'{prefix}_operation_seconds_count{{op="{op}"}} {totals[op][0]}')
+        for name, value in counters:
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Metrics()
+span = REGISTRY.span
+count = REGISTRY.count
+
+
+def timed(op):
+    # decorator form of span()
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with REGISTRY.span(op):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- LOCAL SNAPSHOT STORE ---
+# Last known good copy of each worksheet, kept in SQLite next to the app so a
+# gig with no mobile data still has every lyric. Rows are stored one per
+# record, keyed by position, so keeping the copy current after a delta sync
+# or one of our own writes rewrites only the rows that changed.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (name, position)
+);
+"""
+
+
+def _dumps(record):
+    # record may be a compact catalogue row (see sibuskerz.catalogue)
+    return json.dumps(dict(record), ensure_ascii=False, separators=(",", ":"))
+
+
+class SnapshotStore:
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # one short-lived connection per call keeps it safe across the
+        # Streamlit session threads and the background sync thread
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _mark(self, conn, name, size, synced_at):
+        conn.execute(
+            "INSERT OR REPLACE INTO sheets (name, size, synced_at) VALUES (?, ?, ?)",
+            (name, size, synced_at if synced_at is not None else time.time()),
+        )
+
+    def save(self, name, records, synced_at=None):
+        # the whole worksheet, after a full pull
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sheet_rows WHERE name = ?", (name,))
+            conn.executemany(
+                "INSERT INTO sheet_rows (name, position, record) VALUES (?, ?, ?)",
+                ((name, position, _dumps(record)) for position, record in enumerate(records)),
+            )
+            self._mark(conn, name, len(records), synced_at)
+
+    def save_rows(self, name, rows, size, synced_at=None):
+        # rows: {position: record} changed since the last save; size: the
+        # worksheet's row count now, rows past it are dropped
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sheet_rows WHERE name = ? AND position >= ?", (name, size))
+            conn.executemany(
+                "INSERT OR REPLACE INTO sheet_rows (name, position, record) VALUES (?, ?, ?)",
+                ((name, position, _dumps(record)) for position, record in rows.items()),
+            )
+            self._mark(conn, name, size, synced_at)
+
+    def load(self, name):
+        with self._connect() as conn:
+            row = conn.execute("SELECT synced_at FROM sheets WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return self._load_legacy(conn, name)
+            records = conn.execute(
+                "SELECT record FROM sheet_rows WHERE name = ? ORDER BY position", (name,)
+            ).fetchall()
+        return [json.loads(record) for (record,) in records], row[0]
+
+    def _load_legacy(self, conn, name):
+        # copies saved before rows were stored one by one, until the next sync
+        try:
+            row = conn.execute("SELECT records, synced_at FROM snapshots WHERE name = ?", (name,)).fetchone()
+        except sqlite3.OperationalError:
+            return None, None
+        return (json.loads(row[0]), row[1]) if row else (None, None)
+
+    def synced_at(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT name, synced_at FROM sheets"))
+
+
+# --- BACKGROUND SYNC ---
+class SnapshotSync:
+    def __init__(self, repo, names, interval=120, warm=None):
+        self.repo = repo
+        self.names = list(names)
+        self.interval = interval
+        self.warm = warm  # called after a successful pass, e.g. to build indexes
+        self.last_error = None
+        self.last_success = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="snapshot-sync", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def sync_once(self):
+        try:
+            for name in self.names:
+                # pages may just have fetched it; don't pull it twice
+                self.repo.refresh(name, max_age=self.interval)
+            if self.warm is not None:
+                self.warm(self.repo)
+        except Exception as exc:  # no network, quota, auth hiccup: keep local data
+            self.last_error = exc
+            return False
+        self.last_error = None
+        self.last_success = time.time()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sync_once()
+            self._stop.wait(self.interval)
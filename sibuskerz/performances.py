@@ -0,0 +1,221 @@
+import uuid
+
+from gspread.utils import rowcol_to_a1
+
+from sibuskerz import metrics
+from sibuskerz.ledger import perf_year
+from sibuskerz.writes import WriteQueue, with_retry
+
+# --- PERFORMANCES TABLE ---
+# Rows of the performances sheet are addressed by a persistent ID column, not
+# by matching dates. Every row also carries a Version that is bumped on each
+# write; before writing, the ID and Version cells of the target rows are read
+# back in one request, so a stale snapshot (someone edited or deleted rows in
+# the sheet meanwhile) fails loudly instead of changing the wrong gig.
+
+ID_COLUMN = "ID"
+VERSION_COLUMN = "Version"
+PAID_COLUMN = "PaidStatus"
+
+
+class StaleRowError(Exception):
+    pass
+
+
+def new_id():
+    # leading letter so the sheet never turns an ID into a number
+    return "p" + uuid.uuid4().hex[:8]
+
+
+def as_version(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class RowMap:
+    # ID -> position in the snapshot (sheet row = position + 2), kept current
+    # by the snapshot patches that follow our own inserts and deletes
+    def __init__(self, records):
+        self.size = len(records)
+        self.positions = {}
+        for position, record in enumerate(records):
+            if record.get(ID_COLUMN):
+                self.positions[str(record[ID_COLUMN])] = position
+
+    def copy(self):
+        other = RowMap(())
+        other.size = self.size
+        other.positions = dict(self.positions)
+        return other
+
+    def add(self, record):
+        if record.get(ID_COLUMN):
+            self.positions[str(record[ID_COLUMN])] = self.size
+        self.size += 1
+
+    def replace(self, position, record):
+        pass  # IDs never change
+
+    def remove(self, position):
+        self.size -= 1
+        self.positions = {
+            pid: pos - 1 if pos > position else pos
+            for pid, pos in self.positions.items()
+            if pos != position
+        }
+
+    def position(self, perf_id):
+        try:
+            return self.positions[str(perf_id)]
+        except KeyError:
+            raise StaleRowError(f"Performance {perf_id} is no longer in the sheet.") from None
+
+    def row(self, perf_id):
+        return self.position(perf_id) + 2  # 1-based + header
+
+
+class PerformanceTable:
+    def __init__(self, repo, name):
+        self.repo = repo
+        self.name = name
+
+    def snapshot(self):
+        return self.repo.snapshot(self.name)
+
+    def frame(self):
+        return self.repo.frame(self.name)
+
+    def row_map(self):
+        return self.snapshot().derived("row_map", RowMap)
+
+    def header(self):
+        records = self.snapshot().records
+        if records:
+            return list(records[0])
+        ws = self.repo.worksheet(self.name)
+        return with_retry(ws.row_values, 1, on_attempt=self.repo.count_call)
+
+    def find(self, perf_id):
+        return self.snapshot().records[self.row_map().position(perf_id)]
+
+    def ensure_ids(self, extra_columns=()):
+        # one-off migration: add ID/Version (and any other missing) columns
+        # and backfill every row
+        header = self.header()
+        columns = [ID_COLUMN, VERSION_COLUMN, *extra_columns]
+        records = self.snapshot().records
+        missing = [r for r in records if not r.get(ID_COLUMN)]
+        if all(column in header for column in columns) and not missing:
+            return None
+
+        queue = WriteQueue(self.repo, self.name)
+        for column in columns:
+            if column not in header:
+                header.append(column)
+                queue.update_cell(1, len(header), column)
+        id_col = header.index(ID_COLUMN) + 1
+        version_col = header.index(VERSION_COLUMN) + 1
+        for position, record in enumerate(records):
+            if not record.get(ID_COLUMN):
+                queue.update_cell(position + 2, id_col, new_id())
+                queue.update_cell(position + 2, version_col, 1)
+        return queue.flush()
+
+    def _check_versions(self, expected):
+        # expected: {perf_id: version seen by the caller}
+        header = self.header()
+        id_col = header.index(ID_COLUMN) + 1
+        version_col = header.index(VERSION_COLUMN) + 1
+        row_map = self.row_map()
+        ranges = []
+        for perf_id in expected:
+            row = row_map.row(perf_id)
+            ranges += [rowcol_to_a1(row, id_col), rowcol_to_a1(row, version_col)]
+
+        ws = self.repo.worksheet(self.name)
+        with metrics.span("sheets.batch_get"):
+            values = with_retry(ws.batch_get, ranges, on_attempt=self.repo.count_call)
+        cells = [str(v[0][0]) if v and v[0] else "" for v in values]
+        for i, (perf_id, version) in enumerate(expected.items()):
+            live_id, live_version = cells[2 * i], as_version(cells[2 * i + 1])
+            if live_id != str(perf_id) or live_version != as_version(version):
+                self.repo.invalidate(self.name)
+                raise StaleRowError("The performances sheet changed since it was loaded. Please refresh and try again.")
+
+    def _row_values(self, record, header):
+        return [record.get(column, "") for column in header]
+
+    def add(self, values):
+        # returns (new ID, WriteReport)
+        header = self.header()
+        record = dict(values, **{ID_COLUMN: new_id(), VERSION_COLUMN: 1})
+        for column in record:
+            if column not in header:
+                raise KeyError(f"'{column}' is not a column of the {self.name} sheet")
+        record = {column: record.get(column, "") for column in header}
+        queue = WriteQueue(self.repo, self.name)
+        queue.append(self._row_values(record, header), record=record)
+        return record[ID_COLUMN], queue.flush()
+
+    def update_many(self, changes, expected_versions):
+        # changes: {perf_id: {column: value}}, written in one batch request.
+        # Only the changed cells and Version are written: edits made by hand
+        # in the sheet don't bump Version, so any other column of the
+        # snapshot may be out of date (and rewriting it would turn formatted
+        # dates and amounts into text).
+        self._check_versions({perf_id: expected_versions[perf_id] for perf_id in changes})
+        header = self.header()
+        row_map = self.row_map()
+        records = self.snapshot().records
+        queue = WriteQueue(self.repo, self.name)
+        patched = []
+        for perf_id, values in changes.items():
+            position = row_map.position(perf_id)
+            values = dict(values, **{VERSION_COLUMN: as_version(expected_versions[perf_id]) + 1})
+            for column, value in values.items():
+                if column not in header:
+                    raise KeyError(f"'{column}' is not a column of the {self.name} sheet")
+                queue.update_cell(position + 2, header.index(column) + 1, value)
+            patched.append((position, dict(records[position], **values)))
+
+        report = queue.flush(invalidate=False)
+        if report.ok:
+            for position, record in patched:
+                self.repo.patch_replaced(self.name, position, record)
+        return report
+
+    def update(self, perf_id, values, expected_version):
+        return self.update_many({perf_id: values}, {perf_id: expected_version})
+
+    def unpaid(self):
+        # Done performances not yet marked Paid, as a frame
+        frame = self.frame()
+        if PAID_COLUMN not in frame.columns:
+            frame[PAID_COLUMN] = ""  # fallback if column not yet created
+        return frame[(frame["Status"] == "Done") & (frame[PAID_COLUMN] != "Paid")].copy()
+
+    def mark_paid(self, done, ledger):
+        # done: rows of unpaid(); written in one batch request, then posted
+        # to the ledger once the sheet has them. Dates are checked first, so
+        # one the ledger can't book stops the write rather than the posting.
+        for date in done["Date"]:
+            perf_year(date)
+        changes = {perf_id: {PAID_COLUMN: "Paid"} for perf_id in done[ID_COLUMN]}
+        versions = dict(zip(done[ID_COLUMN], done[VERSION_COLUMN]))
+        report = self.update_many(changes, versions)
+        if report.ok:
+            for _, row in done[[ID_COLUMN, "Date", "TotalToken", "Performers"]].iterrows():
+                ledger.record_paid(*row)
+        return report
+
+    def delete(self, perf_id, expected_version):
+        self._check_versions({perf_id: expected_version})
+        position = self.row_map().position(perf_id)
+        queue = WriteQueue(self.repo, self.name)
+        queue.delete_rows(position + 2)
+        report = queue.flush(invalidate=False)
+        if report.ok:
+            self.repo.patch_removed(self.name, position)
+        return report
@@ -0,0 +1,184 @@
+import bisect
+import math
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+# --- TEXT NORMALISATION ---
+# Lyrics are a mix of Malay and English typed on phones, so we fold accents,
+# drop apostrophes ("don't" -> "dont") and expand common Malay shorthand.
+# Songs are indexed under each word as written and under its expansion, so
+# "yg" finds "yang" and "kam" still finds "kamu" while it is being typed.
+
+SHORTHAND = {
+    "yg": "yang",
+    "dgn": "dengan",
+    "utk": "untuk",
+    "kpd": "kepada",
+    "dlm": "dalam",
+    "tk": "tak",
+    "tidak": "tak",
+    "sy": "saya",
+    "aq": "aku",
+    "ko": "kau",
+    "engkau": "kau",
+    "kamu": "kau",
+    "sgt": "sangat",
+    "jgn": "jangan",
+    "lg": "lagi",
+    "dah": "sudah",
+    "sdh": "sudah",
+    "nk": "nak",
+    "hendak": "nak",
+    "hanya": "cuma",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+TITLE_WEIGHT = 3.0
+ARTIST_WEIGHT = 2.0
+LYRICS_WEIGHT = 1.0
+MIN_PREFIX = 2
+MAX_PREFIX_EXPANSION = 64
+
+
+def fold(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return text.casefold().replace("'", "").replace("’", "")
+
+
+def words(text):
+    return TOKEN_RE.findall(fold(text))
+
+
+def index_tokens(text):
+    # every word as written, plus its expansion when it is shorthand
+    for tok in words(text):
+        yield tok
+        if tok in SHORTHAND:
+            yield SHORTHAND[tok]
+
+
+# --- INVERTED INDEX ---
+# Postings are appended to compact typed arrays (cheap incremental adds, 8
+# bytes an entry instead of two Python objects) and copied into NumPy arrays
+# the first time a query touches them, so scoring a common word over
+# thousands of songs is a handful of vector ops, not a Python loop.
+# Removed songs are tombstoned rather than cut out of every posting list; a
+# changed song is a removal plus a fresh add. Patches go to a copy() while
+# sessions keep searching the original (see Snapshot.draft).
+class LyricsSearchIndex:
+    def __init__(self):
+        self.doc_ids = []  # position -> song id
+        self.postings = {}  # token -> ([positions], [weights])
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+        self.docs = {}  # song id -> live position
+        self.removed = []  # tombstoned positions
+        self._arrays = {}
+        self._owned = None  # tokens whose postings aren't shared with a copy (None: all)
+
+    def add(self, sid, title, artist, lyrics):
+        weights = defaultdict(float)
+        for tok in index_tokens(title):
+            weights[tok] += TITLE_WEIGHT
+        for tok in index_tokens(artist):
+            weights[tok] += ARTIST_WEIGHT
+        for tok in index_tokens(lyrics):
+            weights[tok] += LYRICS_WEIGHT
+
+        doc = len(self.doc_ids)
+        self.doc_ids.append(sid)
+        self.docs[sid] = doc
+        for tok, weight in weights.items():
+            posting = self.postings.get(tok)
+            if posting is None:
+                posting = self.postings[tok] = (array("i"), array("f"))
+                bisect.insort(self.vocabulary, tok)
+            elif self._owned is not None and tok not in self._owned:
+                posting = self.postings[tok] = (array("i", posting[0]), array("f", posting[1]))
+            if self._owned is not None:
+                self._owned.add(tok)
+            posting[0].append(doc)
+            # dampen repeated chorus lines so they don't swamp the title
+            posting[1].append(1.0 + math.log(weight))
+            self._arrays.pop(tok, None)
+
+    def remove(self, sid):
+        doc = self.docs.pop(sid, None)
+        if doc is not None:
+            self.removed.append(doc)
+
+    def copy(self):
+        # for a snapshot draft: posting arrays stay shared until either side
+        # next appends to them
+        other = LyricsSearchIndex.__new__(LyricsSearchIndex)
+        other.doc_ids = list(self.doc_ids)
+        other.postings = dict(self.postings)
+        other.vocabulary = list(self.vocabulary)
+        other.docs = dict(self.docs)
+        other.removed = list(self.removed)
+        other._arrays = dict(self._arrays)
+        self._owned, other._owned = set(), set()
+        return other
+
+    def _array(self, tok):
+        arrays = self._arrays.get(tok)
+        if arrays is None:
+            docs, weights = self.postings[tok]
+            idf = math.log(1.0 + len(self.doc_ids) / len(docs))
+            arrays = self._arrays[tok] = (np.array(docs, dtype=np.int32), np.array(weights, dtype=np.float64) * idf)
+        return arrays
+
+    def _prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        tokens = []
+        for tok in self.vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not tok.startswith(prefix):
+                break
+            tokens.append(tok)
+        return tokens
+
+    def _term_tokens(self, word, is_last):
+        # a complete word matches itself expanded ("tidak" -> "tak", which
+        # every song with "tak", "tk" or "tidak" is indexed under); the word
+        # being typed also matches as a prefix of words as written
+        term = SHORTHAND.get(word, word)
+        tokens = [term] if term in self.postings else []
+        if is_last and len(word) >= MIN_PREFIX:
+            tokens += [tok for tok in self._prefix_tokens(word) if tok != term]
+        return tokens
+
+    def search(self, query, limit=None):
+        terms = words(query)
+        if len(terms) > 1 and len(terms[-1]) < MIN_PREFIX:
+            terms.pop()  # a word just started: "kamu s" shows what "kamu" does
+        if not terms or not self.doc_ids:
+            return []
+
+        # every term must match; the last one is still being typed, so it
+        # matches as a prefix too
+        n = len(self.doc_ids)
+        total = np.zeros(n)
+        alive = np.ones(n, dtype=bool)
+        alive[self.removed] = False
+        for i, term in enumerate(terms):
+            tokens = self._term_tokens(term, i == len(terms) - 1)
+            if not tokens:
+                return []
+            # prefix expansions of one term compete: keep the best token
+            term_scores = np.zeros(n)
+            for tok in tokens:
+                docs, scores = self._array(tok)
+                term_scores[docs] = np.maximum(term_scores[docs], scores)
+            alive &= term_scores > 0
+            total += term_scores
+
+        candidates = np.flatnonzero(alive)
+        if limit and len(candidates) > limit:
+            candidates = candidates[np.argpartition(-total[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-total[candidates], kind="stable")]
+        return [self.doc_ids[doc] for doc in ranked]
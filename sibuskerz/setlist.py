@@ -0,0 +1,151 @@
+import functools
+import html
+import json
+import os
+import sqlite3
+import time
+
+# --- PERFORMANCE SETLISTS ---
+# Built once when a performance starts: every queued song is resolved to its
+# row in the shared song index up front, so moving between songs on stage is
+# an index change with no sheet access and no searching. A setlist holds rows,
+# not text: lyrics are decoded and rendered when shown, and the rendered HTML
+# is shared by every session through lyrics_html's cache. The next song is
+# rendered while the current one is on screen (prefetch), so Next is a cache
+# hit.
+
+MAX_SONGS = 30
+HTML_CACHE_SIZE = 128  # rendered songs kept, across all sessions
+
+
+@functools.lru_cache(maxsize=HTML_CACHE_SIZE)
+def lyrics_html(lyrics):
+    return f'<div class="lyrics-box"><pre>{html.escape(str(lyrics))}</pre></div>'
+
+
+class SetlistSong:
+    def __init__(self, sid, title, artist, lyrics):
+        self.sid = sid
+        self.title = title
+        self.artist = artist
+        self._lyrics = lyrics  # the text, or the song's row in the song index
+
+    @classmethod
+    def from_index(cls, song_index, sid):
+        return cls(sid, song_index.title(sid), song_index.artist(sid), song_index.record(sid))
+
+    @property
+    def lyrics(self):
+        if isinstance(self._lyrics, str):
+            return self._lyrics
+        return str(self._lyrics.get("Lyrics", ""))
+
+    @property
+    def html(self):
+        return lyrics_html(self.lyrics)
+
+    @property
+    def label(self):
+        return f"{self.title} - {self.artist}"
+
+    def to_dict(self):
+        return {"sid": self.sid, "title": self.title, "artist": self.artist, "lyrics": self.lyrics}
+
+
+class Setlist:
+    def __init__(self, songs, name=""):
+        self.songs = list(songs)[:MAX_SONGS]
+        self.name = name
+        self.index = 0
+
+    @classmethod
+    def build(cls, song_index, song_ids, name=""):
+        songs = [SetlistSong.from_index(song_index, sid) for sid in song_ids if sid in song_index]
+        return cls(songs, name=name)
+
+    def refreshed(self, song_index):
+        # a saved setlist picks up lyrics edited since; songs no longer in the
+        # sheet keep their saved copy
+        songs = [
+            SetlistSong.from_index(song_index, song.sid) if song.sid in song_index else song
+            for song in self.songs
+        ]
+        return Setlist(songs, name=self.name)
+
+    def __len__(self):
+        return len(self.songs)
+
+    @property
+    def finished(self):
+        return self.index >= len(self.songs)
+
+    @property
+    def current(self):
+        return None if self.finished else self.songs[self.index]
+
+    @property
+    def upcoming(self):
+        nxt = self.index + 1
+        return self.songs[nxt] if nxt < len(self.songs) else None
+
+    def prefetch(self):
+        # render the upcoming song into lyrics_html's cache
+        upcoming = self.upcoming
+        if upcoming is not None:
+            upcoming.html
+
+    def next(self):
+        self.index = min(self.index + 1, len(self.songs))
+
+    def previous(self):
+        self.index = max(self.index - 1, 0)
+
+    def jump(self, index):
+        self.index = max(0, min(index, len(self.songs) - 1))
+
+    def restart(self):
+        self.index = 0
+
+    def to_json(self):
+        return json.dumps([song.to_dict() for song in self.songs], ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, payload, name=""):
+        return cls((SetlistSong(**song) for song in json.loads(payload)), name=name)
+
+
+class SetlistStore:
+    # saved setlists keep their lyrics, so a repeat gig works offline too
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS setlists (name TEXT PRIMARY KEY, songs TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def save(self, setlist, name):
+        setlist.name = name
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO setlists (name, songs, saved_at) VALUES (?, ?, ?)",
+                (name, setlist.to_json(), time.time()),
+            )
+
+    def load(self, name):
+        with self._connect() as conn:
+            row = conn.execute("SELECT songs FROM setlists WHERE name = ?", (name,)).fetchone()
+        return Setlist.from_json(row[0], name=name) if row else None
+
+    def names(self):
+        with self._connect() as conn:
+            return [name for (name,) in conn.execute("SELECT name FROM setlists ORDER BY saved_at DESC")]
+
+    def delete(self, name):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM setlists WHERE name = ?", (name,))
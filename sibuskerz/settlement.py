@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from sibuskerz.metrics import timed
+
+# --- TOKEN SETTLEMENT ---
+# Each performance's tokens are split into (performers + 1) equal shares: one
+# per performer plus one for the audio equipment fund. Money is handled in
+# integer sen so rounding is exact half-up, never float drift.
+
+
+def to_sen(values):
+    # half-up to the sen; the epsilon stops 1.005 (really 1.00499...) in a
+    # float from rounding down
+    amounts = pd.to_numeric(values, errors="coerce").fillna(0)
+    sen = np.floor(amounts.abs() * 100 + 0.5 + 1e-6) * np.sign(amounts)
+    return sen.astype(np.int64)
+
+
+def to_ringgit(sen):
+    return Decimal(int(sen)).scaleb(-2)
+
+
+def divide_half_up(numerator, denominator):
+    # integer division rounded half-up, element-wise; 0 where denominator is 0
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    safe = np.where(denominator > 0, denominator, 1)
+    result = (2 * numerator + safe) // (2 * safe)
+    return np.where(denominator > 0, result, 0)
+
+
+def explode_performers(performers):
+    # one row per (performance index, member name)
+    names = performers.fillna("").astype(str).str.split(",").explode().str.strip()
+    return names[names != ""]
+
+
+def split_performance(total_token, performers):
+    # one performance: (token in sen, share in sen, member names)
+    names = [name.strip() for name in str(performers or "").split(",") if name.strip()]
+    token_sen = int(to_sen(pd.Series([total_token])).iloc[0])
+    share_sen = int(divide_half_up(token_sen, len(names) + 1))
+    return token_sen, share_sen, names
+
+
+class Settlement:
+    def __init__(self, performances, members, totals):
+        self.performances = performances  # per-performance shares
+        self.members = members  # Member, TotalEarned (sorted, 1-based index)
+        self.totals = totals  # Decimal amounts and counts
+
+    def earned(self, member):
+        match = self.members.loc[self.members["Member"] == member, "TotalEarned"]
+        return to_ringgit(round(match.iloc[0] * 100)) if len(match) else Decimal("0.00")
+
+
+@timed("settlement.settle")
+def settle(perf):
+    perf = perf.reset_index(drop=True)  # a copy; performers are exploded by index label
+    if "Performers" not in perf.columns:
+        perf["Performers"] = ""
+    names = explode_performers(perf["Performers"])
+
+    token_sen = to_sen(perf["TotalToken"]) if "TotalToken" in perf.columns else pd.Series(0, index=perf.index)
+    num_performers = names.groupby(level=0).size().reindex(perf.index, fill_value=0)
+    total_shares = num_performers + 1
+    share_sen = pd.Series(divide_half_up(token_sen, total_shares), index=perf.index)
+
+    perf["TotalToken"] = token_sen / 100
+    perf["NumPerformers"] = num_performers
+    perf["TotalShares"] = total_shares
+    perf["SharedPerPerson"] = share_sen / 100
+    perf["EquipmentShare"] = perf["SharedPerPerson"]
+
+    earnings = share_sen.reindex(names.index)
+    members = (
+        earnings.groupby(names.values).sum()
+        .rename_axis("Member").reset_index(name="TotalEarned")
+    )
+    members["TotalEarned"] = members["TotalEarned"] / 100
+    members = members.sort_values(by=["TotalEarned", "Member"], ascending=[False, True], kind="stable")
+    members.index = range(1, len(members) + 1)
+
+    total_token = int(token_sen.sum())
+    total_distributed = int((share_sen * num_performers).sum())
+    total_equipment = int(share_sen.sum())
+    all_shares = int(num_performers.sum()) + len(perf)
+    net_per_person = int(divide_half_up(total_token, all_shares)) if total_token > 0 else 0
+
+    totals = {
+        "performances": len(perf),
+        "performers": int(num_performers.sum()),
+        "total_token": to_ringgit(total_token),
+        "total_distributed": to_ringgit(total_distributed),
+        "total_equipment": to_ringgit(total_equipment),
+        "total_undistributed": to_ringgit(total_token - total_distributed - total_equipment),
+        "net_per_person": to_ringgit(net_per_person),
+    }
+    return Settlement(perf, members, totals)
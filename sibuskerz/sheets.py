@@ -0,0 +1,326 @@
+import threading
+import time
+
+import pandas as pd
+
+from sibuskerz import metrics
+from sibuskerz.delta import FullSyncNeeded
+from sibuskerz.writes import QUOTA_STATUSES, RETRY_STATUSES, with_retry
+
+# --- CACHED SHEET REPOSITORY ---
+# One repository is shared by every Streamlit session (built by
+# sibuskerz.connect.open_repository, as the command line's is). Reads are
+# served from per-worksheet snapshots until the TTL runs out or a write
+# through the repository invalidates them. With a store attached the last good
+# copy is also kept on disk (see sibuskerz.offline). Worksheets registered
+# with use_delta refresh incrementally (see sibuskerz.delta), and those listed
+# in compact= are held in a compact form (see sibuskerz.catalogue).
+
+DEFAULT_TTL = 300  # seconds
+
+
+class Snapshot:
+    def __init__(self, name, records, version, loaded_at):
+        self.name = name
+        self.records = records
+        self.version = version
+        self.loaded_at = loaded_at
+        self._frame = None
+        self._derived = {}
+        self._building = {}  # key -> lock held while that structure is built
+        self._building_lock = threading.Lock()
+        self._changed = set()  # positions patched since draft(), see take_changes
+        self._moved_from = None  # first position shifted by a removal since then
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            compact = getattr(self.records, "frame", None)
+            self._frame = compact() if compact is not None else pd.DataFrame(self.records)
+        return self._frame
+
+    def derived(self, key, factory):
+        # memoise structures built from this snapshot (indexes, lookups);
+        # sessions asking at once wait for one build instead of each doing it
+        if key not in self._derived:
+            with self._building_lock:
+                lock = self._building.setdefault(key, threading.Lock())
+            with lock:
+                if key not in self._derived:
+                    self._derived[key] = factory(self.records)
+        return self._derived[key]
+
+    # Patches after our own writes (and the delta sync) instead of refetching
+    # the sheet. A published snapshot is read by every session at once, so it
+    # is never patched itself: the repository patches a draft() and swaps it
+    # in. Derived structures that implement copy() and the matching method
+    # (add, replace, remove) are carried over, kept current with the row as
+    # stored; the rest are rebuilt on next use.
+    def draft(self):
+        copy = getattr(self.records, "copy", None)
+        records = copy() if copy is not None else list(self.records)
+        draft = Snapshot(self.name, records, self.version, self.loaded_at)
+        draft._derived = {key: value.copy() for key, value in self._derived.items() if hasattr(value, "copy")}
+        return draft
+
+    def _patch(self, method, *args):
+        self._frame = None
+        for key, value in list(self._derived.items()):
+            if hasattr(value, method):
+                getattr(value, method)(*args)
+            else:
+                del self._derived[key]
+
+    def append(self, record):
+        self.records.append(record)
+        self._changed.add(len(self.records) - 1)
+        self._patch("add", self.records[-1])
+
+    def replace(self, position, record):
+        self.records[position] = record
+        self._changed.add(position)
+        self._patch("replace", position, self.records[position])
+
+    def remove(self, position):
+        del self.records[position]
+        self._moved_from = position if self._moved_from is None else min(self._moved_from, position)
+        self._patch("remove", position)
+
+    def take_changes(self):
+        # -> {position: record} patched since draft() or the last call
+        positions = {position for position in self._changed if position < len(self.records)}
+        if self._moved_from is not None:
+            positions.update(range(self._moved_from, len(self.records)))
+        self._changed, self._moved_from = set(), None
+        return {position: self.records[position] for position in sorted(positions)}
+
+
+class SheetRepository:
+    def __init__(self, names, open_worksheets, ttl=DEFAULT_TTL, clock=time.monotonic, store=None, store_names=(),
+                 compact=None):
+        # open_worksheets() -> {name: gspread worksheet}; called lazily so the
+        # app can start from the local store without any network.
+        # compact: {name: factory(records)}, e.g. a sibuskerz.catalogue.Catalogue
+        self.names = list(names)
+        self.open_worksheets = open_worksheets
+        self._worksheets = None
+        self.ttl = ttl
+        self.clock = clock
+        self.store = store  # optional SnapshotStore, see sibuskerz.offline
+        self.store_names = set(store_names)
+        self.compact = dict(compact or {})
+        self.stats = {"hits": 0, "misses": 0, "api_calls": 0, "fallbacks": 0}
+        self.last_error = None
+        self._snapshots = {}
+        self._versions = {}
+        self._stale = set()
+        self._retry_at = {}
+        self._delta = {}
+        self._locks = {name: threading.Lock() for name in self.names}
+        self._stats_lock = threading.Lock()
+        self._open_lock = threading.Lock()
+
+    def use_delta(self, sync):
+        # sync: a sibuskerz.delta.DeltaSync for one of our worksheets
+        self._delta[sync.name] = sync
+        return sync
+
+    def worksheet(self, name):
+        if self._worksheets is None:
+            with self._open_lock:
+                if self._worksheets is None:
+                    self._worksheets = dict(self.open_worksheets())
+        return self._worksheets[name]
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+        metrics.count(f"sheets_{key}", n)
+
+    def count_call(self):
+        self._count("api_calls")
+
+    def _fresh(self, name, snap):
+        if snap is None or name in self._stale:
+            return False
+        if self.clock() - snap.loaded_at < self.ttl:
+            return True
+        # after a failed fetch, keep serving what we have for a while
+        return self.clock() < self._retry_at.get(name, 0)
+
+    def _new_snapshot(self, name, records, loaded_at):
+        version = self._versions.get(name, 0) + 1
+        self._versions[name] = version
+        if name in self.compact:
+            records = self.compact[name](records)
+        snap = Snapshot(name, records, version, loaded_at)
+        self._snapshots[name] = snap
+        return snap
+
+    def _load(self, name):
+        snap = self._snapshots.get(name)
+        delta = self._delta.get(name)
+        records = None
+        if delta is not None and snap is not None and not delta.wants_full(snap):
+            try:
+                with metrics.span("sheets.delta_sync"):
+                    records = delta.sync(snap)
+            except FullSyncNeeded:
+                pass
+        if records is None:
+            self._count("api_calls")
+            with metrics.span("sheets.get_all_records"):
+                records = self.worksheet(name).get_all_records()
+            if delta is not None:
+                delta.full_loaded(records)
+
+        if isinstance(records, Snapshot):
+            # the delta sync's patched draft (or snap itself when nothing changed)
+            snap = self._snapshots[name] = records
+            snap.loaded_at = self.clock()
+            self._save(name, snap)
+        else:
+            snap = self._new_snapshot(name, records, self.clock())
+            self._save(name, snap, patched=False)
+        self._stale.discard(name)
+        self._retry_at.pop(name, None)
+        self.last_error = None
+        return snap
+
+    def _save(self, name, snap, patched=True):
+        # the offline copy; a patched snapshot writes only its changed rows,
+        # so keeping it current costs what the change does
+        if self.store is None or name not in self.store_names:
+            return
+        with metrics.span("offline.save"):
+            if patched:
+                self.store.save_rows(name, snap.take_changes(), len(snap.records))
+            else:
+                self.store.save(name, snap.records)
+
+    def _from_store(self, name):
+        if self.store is None or name not in self.store_names:
+            return None
+        records, _ = self.store.load(name)
+        if records is None:
+            return None
+        # stored copies are always stale, so the next online read refreshes
+        return self._new_snapshot(name, records, float("-inf"))
+
+    # --- READS ---
+    def snapshot(self, name):
+        snap = self._snapshots.get(name)
+        if self._fresh(name, snap):
+            self._count("hits")
+            return snap
+
+        with self._locks[name]:
+            # another session may have refreshed it while we waited
+            snap = self._snapshots.get(name)
+            if self._fresh(name, snap):
+                self._count("hits")
+                return snap
+
+            self._count("misses")
+            try:
+                return self._load(name)
+            except Exception as exc:
+                fallback = snap or self._from_store(name)
+                if fallback is None:
+                    raise
+                self.last_error = exc
+                self._retry_at[name] = self.clock() + self.ttl
+                self._count("fallbacks")
+                return fallback
+
+    def local(self, name):
+        # never waits on the network when any copy exists (Performance Mode)
+        snap = self._snapshots.get(name)
+        if snap is None:
+            with self._locks[name]:
+                snap = self._snapshots.get(name) or self._from_store(name)
+        return snap if snap is not None else self.snapshot(name)
+
+    def load_local(self):
+        for name in self.store_names:
+            if name not in self._snapshots:
+                with self._locks[name]:
+                    self._from_store(name)
+
+    def refresh(self, name, max_age=0):
+        with self._locks[name]:
+            snap = self._snapshots.get(name)
+            if snap is not None and name not in self._stale and self.clock() - snap.loaded_at < max_age:
+                return snap
+            return self._load(name)
+
+    def records(self, name):
+        return self.snapshot(name).records
+
+    def frame(self, name):
+        # callers are free to add columns, so hand out a copy
+        return self.snapshot(name).frame.copy()
+
+    def invalidate(self, name=None, full=False):
+        # keep the old snapshot around as an offline fallback; full=True also
+        # skips the delta sync once, to pick up edits made in the Sheets UI
+        names = self.names if name is None else [name]
+        self._stale.update(names)
+        for name in names:
+            self._retry_at.pop(name, None)
+            if full and name in self._delta:
+                self._delta[name].force_full = True
+
+    # --- WRITES (always invalidate the touched worksheet) ---
+    # Single writes; use sibuskerz.writes.WriteQueue to batch several.
+    def _write(self, name, method, *args, statuses=RETRY_STATUSES):
+        try:
+            with metrics.span("sheets.write"):
+                return with_retry(getattr(self.worksheet(name), method), *args, on_attempt=self.count_call,
+                                  statuses=statuses)
+        finally:
+            self.invalidate(name)
+
+    # grow or edit the cached snapshot after a write instead of refetching it
+    def _patch(self, name, patches):
+        # patches: [(method, args)], applied to one draft that then replaces
+        # the snapshot, so a reader never sees it half patched
+        with self._locks[name]:
+            snap = self._snapshots.get(name)
+            if snap is None:
+                return
+            draft = snap.draft()
+            for method, args in patches:
+                getattr(draft, method)(*args)
+            self._snapshots[name] = draft
+            self._save(name, draft)
+
+    def patch_appended(self, name, records):
+        self._patch(name, [("append", (record,)) for record in records])
+
+    def patch_replaced(self, name, position, record):
+        self._patch(name, [("replace", (position, record))])
+
+    def patch_removed(self, name, position):
+        self._patch(name, [("remove", (position,))])
+
+    def append_row(self, name, row, record=None):
+        if record is None:
+            return self._write(name, "append_row", row, statuses=QUOTA_STATUSES)
+        with metrics.span("sheets.write"):
+            result = with_retry(self.worksheet(name).append_row, row, on_attempt=self.count_call,
+                                statuses=QUOTA_STATUSES)
+        self.patch_appended(name, [record])
+        return result
+
+    def update_cell(self, name, row, col, value):
+        return self._write(name, "update_cell", row, col, value)
+
+    def update(self, name, range_name, values):
+        return self._write(name, "update", values, range_name)
+
+    def delete_rows(self, name, start_index, end_index=None):
+        return self._write(name, "delete_rows", start_index, end_index, statuses=QUOTA_STATUSES)
+
+    def stats_since(self, baseline):
+        return {key: value - baseline.get(key, 0) for key, value in self.stats.items()}
@@ -0,0 +1,62 @@
+import html
+import re
+
+# --- SONG BOOKS ---
+# A printable book of lyrics: a contents page, then one song per page. Takes
+# setlist songs (sibuskerz.setlist.SetlistSong), which hold rows of the song
+# index, so lyrics are decoded only while a book is being written. The HTML
+# book is laid out for print; "Save as PDF" in any browser gives the PDF.
+
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+BOOK_CSS = """
+body { font-family: Georgia, serif; margin: 2em auto; max-width: 40em; }
+h1 { text-align: center; }
+ol.contents { columns: 2; font-size: 0.9em; }
+section.song { page-break-before: always; break-before: page; }
+section.song h2 { margin-bottom: 0; }
+section.song .artist { color: #555; margin-top: 0.2em; }
+section.song pre { font-family: inherit; white-space: pre-wrap; line-height: 1.4; }
+"""
+
+
+def slug(name):
+    return SLUG_RE.sub("-", str(name).casefold()).strip("-") or "songbook"
+
+
+def book_html(title, songs):
+    contents = "".join(
+        f'<li><a href="#song-{i}">{html.escape(song.title)}</a> – {html.escape(song.artist)}</li>'
+        for i, song in enumerate(songs, 1)
+    )
+    pages = "".join(
+        f'<section class="song" id="song-{i}"><h2>{i}. {html.escape(song.title)}</h2>'
+        f'<p class="artist">{html.escape(song.artist)}</p><pre>{html.escape(song.lyrics)}</pre></section>\n'
+        for i, song in enumerate(songs, 1)
+    )
+    return (
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+        f"<style>{BOOK_CSS}</style></head>\n<body><h1>{html.escape(title)}</h1>"
+        f'<ol class="contents">{contents}</ol>\n{pages}</body></html>\n'
+    )
+
+
+def book_text(title, songs):
+    parts = [title, "=" * len(title), ""]
+    parts += [f"{i:>3}. {song.title} - {song.artist}" for i, song in enumerate(songs, 1)]
+    for i, song in enumerate(songs, 1):
+        heading = f"{i}. {song.title} - {song.artist}"
+        parts += ["", "\f" + heading, "-" * len(heading), song.lyrics.strip()]
+    return "\n".join(parts) + "\n"
+
+
+FORMATS = {"html": (".html", book_html), "txt": (".txt", book_text)}  # name -> (extension, renderer)
+
+
+def write_book(path, title, songs, fmt="html"):
+    # -> bytes written
+    _, render = FORMATS[fmt]
+    data = render(title, songs).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
@@ -0,0 +1,158 @@
+import bisect
+import hashlib
+
+from sibuskerz.delta import HASH_COLUMN, row_hash
+from sibuskerz.fuzzy import DUPLICATE_SIMILARITY, TrigramIndex, similarity
+from sibuskerz.search import LyricsSearchIndex
+
+LYRICS_HEADER = ["Title", "Artist", "Lyrics", HASH_COLUMN]  # column order of the lyrics sheet
+
+
+def lyrics_row(title, artist, lyrics):
+    # a new lyrics sheet row, content hash included for the delta sync
+    return [title, artist, lyrics, row_hash([title, artist, lyrics])]
+
+# --- SONG INDEX ---
+# Built once per lyrics snapshot (see Snapshot.derived) so pages never sort,
+# format or scan the catalogue on a rerun. Appends, edits and removals on the
+# snapshot (our own writes, sibuskerz.delta) patch a copy of it. It keeps the
+# snapshot's rows rather than copies of their lyrics, so with a compact
+# catalogue (sibuskerz.catalogue) lyrics are decoded only for display.
+
+
+def song_id(title, artist):
+    key = f"{str(title).strip().casefold()}\x1f{str(artist).strip().casefold()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+class SongIndex:
+    def __init__(self, records):
+        self.rows = {}
+        self.labels = {}
+        self.search_keys = {}
+        self.text_index = LyricsSearchIndex()
+        self.fuzzy_index = TrigramIndex()
+        self.positions = []  # snapshot position -> song id (None for untitled rows)
+
+        for record in records:
+            self.positions.append(self._index(record))
+        self.order = sorted(self.rows, key=lambda sid: self.search_keys[sid])
+
+    def _index(self, record):
+        title = str(record.get("Title", "")).strip()
+        artist = str(record.get("Artist", "")).strip()
+        if not title:
+            return None
+        sid = song_id(title, artist)
+        # the same song entered twice still gets its own stable id
+        n = 2
+        base = sid
+        while sid in self.rows:
+            sid = f"{base}-{n}"
+            n += 1
+        label = f"{title} - {artist}"
+        self.rows[sid] = record
+        self.labels[sid] = label
+        self.search_keys[sid] = label.casefold()
+        self.text_index.add(sid, title, artist, str(record.get("Lyrics", "")))
+        self.fuzzy_index.add(sid, title, artist, f"{title} {artist}")
+        return sid
+
+    def _insert_ordered(self, sid):
+        keys = [self.search_keys[s] for s in self.order]
+        self.order.insert(bisect.bisect_right(keys, self.search_keys[sid]), sid)
+
+    def _unindex(self, sid):
+        del self.rows[sid], self.labels[sid], self.search_keys[sid]
+        self.text_index.remove(sid)
+        self.fuzzy_index.remove(sid)
+        self.order.remove(sid)
+
+    def add(self, record):
+        # incremental update after add_new_song, keeps display order sorted
+        sid = self._index(record)
+        self.positions.append(sid)
+        if sid is not None:
+            self._insert_ordered(sid)
+        return sid
+
+    def replace(self, position, record):
+        # an unchanged title and artist keep their id, so setlists still resolve
+        old = self.positions[position]
+        if old is not None:
+            self._unindex(old)
+        sid = self._index(record)
+        self.positions[position] = sid
+        if sid is not None:
+            self._insert_ordered(sid)
+        return sid
+
+    def remove(self, position):
+        sid = self.positions.pop(position)
+        if sid is not None:
+            self._unindex(sid)
+
+    def copy(self):
+        # patched in place of this one on a snapshot draft (Snapshot.draft)
+        other = SongIndex.__new__(SongIndex)
+        other.rows = dict(self.rows)
+        other.labels = dict(self.labels)
+        other.search_keys = dict(self.search_keys)
+        other.text_index = self.text_index.copy()
+        other.fuzzy_index = self.fuzzy_index.copy()
+        other.positions = list(self.positions)
+        other.order = list(self.order)
+        return other
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, sid):
+        return sid in self.rows
+
+    def label(self, sid):
+        return self.labels[sid]
+
+    def title(self, sid):
+        return str(self.rows[sid].get("Title", "")).strip()
+
+    def artist(self, sid):
+        return str(self.rows[sid].get("Artist", "")).strip()
+
+    def record(self, sid):
+        return self.rows[sid]
+
+    def lyrics(self, sid):
+        return str(self.rows[sid].get("Lyrics", ""))
+
+    def filter(self, term):
+        term = term.strip().casefold()
+        if not term:
+            return self.order
+        return [sid for sid in self.order if term in self.search_keys[sid]]
+
+    def closest(self, term, k=10):
+        return [sid for sid, _ in self.fuzzy_index.closest(term, k=k)]
+
+    def search(self, term, limit=None):
+        # ranked full-text match over title, artist and lyrics; falls back to
+        # a plain substring match on "Title - Artist" (e.g. "ove" in "love")
+        # and then to the closest titles/artists for typos
+        if not term.strip():
+            return self.order
+        return (
+            self.text_index.search(term, limit=limit)
+            or self.filter(term)
+            or self.closest(term, k=limit or 10)
+        )
+
+    def find_duplicates(self, title, artist):
+        # songs that look like the same title by the same artist
+        duplicates = []
+        for sid, _ in self.fuzzy_index.closest(f"{title} {artist}", k=5, min_similarity=0.5):
+            if (
+                similarity(title, self.title(sid)) >= DUPLICATE_SIMILARITY
+                and similarity(artist, self.artist(sid)) >= DUPLICATE_SIMILARITY
+            ):
+                duplicates.append(sid)
+        return duplicates
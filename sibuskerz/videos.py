@@ -0,0 +1,121 @@
+import functools
+import math
+import re
+from urllib.parse import parse_qs, urlparse
+
+# --- VIDEO GALLERY ---
+# VideoLink cells are normalised once per videos snapshot (see
+# Snapshot.derived) into embed URLs and thumbnails. The gallery page shows
+# thumbnails a page at a time and only loads a player when one is clicked.
+# Rows whose link can't be understood are collected in `problems` instead of
+# failing while the page renders.
+
+PAGE_SIZE = 6
+
+DRIVE = "drive"
+YOUTUBE = "youtube"
+VIMEO = "vimeo"
+FILE = "file"  # direct link to a video file, played by st.video
+LINK = "link"  # some other page; we can only link to it
+
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".ogg", ".ogv", ".mov", ".m4v")
+YOUTUBE_ID_RE = re.compile(r"^[\w-]{11}$")
+DRIVE_ID_RE = re.compile(r"^[\w-]{20,}$")
+
+
+class Embed:
+    def __init__(self, kind, url, embed_url=None, thumbnail_url=None):
+        self.kind = kind
+        self.url = url  # the cleaned-up original
+        self.embed_url = embed_url  # for an <iframe>; None for FILE and LINK
+        self.thumbnail_url = thumbnail_url
+
+
+def _drive_id(parsed):
+    # /file/d/<id>/view, /open?id=<id>, /uc?id=<id>&export=download
+    parts = parsed.path.split("/")
+    if "d" in parts and parts.index("d") + 1 < len(parts):
+        return parts[parts.index("d") + 1]
+    return parse_qs(parsed.query).get("id", [""])[0]
+
+
+def _youtube_id(parsed):
+    # youtu.be/<id>, /watch?v=<id>, /embed/<id>, /shorts/<id>, /live/<id>
+    if parsed.netloc.endswith("youtu.be"):
+        return parsed.path.strip("/").split("/")[0]
+    if parsed.path == "/watch":
+        return parse_qs(parsed.query).get("v", [""])[0]
+    parts = parsed.path.strip("/").split("/")
+    if len(parts) >= 2 and parts[0] in ("embed", "shorts", "live", "v"):
+        return parts[1]
+    return ""
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_video_link(link):
+    # VideoLink cell -> Embed; raises ValueError for anything unusable
+    link = str(link).strip()
+    if not link:
+        raise ValueError("empty VideoLink")
+    if "://" not in link:
+        link = f"https://{link}"
+    parsed = urlparse(link)
+    host = parsed.netloc.lower().split(":")[0]
+    if parsed.scheme not in ("http", "https") or "." not in host:
+        raise ValueError(f"not a web link: {link}")
+
+    if host.endswith("drive.google.com") or host.endswith("docs.google.com"):
+        video_id = _drive_id(parsed)
+        if not DRIVE_ID_RE.match(video_id):
+            raise ValueError(f"no file id in Google Drive link: {link}")
+        return Embed(
+            DRIVE, link,
+            embed_url=f"https://drive.google.com/file/d/{video_id}/preview",
+            thumbnail_url=f"https://drive.google.com/thumbnail?id={video_id}&sz=w640",
+        )
+
+    if host.endswith("youtube.com") or host.endswith("youtu.be") or host.endswith("youtube-nocookie.com"):
+        video_id = _youtube_id(parsed)
+        if not YOUTUBE_ID_RE.match(video_id):
+            raise ValueError(f"no video id in YouTube link: {link}")
+        return Embed(
+            YOUTUBE, f"https://www.youtube.com/watch?v={video_id}",
+            embed_url=f"https://www.youtube.com/embed/{video_id}?autoplay=1",
+            thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        )
+
+    if host.endswith("vimeo.com"):
+        video_id = next((part for part in parsed.path.split("/") if part.isdigit()), "")
+        if not video_id:
+            raise ValueError(f"no video id in Vimeo link: {link}")
+        return Embed(VIMEO, link, embed_url=f"https://player.vimeo.com/video/{video_id}?autoplay=1")
+
+    if parsed.path.lower().endswith(VIDEO_EXTENSIONS):
+        return Embed(FILE, link)
+    return Embed(LINK, link)
+
+
+class VideoGallery:
+    def __init__(self, records):
+        self.items = []  # (position in sheet, record, Embed)
+        self.problems = []  # (sheet row number, title, reason)
+        for position, record in enumerate(records):
+            try:
+                embed = parse_video_link(record.get("VideoLink", ""))
+            except ValueError as exc:
+                self.problems.append((position + 2, record.get("Title", ""), str(exc)))
+                continue
+            self.items.append((position, record, embed))
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def pages(self):
+        return max(1, math.ceil(len(self.items) / PAGE_SIZE))
+
+    def page(self, number):
+        # 1-based; out-of-range numbers are clamped
+        number = max(1, min(number, self.pages))
+        start = (number - 1) * PAGE_SIZE
+        return self.items[start:start + PAGE_SIZE]
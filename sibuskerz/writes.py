@@ -0,0 +1,146 @@
+import time
+
+from gspread.utils import rowcol_to_a1
+
+from sibuskerz import metrics
+
+# --- BATCHED WRITES ---
+# Sheet mutations are queued and sent as one request per kind: all cell and
+# range updates in a single values batchUpdate, all row deletions in a single
+# spreadsheet batchUpdate and all new rows in a single append. Each request is
+# retried with exponential backoff on quota (429) errors, which Sheets rejects
+# before applying anything. Value updates are also retried on transient 5xx
+# errors; appends and deletions are not, since a 5xx may come after the
+# request was applied and a second append duplicates the rows, a second
+# deletion removes the rows after them.
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}  # idempotent requests: reads, value updates
+QUOTA_STATUSES = {429}  # appends and deletions
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0  # seconds, doubled on every retry
+
+
+def error_status(exc):
+    code = getattr(exc, "code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
+
+
+def with_retry(fn, *args, attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, sleep=time.sleep, on_attempt=None,
+               statuses=RETRY_STATUSES):
+    for attempt in range(attempts):
+        if on_attempt is not None:
+            on_attempt()
+        try:
+            return fn(*args)
+        except Exception as exc:
+            if error_status(exc) not in statuses or attempt == attempts - 1:
+                raise
+            sleep(base_delay * 2 ** attempt)
+
+
+class WriteReport:
+    def __init__(self):
+        self.applied = []  # (kind, count)
+        self.failed = []  # (kind, count, error)
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def summary(self):
+        parts = [f"{count} {kind}(s) saved" for kind, count in self.applied]
+        parts += [f"{count} {kind}(s) FAILED: {error}" for kind, count, error in self.failed]
+        return "; ".join(parts) or "nothing to write"
+
+
+class WriteQueue:
+    def __init__(self, repo, name, sleep=time.sleep):
+        self.repo = repo
+        self.name = name
+        self.sleep = sleep
+        self._updates = {}  # A1 range -> values, last write wins
+        self._deletes = set()  # 1-based sheet rows
+        self._appends = []  # (row values, record or None)
+
+    def __len__(self):
+        return len(self._updates) + len(self._deletes) + len(self._appends)
+
+    def update_cell(self, row, col, value):
+        self._updates[rowcol_to_a1(row, col)] = [[value]]
+
+    def update(self, range_name, values):
+        self._updates[range_name] = values
+
+    def delete_rows(self, start_index, end_index=None):
+        self._deletes.update(range(start_index, (end_index or start_index) + 1))
+
+    def append(self, row, record=None):
+        # pass the record (header -> value) to patch the cached snapshot
+        # instead of refetching the sheet after the write
+        self._appends.append((list(row), record))
+
+    def _send(self, report, kind, count, fn, *args, statuses=RETRY_STATUSES):
+        try:
+            with metrics.span("sheets.write"):
+                with_retry(fn, *args, sleep=self.sleep, on_attempt=self.repo.count_call, statuses=statuses)
+        except Exception as exc:
+            report.failed.append((kind, count, exc))
+            return False
+        report.applied.append((kind, count))
+        return True
+
+    def flush(self, invalidate=True):
+        # invalidate=False leaves the cached snapshot alone for callers that
+        # patch it themselves (see PerformanceTable)
+        report = WriteReport()
+        if not len(self):
+            return report
+        ws = self.repo.worksheet(self.name)
+
+        # updates address rows as they are now, so they go before deletions
+        if self._updates:
+            data = [{"range": rng, "values": values} for rng, values in self._updates.items()]
+            self._send(report, "update", len(data), ws.batch_update, data)
+
+        if self._deletes:
+            # one deleteDimension per contiguous run, bottom-up so earlier
+            # deletions don't shift the rows of later ones
+            requests = []
+            for start, end in _runs(sorted(self._deletes, reverse=True)):
+                requests.append({"deleteDimension": {"range": {
+                    "sheetId": ws.id,
+                    "dimension": "ROWS",
+                    "startIndex": start - 1,
+                    "endIndex": end,
+                }}})
+            self._send(report, "delete", len(self._deletes), ws.spreadsheet.batch_update, {"requests": requests},
+                       statuses=QUOTA_STATUSES)
+
+        appended = False
+        if self._appends:
+            rows = [row for row, _ in self._appends]
+            appended = self._send(report, "append", len(rows), ws.append_rows, rows, statuses=QUOTA_STATUSES)
+
+        records = [record for _, record in self._appends]
+        if appended and not self._updates and not self._deletes and all(r is not None for r in records):
+            self.repo.patch_appended(self.name, records)
+        elif invalidate or not report.ok:
+            self.repo.invalidate(self.name)
+
+        self._updates.clear()
+        self._deletes.clear()
+        self._appends.clear()
+        return report
+
+
+def _runs(rows_desc):
+    # [9, 8, 7, 4, 3] -> [(7, 9), (3, 4)]
+    runs = []
+    for row in rows_desc:
+        if runs and runs[-1][0] == row + 1:
+            runs[-1] = (row, runs[-1][1])
+        else:
+            runs.append((row, row))
+    return runs
@@ -0,0 +1,130 @@
+import pytest
+
+from benchmarks.fake_gspread import FakeWorksheet
+from sibuskerz.catalogue import Catalogue
+from sibuskerz.delta import MAX_FETCH_SHARE, DeltaSync, FullSyncNeeded
+from sibuskerz.offline import SnapshotStore
+from sibuskerz.sheets import SheetRepository
+from sibuskerz.songs import LYRICS_HEADER, SongIndex, lyrics_row
+
+NAME = "lyrics"
+SONGS = 20
+
+
+def song(i, lyrics=None):
+    return lyrics_row(f"Lagu {i}", f"Artis {i % 7}", lyrics or f"baris {i} cinta kita")
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    # the app's lyrics setup (sibuskerz.connect.open_repository) on a fake sheet
+    ws = FakeWorksheet(NAME, LYRICS_HEADER, [song(i) for i in range(SONGS)])
+    repo = SheetRepository([NAME], lambda: {NAME: ws}, store=SnapshotStore(str(tmp_path / "snapshots.sqlite3")),
+                           store_names=[NAME], compact={NAME: Catalogue})
+    delta = repo.use_delta(DeltaSync(repo, NAME))
+    repo.snapshot(NAME).derived("song_index", SongIndex)
+    return ws, repo, delta
+
+
+def refresh(repo):
+    before = repo.snapshot(NAME)
+    repo.invalidate(NAME)
+    after = repo.snapshot(NAME)
+    return before, after
+
+
+def check(ws, repo, snap):
+    records = [dict(record) for record in snap.records]
+    width = len(ws.header)
+    assert records == [dict(zip(ws.header, row + [""] * (width - len(row)))) for row in ws.rows]
+    assert repo.store.load(NAME)[0] == records
+
+    index = snap.derived("song_index", SongIndex)
+    fresh = SongIndex(records)
+    assert index.positions == fresh.positions
+    assert index.order == fresh.order
+    assert [index.lyrics(sid) for sid in index.order] == [fresh.lyrics(sid) for sid in fresh.order]
+    for query in ["cinta", "baris 3", "lagu", "artis 2", "bar"]:
+        assert set(index.text_index.search(query)) == set(fresh.text_index.search(query))
+
+
+def patched(before, after):
+    # patched in place: same snapshot version, song index carried over
+    return after.version == before.version and "song_index" in after._derived
+
+
+def test_edit_in_the_middle(sheet):
+    ws, repo, delta = sheet
+    ws.rows[8] = song(8, "lirik baru di tengah")
+    before, after = refresh(repo)
+    assert delta.last_report == {"mode": "delta", "rows": SONGS, "fetched": 1, "removed": 0}
+    assert patched(before, after)
+    check(ws, repo, after)
+
+
+def test_insert_in_the_middle_rebuilds(sheet):
+    ws, repo, delta = sheet
+    ws.rows.insert(5, song(100))
+    before, after = refresh(repo)
+    assert delta.last_report["mode"] == "delta" and delta.last_report["fetched"] == 1
+    assert after.version == before.version + 1 and "song_index" not in after._derived
+    check(ws, repo, after)
+
+
+def test_delete(sheet):
+    ws, repo, delta = sheet
+    del ws.rows[3]
+    before, after = refresh(repo)
+    assert delta.last_report == {"mode": "delta", "rows": SONGS - 1, "fetched": 0, "removed": 1}
+    assert patched(before, after)
+    check(ws, repo, after)
+
+
+def test_append_at_the_end(sheet):
+    ws, repo, delta = sheet
+    ws.rows += [song(100), song(101)]
+    before, after = refresh(repo)
+    assert delta.last_report == {"mode": "delta", "rows": SONGS + 2, "fetched": 2, "removed": 0}
+    assert patched(before, after)
+    check(ws, repo, after)
+
+
+def test_mixed_changes(sheet):
+    ws, repo, delta = sheet
+    ws.rows[2] = song(2, "diubah")
+    del ws.rows[10]
+    ws.rows.append(song(100))
+    before, after = refresh(repo)
+    assert delta.last_report["mode"] == "delta" and patched(before, after)
+    check(ws, repo, after)
+
+
+def test_changed_header_needs_a_full_pull(sheet):
+    ws, repo, delta = sheet
+    ws.header[2] = "Lirik"
+    with pytest.raises(FullSyncNeeded):
+        delta.sync(repo.snapshot(NAME))
+    ws.header[2] = "Lyrics"
+    ws.header.append("Key")
+    ws.rows[0].append("C")
+    _, after = refresh(repo)
+    assert delta.last_report["mode"] == "full"
+    check(ws, repo, after)
+
+
+def test_past_the_fetch_share_a_full_pull(sheet):
+    ws, repo, delta = sheet
+    limit = int(MAX_FETCH_SHARE * SONGS)
+    for i in range(limit):
+        ws.rows[i] = song(i, "diubah")
+    _, after = refresh(repo)
+    assert delta.last_report["mode"] == "delta" and delta.last_report["fetched"] == limit
+    check(ws, repo, after)
+
+    for i in range(limit + 1):
+        ws.rows[i] = song(i, "diubah lagi")
+    with pytest.raises(FullSyncNeeded):
+        delta.sync(repo.snapshot(NAME))
+    _, after = refresh(repo)
+    assert delta.last_report["mode"] == "full"
+    check(ws, repo, after)
@@ -0,0 +1,86 @@
+import threading
+from decimal import Decimal
+
+import pytest
+
+from sibuskerz.ledger import Ledger, perf_year
+
+THREADS = 6
+
+
+def race(fn, *args):
+    # every thread calls fn at once; -> the results
+    barrier = threading.Barrier(THREADS)
+    results = []
+
+    def run():
+        barrier.wait()
+        results.append(fn(*args))
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_record_paid_posts_once_under_concurrency(tmp_path):
+    for trial in range(10):
+        ledger = Ledger(str(tmp_path / f"ledger{trial}.sqlite3"))
+        results = race(ledger.record_paid, "p1", "2025-01-04", 60, "Halim")
+        assert results.count(True) == 1
+        assert ledger.balance("Halim", "paid") == Decimal("30.00")
+        assert ledger.balance("Halim", "unpaid") == Decimal("0.00")
+        assert ledger.balance("Halim", "total") == Decimal("30.00")
+
+
+def test_record_done_posts_once_under_concurrency(tmp_path):
+    for trial in range(10):
+        ledger = Ledger(str(tmp_path / f"ledger{trial}.sqlite3"))
+        results = race(ledger.record_done, "p1", "2025-01-04", 60, "Halim, Kay")
+        assert results.count(True) == 1
+        assert ledger.earned("Halim", year=2025) == {
+            "year": Decimal("20.00"), "unpaid": Decimal("20.00"), "total": Decimal("20.00"),
+        }
+
+
+def test_edited_performance_is_reposted(tmp_path):
+    ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+    assert ledger.record_done("p1", "2025-01-04", 60, "Halim")
+    assert not ledger.record_done("p1", "2025-01-04", 60, "Halim")
+    assert ledger.record_done("p1", "2025-01-04", 90, "Halim")
+    assert ledger.balance("Halim") == Decimal("45.00")
+    assert ledger.record_paid("p1")
+    assert not ledger.record_done("p1", "2025-01-04", 120, "Halim")  # paid settlements are final
+    assert ledger.balance("Halim", "paid") == Decimal("45.00")
+
+
+@pytest.mark.parametrize("date, year", [
+    ("2024-01-04", 2024), ("4/1/2024", 2024), ("31/12/2023", 2023), ("04 Jan 2022", 2022), ("2024-01-04 00:00:00", 2024),
+])
+def test_hand_typed_dates_are_booked_under_their_year(date, year):
+    assert perf_year(date) == year
+
+
+@pytest.mark.parametrize("date", ["", None, "TBC", "nan"])
+def test_unreadable_dates_are_rejected(tmp_path, date):
+    with pytest.raises(ValueError):
+        perf_year(date)
+    ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+    with pytest.raises(ValueError):
+        ledger.record_done("p1", date, 60, "Halim")
+    assert ledger.is_empty()
+
+
+def test_backfill_skips_and_reports_unreadable_dates(tmp_path):
+    ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+    skipped = ledger.backfill([
+        {"ID": "p1", "Date": "4/1/2024", "TotalToken": 60, "Performers": "Halim", "Status": "Done", "PaidStatus": "Paid"},
+        {"ID": "p2", "Date": "TBC", "TotalToken": 40, "Performers": "Halim", "Status": "Done", "PaidStatus": ""},
+        {"ID": "p3", "Date": "2024-02-01", "TotalToken": 20, "Performers": "Halim", "Status": "Done", "PaidStatus": ""},
+    ])
+    assert [perf_id for perf_id, _ in skipped] == ["p2"]
+    assert ledger.earned("Halim", year=2024) == {
+        "year": Decimal("40.00"), "unpaid": Decimal("10.00"), "total": Decimal("40.00"),
+    }
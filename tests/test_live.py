@@ -0,0 +1,34 @@
+import pytest
+
+from sibuskerz.live import LiveHub
+
+
+class FakeSetlist:
+    def __init__(self):
+        self.index = 0
+
+    def next(self):
+        self.index += 1
+
+
+def test_joining_needs_the_code():
+    hub = LiveHub()
+    live = hub.start(FakeSetlist(), "driver")
+    assert hub.join("ZZZZ" if live.code != "ZZZZ" else "YYYY", "phone") is None
+    assert hub.join(f" {live.code.lower()} ", "phone") is live
+
+
+def test_only_phones_that_joined_can_take_over():
+    hub = LiveHub()
+    live = hub.start(FakeSetlist(), "driver")
+    with pytest.raises(PermissionError):
+        live.take_over("stranger")
+    assert live.driver == "driver"
+
+    hub.join(live.code, "phone")
+    live.poll("phone")
+    assert live.following() == 1
+    live.take_over("phone")
+    assert live.driver == "phone" and live.following() == 0
+    live.take_over("driver")  # the phone that started it can take it back
+    assert live.driver == "driver"
@@ -0,0 +1,142 @@
+import json
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+from sibuskerz.lyrics_ovh import ERROR, FOUND, NOT_FOUND, LyricsClient, ResponseCache
+
+BACKOFF = 0.1
+
+
+class StubLyricsOvh(BaseHTTPRequestHandler):
+    # the title picks the behaviour: "missing ..." 404s, "broken ..." 500s,
+    # "flaky ..." 503s twice then answers, "slow <s> ..." waits s seconds
+    hits = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        artist, title = [unquote(part) for part in self.path.split("/")[-2:]]
+        with self.lock:
+            self.hits[title] += 1
+            hits = self.hits[title]
+        if title.startswith("slow"):
+            time.sleep(float(title.split()[1]))
+        if title.startswith("missing"):
+            self._reply(404, {"error": "No lyrics found"})
+        elif title.startswith("broken") or (title.startswith("flaky") and hits <= 2):
+            self._reply(503 if title.startswith("flaky") else 500, {"error": "upstream"})
+        else:
+            self._reply(200, {"lyrics": f"lyrics of {title} by {artist}"})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out on a "slow" title and hung up
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLyricsOvh)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_hits():
+    StubLyricsOvh.hits.clear()
+
+
+def client(base_url, cache=None, **kwargs):
+    return LyricsClient(base_url, cache=cache or ResponseCache(), backoff=BACKOFF, **kwargs)
+
+
+def test_found_lyrics_are_cached(base_url):
+    lyrics = client(base_url)
+    first = lyrics.lookup("Artist", "song one")
+    second = lyrics.lookup("artist ", "Song One")
+    assert first.status == FOUND and first.lyrics == "lyrics of song one by Artist"
+    assert second.cached and second.lyrics == first.lyrics
+    assert StubLyricsOvh.hits["song one"] == 1
+
+
+def test_404_is_cached_as_not_found(base_url):
+    lyrics = client(base_url)
+    assert lyrics.lookup("Artist", "missing one").status == NOT_FOUND
+    again = lyrics.lookup("Artist", "missing one")
+    assert again.status == NOT_FOUND and again.cached
+    assert StubLyricsOvh.hits["missing one"] == 1
+
+
+def test_server_errors_are_not_cached(base_url):
+    cache = ResponseCache()
+    lyrics = client(base_url, cache)
+    assert lyrics.lookup("Artist", "broken one").status == ERROR
+    assert cache.get(cache.key("Artist", "broken one")) is None
+    assert lyrics.lookup("Artist", "broken one").status == ERROR
+    assert StubLyricsOvh.hits["broken one"] == 2 * 4  # every lookup retried
+
+
+def test_transport_errors_are_not_cached():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # nothing listens here once closed
+    cache = ResponseCache()
+    result = client(f"http://127.0.0.1:{port}/v1", cache).lookup("Artist", "song")
+    assert result.status == ERROR and result.error is not None
+    assert cache.get(cache.key("Artist", "song")) is None
+
+
+def test_retries_with_backoff(base_url):
+    start = time.perf_counter()
+    result = client(base_url).lookup("Artist", "flaky one")
+    elapsed = time.perf_counter() - start
+    assert result.status == FOUND
+    assert StubLyricsOvh.hits["flaky one"] == 3
+    assert elapsed >= BACKOFF * 2  # no wait before the first retry, then backoff * 2
+
+
+def test_read_timeout_is_not_retried(base_url):
+    start = time.perf_counter()
+    result = client(base_url, timeout=(1, 0.2)).lookup("Artist", "slow 1 one")
+    assert result.status == ERROR
+    assert StubLyricsOvh.hits["slow 1 one"] == 1
+    assert time.perf_counter() - start < 1
+
+
+def test_sqlite_cache_survives_a_restart(base_url, tmp_path):
+    path = str(tmp_path / "lyrics_ovh.sqlite3")
+    client(base_url, ResponseCache(path)).lookup("Artist", "song two")
+    client(base_url, ResponseCache(path)).lookup("Artist", "missing two")
+
+    restarted = client(base_url, ResponseCache(path))
+    found = restarted.lookup("Artist", "song two")
+    missing = restarted.lookup("Artist", "missing two")
+    assert found.cached and found.status == FOUND
+    assert missing.cached and missing.status == NOT_FOUND
+    assert StubLyricsOvh.hits == Counter({"song two": 1, "missing two": 1})
+
+
+def test_lookup_many_keeps_input_order(base_url):
+    # later titles answer first
+    pairs = [(f"Artist {i}", f"slow {0.05 * (5 - i):.2f} song {i}") for i in range(5)]
+    pairs.append(("Artist", "missing three"))
+    progress = []
+    results = client(base_url).lookup_many(pairs, on_result=lambda done, total, _: progress.append((done, total)))
+    assert [(r.artist, r.title) for r in results] == pairs
+    assert [r.status for r in results] == [FOUND] * 5 + [NOT_FOUND]
+    assert progress == [(n, 6) for n in range(1, 7)]
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from benchmarks.fake_gspread import FakeWorksheet
+from sibuskerz.offline import SnapshotStore, SnapshotSync
+from sibuskerz.sheets import SheetRepository
+
+HEADER = ["Title", "Artist", "Lyrics"]
+ROWS = [["Kerana Mu", "Siti", "la la"], ["Gemilang", "Jaclyn", "na na"]]
+RECORDS = [dict(zip(HEADER, row)) for row in ROWS]
+
+
+def make_repo(ws, path):
+    return SheetRepository(["lyrics"], lambda: {"lyrics": ws}, store=SnapshotStore(path), store_names=["lyrics"])
+
+
+def test_snapshot_falls_back_to_the_stored_copy(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite3")
+    ws = FakeWorksheet("lyrics", HEADER, ROWS)
+    assert make_repo(ws, path).records("lyrics") == RECORDS  # online run fills the store
+
+    ws.offline = True
+    repo = make_repo(ws, path)
+    assert repo.records("lyrics") == RECORDS
+    assert isinstance(repo.last_error, ConnectionError)
+    assert repo.stats["fallbacks"] == 1
+
+
+def test_snapshot_keeps_serving_the_last_copy_when_a_refresh_fails(tmp_path):
+    ws = FakeWorksheet("lyrics", HEADER, ROWS)
+    repo = make_repo(ws, str(tmp_path / "snapshots.sqlite3"))
+    first = repo.snapshot("lyrics")
+
+    ws.offline = True
+    repo.invalidate("lyrics")
+    assert repo.snapshot("lyrics") is first
+    assert isinstance(repo.last_error, ConnectionError)
+
+
+def test_local_makes_no_sheet_calls(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite3")
+    ws = FakeWorksheet("lyrics", HEADER, ROWS)
+    make_repo(ws, path).records("lyrics")
+
+    ws.offline = True
+    ws.calls = 0
+    repo = make_repo(ws, path)
+    repo.load_local()
+    assert list(repo.local("lyrics").records) == RECORDS
+    assert ws.calls == 0
+
+
+def test_sync_once_sets_and_clears_last_error(tmp_path):
+    ws = FakeWorksheet("lyrics", HEADER, ROWS)
+    repo = make_repo(ws, str(tmp_path / "snapshots.sqlite3"))
+    warmed = []
+    sync = SnapshotSync(repo, ["lyrics"], interval=0, warm=warmed.append)
+
+    ws.offline = True
+    assert sync.sync_once() is False
+    assert isinstance(sync.last_error, ConnectionError)
+    assert sync.last_success is None and warmed == []
+
+    ws.offline = False
+    ws.rows.append(["Isabella", "Search", "oh"])
+    assert sync.sync_once() is True
+    assert sync.last_error is None and sync.last_success is not None
+    assert warmed == [repo]
+    assert SnapshotStore(repo.store.path).load("lyrics")[0][-1] == {"Title": "Isabella", "Artist": "Search", "Lyrics": "oh"}
+
+
+def test_derived_structures_are_built_once_per_snapshot(tmp_path):
+    ws = FakeWorksheet("lyrics", HEADER, ROWS)
+    snap = make_repo(ws, str(tmp_path / "snapshots.sqlite3")).snapshot("lyrics")
+    builds = []
+
+    def slow_index(records):
+        builds.append(1)
+        time.sleep(0.05)
+        return list(records)
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def session():
+        barrier.wait()
+        results.append(snap.derived("song_index", slow_index))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,104 @@
+import pytest
+
+from benchmarks.fake_gspread import FakeWorksheet
+from sibuskerz.ledger import Ledger
+from sibuskerz.performances import PerformanceTable, StaleRowError
+from sibuskerz.sheets import SheetRepository
+
+HEADER = ["Date", "Venue", "TotalToken", "Performers", "Status", "PaidStatus", "ID", "Version"]
+ROWS = [
+    ["2025-01-04", "Pasar Seni", 60, "Halim, Kay", "Done", "", "p1", 1],
+    ["2025-01-04", "KLCC", 40, "Halim", "Done", "", "p2", 1],
+    ["2025-01-11", "Bukit Bintang", 0, "Kay", "Planned", "", "p3", 1],
+]
+
+
+def make_table(rows=ROWS):
+    ws = FakeWorksheet("performances", HEADER, rows)
+    repo = SheetRepository(["performances"], lambda: {"performances": ws})
+    return ws, PerformanceTable(repo, "performances")
+
+
+def test_update_writes_only_the_changed_cells_and_version():
+    ws, table = make_table()
+    table.snapshot()
+    ws.rows[0][2] = "RM 65.00"  # fixed by hand in the sheet; Version stays 1
+    assert table.update("p1", {"Venue": "Central Market"}, 1).ok
+    assert ws.rows[0] == ["2025-01-04", "Central Market", "RM 65.00", "Halim, Kay", "Done", "", "p1", 2]
+    assert table.find("p1")["Version"] == 2
+
+
+def test_mark_paid_keeps_hand_edits(tmp_path):
+    ws, table = make_table()
+    done = table.unpaid()
+    ws.rows[1][3] = "Halim, Kay"
+    assert table.mark_paid(done, Ledger(str(tmp_path / "ledger.sqlite3"))).ok
+    assert [row[5] for row in ws.rows] == ["Paid", "Paid", ""]
+    assert ws.rows[1][3] == "Halim, Kay"
+    assert [row[7] for row in ws.rows] == [2, 2, 1]
+
+
+def test_ensure_ids_adds_the_columns_and_backfills_every_row():
+    legacy = ["Date", "Venue", "TotalToken", "Performers", "Status"]
+    ws = FakeWorksheet("performances", legacy, [row[:5] for row in ROWS])
+    table = PerformanceTable(SheetRepository(["performances"], lambda: {"performances": ws}), "performances")
+    assert table.ensure_ids(extra_columns=["PaidStatus"]).ok
+    assert ws.header == legacy + ["ID", "Version", "PaidStatus"]
+    ids = [row[5] for row in ws.rows]
+    assert len(set(ids)) == 3 and all(i.startswith("p") for i in ids)
+    assert [row[6] for row in ws.rows] == [1, 1, 1]
+    assert [table.find(i)["Venue"] for i in ids] == ["Pasar Seni", "KLCC", "Bukit Bintang"]
+    assert table.ensure_ids(extra_columns=["PaidStatus"]) is None  # already migrated
+
+
+def test_a_version_mismatch_raises_stale_row_error():
+    ws, table = make_table()
+    table.snapshot()
+    ws.rows[1][7] = 2  # someone else saved this gig meanwhile
+    with pytest.raises(StaleRowError):
+        table.update("p2", {"Venue": "Pavilion"}, 1)
+    assert ws.rows[1][1] == "KLCC"
+    assert table.find("p2")["Version"] == 2  # the snapshot was dropped and reloaded
+
+
+def test_a_moved_row_raises_stale_row_error():
+    ws, table = make_table()
+    table.snapshot()
+    del ws.rows[0]  # deleted by hand: p2 now sits where p1 was
+    with pytest.raises(StaleRowError):
+        table.update("p1", {"Venue": "Pavilion"}, 1)
+    assert [row[1] for row in ws.rows] == ["KLCC", "Bukit Bintang"]
+
+
+def test_row_map_follows_deletes():
+    ws, table = make_table()
+    assert table.delete("p1", 1).ok
+    assert [row[6] for row in ws.rows] == ["p2", "p3"]
+    assert table.row_map().positions == {"p2": 0, "p3": 1}
+    assert table.row_map().row("p3") == 3
+    with pytest.raises(StaleRowError):
+        table.row_map().position("p1")
+    assert table.update("p3", {"Venue": "Pavilion"}, 1).ok
+    assert ws.rows[1][1] == "Pavilion"
+
+
+def test_two_gigs_on_the_same_date_are_separate_rows():
+    ws, table = make_table()
+    new_id, report = table.add({"Date": "2025-01-04", "Venue": "Pavilion", "Status": "Planned"})
+    assert report.ok and new_id not in ("p1", "p2")
+    assert table.update("p2", {"Status": "Cancelled"}, 1).ok
+    assert table.update(new_id, {"Status": "Done", "TotalToken": 30}, 1).ok
+    same_day = [(row[1], row[4], row[6]) for row in ws.rows if row[0] == "2025-01-04"]
+    assert same_day == [("Pasar Seni", "Done", "p1"), ("KLCC", "Cancelled", "p2"), ("Pavilion", "Done", new_id)]
+    assert table.find(new_id)["TotalToken"] == 30
+
+
+def test_mark_paid_writes_nothing_for_an_unreadable_date(tmp_path):
+    rows = [list(row) for row in ROWS]
+    rows[1][0] = "TBC"
+    ws, table = make_table(rows)
+    ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+    with pytest.raises(ValueError):
+        table.mark_paid(table.unpaid(), ledger)
+    assert [row[5] for row in ws.rows] == ["", "", ""]
+    assert ledger.is_empty()
@@ -0,0 +1,35 @@
+import pytest
+
+from sibuskerz.search import LyricsSearchIndex
+
+SONGS = {
+    "s1": ("Kamu Segalanya", "Anuar Zain", "kamu segalanya bagiku"),
+    "s2": ("Tak Mengapa", "Hazama", "tak mengapa, tk apa"),
+    "s3": ("Aku Tidak Mengerti", "Ella", "aku tidak mengerti engkau"),
+    "s4": ("X", "Band", "x"),
+    "s5": ("Yang Terindah", "Ungu", "yg terindah"),
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = LyricsSearchIndex()
+    for sid, song in SONGS.items():
+        index.add(sid, *song)
+    return index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("kamu s", {"s1", "s3"}),  # a word just started doesn't empty the results; kamu ~ engkau
+    ("kamu seg", {"s1"}),
+    ("kam", {"s1"}),  # long forms are indexed as written
+    ("tida", {"s3"}),
+    ("tidak", {"s2", "s3"}),  # complete words still expand
+    ("tk", {"s2", "s3"}),
+    ("kau", {"s1", "s3"}),
+    ("yang", {"s5"}),
+    ("yg", {"s5"}),
+    ("x", {"s4"}),  # no longer shorthand for "tak"
+])
+def test_as_you_type(index, query, expected):
+    assert set(index.search(query)) == expected
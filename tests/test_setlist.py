@@ -0,0 +1,24 @@
+from sibuskerz.setlist import Setlist, SetlistSong, lyrics_html
+
+
+def song(n):
+    return SetlistSong(f"s{n}", f"Lagu {n}", "Artis", {"Lyrics": f"baris pertama lagu {n}"})
+
+
+def test_prefetch_renders_the_next_song_ahead():
+    setlist = Setlist([song(n) for n in range(3)])
+    lyrics_html.cache_clear()
+    setlist.current.html
+    setlist.prefetch()
+    assert lyrics_html.cache_info().misses == 2
+
+    setlist.next()
+    setlist.current.html
+    assert lyrics_html.cache_info().hits == 1
+
+
+def test_prefetch_at_the_last_song_does_nothing():
+    setlist = Setlist([song(0)])
+    lyrics_html.cache_clear()
+    setlist.prefetch()
+    assert lyrics_html.cache_info().currsize == 0
@@ -0,0 +1,19 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from sibuskerz.settlement import settle, split_performance
+
+
+def test_share_is_half_up_in_sen():
+    assert split_performance(5, "a, b, c, d, e, f, g") == (500, 63, ["a", "b", "c", "d", "e", "f", "g"])
+    assert split_performance("", "a") == (0, 0, ["a"])
+
+
+def test_settle_accepts_a_non_unique_index():
+    first = pd.DataFrame({"TotalToken": [60, 30], "Performers": ["Halim", "Halim, Kay"]})
+    second = pd.DataFrame({"TotalToken": [90], "Performers": ["Kay"]})
+    settlement = settle(pd.concat([first, second]))
+    assert settlement.earned("Halim") == Decimal("40.00")
+    assert settlement.earned("Kay") == Decimal("55.00")
+    assert settlement.totals["total_token"] == Decimal("180.00")
@@ -0,0 +1,154 @@
+import pytest
+
+from benchmarks.fake_gspread import FakeAPIError, FakeWorksheet
+from sibuskerz.sheets import SheetRepository
+from sibuskerz.writes import QUOTA_STATUSES, WriteQueue, with_retry
+
+HEADER = ["Date", "Venue"]
+
+
+def make_repo(rows):
+    ws = FakeWorksheet("performances", HEADER, rows)
+    return ws, SheetRepository(["performances"], lambda: {"performances": ws})
+
+
+def fail_after(fn, status):
+    # applies the request, then answers with an error, once
+    failed = []
+
+    def call(*args):
+        result = fn(*args)
+        if not failed:
+            failed.append(status)
+            raise FakeAPIError(status, "backend error")
+        return result
+    return call
+
+
+def test_updates_are_retried_on_5xx():
+    sleeps = []
+    assert with_retry(fail_after(lambda: "ok", 503), sleep=sleeps.append) == "ok"
+    assert sleeps == [1.0]
+
+
+def test_appends_are_not_retried_on_5xx():
+    ws, repo = make_repo([["2025-01-04", "Pasar Seni"]])
+    ws.append_rows = fail_after(ws.append_rows, 503)
+    queue = WriteQueue(repo, "performances", sleep=lambda s: None)
+    queue.append(["2025-01-05", "KLCC"])
+    report = queue.flush()
+    assert not report.ok
+    assert ws.rows == [["2025-01-04", "Pasar Seni"], ["2025-01-05", "KLCC"]]  # not twice
+
+
+def test_deletes_are_not_retried_on_5xx():
+    ws, repo = make_repo([["2025-01-04", "A"], ["2025-01-05", "B"], ["2025-01-06", "C"]])
+    ws.spreadsheet.batch_update = fail_after(ws.spreadsheet.batch_update, 502)
+    queue = WriteQueue(repo, "performances", sleep=lambda s: None)
+    queue.delete_rows(2)
+    assert not queue.flush().ok
+    assert ws.rows == [["2025-01-05", "B"], ["2025-01-06", "C"]]  # B survives
+
+
+def test_quota_errors_are_retried_for_appends_and_deletes():
+    sleeps = []
+    call = fail_after(lambda: "ok", 429)  # rejected before anything was applied
+    assert with_retry(call, sleep=sleeps.append, statuses=QUOTA_STATUSES) == "ok"
+    assert sleeps == [1.0]
+    with pytest.raises(FakeAPIError):
+        with_retry(fail_after(lambda: "ok", 503), sleep=sleeps.append, statuses=QUOTA_STATUSES)
+
+
+def test_repository_append_row_is_not_retried_on_5xx():
+    ws, repo = make_repo([])
+    ws.append_row = fail_after(ws.append_row, 500)
+    with pytest.raises(FakeAPIError):
+        repo.append_row("performances", ["2025-01-05", "KLCC"], record={"Date": "2025-01-05", "Venue": "KLCC"})
+    assert ws.rows == [["2025-01-05", "KLCC"]]
+
+
+def numbered(n):
+    return [[f"2025-01-{day:02d}", f"Venue {day}"] for day in range(1, n + 1)]
+
+
+def test_deletes_go_as_contiguous_runs_bottom_up():
+    ws, repo = make_repo(numbered(10))
+    bodies = []
+    send = ws.spreadsheet.batch_update
+    ws.spreadsheet.batch_update = lambda body: bodies.append(body) or send(body)
+    queue = WriteQueue(repo, "performances")
+    queue.delete_rows(3, 5)  # sheet rows, header is row 1
+    queue.delete_rows(9)
+    queue.delete_rows(8)
+    queue.delete_rows(11)
+    report = queue.flush()
+    assert report.applied == [("delete", 6)]
+    ranges = [(r["deleteDimension"]["range"]["startIndex"], r["deleteDimension"]["range"]["endIndex"])
+              for r in bodies[0]["requests"]]
+    assert ranges == [(10, 11), (7, 9), (2, 5)]  # one request each, last rows first
+    assert [row[1] for row in ws.rows] == ["Venue 1", "Venue 5", "Venue 6", "Venue 9"]
+
+
+def test_a_failed_request_is_reported_and_the_rest_applied():
+    ws, repo = make_repo(numbered(3))
+    repo.snapshot("performances")
+
+    def rejected(rows, **kwargs):
+        raise FakeAPIError(400, "Invalid values")
+    ws.append_rows = rejected
+    queue = WriteQueue(repo, "performances")
+    queue.update_cell(2, 2, "KLCC")
+    queue.append(["2025-02-01", "Pavilion"])
+    report = queue.flush()
+    assert not report.ok
+    assert report.applied == [("update", 1)]
+    assert [(kind, count) for kind, count, _ in report.failed] == [("append", 1)]
+    assert report.summary() == "1 update(s) saved; 1 append(s) FAILED: Invalid values"
+    assert ws.rows[0][1] == "KLCC" and len(ws.rows) == 3
+    assert not len(queue)
+
+    ws.calls = 0
+    assert repo.records("performances")[0]["Venue"] == "KLCC"  # refetched
+    assert ws.calls == 1
+
+
+def test_appends_with_records_patch_the_snapshot():
+    ws, repo = make_repo(numbered(2))
+    before = repo.snapshot("performances")
+    queue = WriteQueue(repo, "performances")
+    queue.append(["2025-02-01", "Pavilion"], record={"Date": "2025-02-01", "Venue": "Pavilion"})
+    assert queue.flush().ok
+
+    ws.calls = 0
+    after = repo.snapshot("performances")
+    assert ws.calls == 0
+    assert after is not before and after.version == before.version
+    assert list(after.records)[-1] == {"Date": "2025-02-01", "Venue": "Pavilion"}
+    assert len(before.records) == 2  # sessions holding the old snapshot see it unchanged
+
+
+@pytest.mark.parametrize("queue_writes", [
+    lambda queue: queue.append(["2025-02-01", "Pavilion"]),  # no record to patch with
+    lambda queue: queue.update_cell(2, 2, "KLCC"),
+    lambda queue: queue.delete_rows(2),
+])
+def test_other_writes_invalidate_the_snapshot(queue_writes):
+    ws, repo = make_repo(numbered(2))
+    repo.snapshot("performances")
+    queue = WriteQueue(repo, "performances")
+    queue_writes(queue)
+    assert queue.flush().ok
+
+    ws.calls = 0
+    assert [list(r.values()) for r in repo.records("performances")] == ws.rows
+    assert ws.calls == 1
+
+
+def test_invalidate_false_leaves_the_snapshot_to_the_caller():
+    ws, repo = make_repo(numbered(2))
+    before = repo.snapshot("performances")
+    queue = WriteQueue(repo, "performances")
+    queue.update_cell(2, 2, "KLCC")
+    assert queue.flush(invalidate=False).ok
+    ws.calls = 0
+    assert repo.snapshot("performances") is before and ws.calls == 0
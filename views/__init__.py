@@ -0,0 +1,16 @@
+# --- PAGES ---
+# One module per page, each with a render() function. lyrics.py imports a page
+# the first time it is opened, and a page reads only the worksheets it shows.
+# Search boxes, the performance controller and the token forms are
+# st.fragment functions, so using them reruns that block, not the whole app.
+
+PAGES = {
+    "📍 Performance Venues & Tokens": "views.tokens",
+    "📖 View Lyrics/Lihat Lirik": "views.view_lyrics",
+    "➕ Add New Song/Masukkan lirik Lagu baru": "views.add_song",
+    "🌐 Search Lyrics Online": "views.search_online",
+    "👥 Meet The Members": "views.members",
+    "🎤 Performance Mode": "views.performance",
+    "🎞️ Past Performances/ Persembahan lalu": "views.videos",
+    "📈 App Performance (admin)": "views.dashboard",
+}
@@ -0,0 +1,83 @@
+import pandas as pd
+import streamlit as st
+
+from sibuskerz.bulk_import import ADDED, import_songs, parse_csv, parse_setlist
+from views.resources import WORKSHEET_NAME1, add_new_song, fragment, get_lyrics_client, get_repository, get_song_index
+
+
+def render():
+    st.subheader("Add a new song's lyric to your collection")
+    password = st.text_input("Enter admin password to continue:", type="password")
+
+    if password == st.secrets["admin_password"]:
+        st.success("Access granted.")
+
+        single_tab, bulk_tab = st.tabs(["Single song", "Bulk import"])
+
+        with single_tab:
+            single_song_form()
+
+        with bulk_tab:
+            bulk_import_form()
+
+    elif password:
+        st.error("Incorrect password.")
+
+
+@fragment
+def single_song_form():
+    repo = get_repository()
+    with st.form("add_song_form"):
+        new_title = st.text_input("🎵 Song Title")
+        new_artist = st.text_input("🎤 Artist Name")
+        new_lyrics = st.text_area("📝 Paste Full Lyrics Here", height=300)
+        add_anyway = st.checkbox("Add even if it looks like a duplicate")
+        submitted = st.form_submit_button("Add Song")
+
+        if submitted:
+            if new_title and new_artist and new_lyrics:
+                song_index = get_song_index(repo)
+                duplicates = song_index.find_duplicates(new_title, new_artist)
+                if duplicates and not add_anyway:
+                    similar = ", ".join(f"'{song_index.label(sid)}'" for sid in duplicates)
+                    st.warning(f"⚠️ This looks like a song already in the collection: {similar}. Tick the box above to add it anyway.")
+                else:
+                    report = add_new_song(repo, new_title, new_artist, new_lyrics)
+                    if report.ok:
+                        st.success(f"✅ '{new_title}' by {new_artist} has been added!")
+                    else:
+                        st.error(f"❌ Could not save the song: {report.summary()}")
+            else:
+                st.error("❌ Please complete all fields.")
+
+
+# --- BULK IMPORT ---
+@fragment
+def bulk_import_form():
+    st.caption("Paste a setlist (one 'Title - Artist' per line) or upload a CSV with Title, Artist and optional Lyrics columns. Missing lyrics are fetched from Lyrics.ovh.")
+    with st.form("bulk_import_form"):
+        setlist_text = st.text_area("📋 Setlist", height=200, placeholder="Kerana Mu - Siti Nurhaliza\nIsabella - Search")
+        setlist_csv = st.file_uploader("📄 or a CSV file", type=["csv"])
+        import_btn = st.form_submit_button("Import songs")
+
+    if not import_btn:
+        return
+    try:
+        items = parse_csv(setlist_csv.getvalue()) if setlist_csv else parse_setlist(setlist_text)
+    except ValueError as exc:
+        st.error(f"❌ {exc}")
+        return
+
+    progress = st.progress(0.0, text="Looking up lyrics...")
+    def on_progress(done, total, result):
+        progress.progress(done / total, text=f"Looking up lyrics... {done}/{total}")
+
+    repo = get_repository()
+    items, report = import_songs(repo, WORKSHEET_NAME1, items, get_song_index(repo), get_lyrics_client(), on_progress=on_progress)
+    progress.progress(1.0, text="Done")
+    added = sum(item.status == ADDED for item in items)
+    if report is not None and not report.ok:
+        st.error(f"❌ Could not save the new songs: {report.summary()}")
+    else:
+        st.success(f"✅ {added} of {len(items)} songs added.")
+    st.dataframe(pd.DataFrame([item.as_row() for item in items]))
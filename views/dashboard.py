@@ -0,0 +1,64 @@
+import pandas as pd
+import streamlit as st
+
+from sibuskerz.metrics import REGISTRY
+
+# Where rerun time goes, from the process-wide metrics registry: whole
+# reruns per page (fragment reruns are listed under "page › fragment") and
+# the instrumented operations inside them.
+
+
+def render():
+    st.subheader("📈 App Performance")
+    password = st.text_input("Enter admin password to continue:", type="password")
+
+    if password == st.secrets["admin_password"]:
+        dashboard()
+    elif password:
+        st.error("Incorrect password.")
+
+
+def dashboard():
+    st.button("🔄 Update")  # a click reruns the page with fresh numbers
+
+    calls = REGISTRY.per_rerun("sheets_api_calls")
+    downloaded = REGISTRY.per_rerun("http_bytes")
+    pages = REGISTRY.percentiles(by="page")
+    st.markdown("### Reruns per page")
+    if pages:
+        st.dataframe(pd.DataFrame(
+            [(page, n, p50, p95, calls.get(page, 0.0), downloaded.get(page, 0.0) / 1024)
+             for page, (n, p50, p95) in pages.items()],
+            columns=["Page", "Reruns", "p50 ms", "p95 ms", "API calls / rerun", "KB / rerun"],
+        ).round(2), hide_index=True)
+    else:
+        st.info("No reruns recorded yet.")
+
+    st.markdown("### Operations")
+    ops = REGISTRY.percentiles(by="op")
+    if ops:
+        st.dataframe(pd.DataFrame(
+            [(op, n, p50, p95) for op, (n, p50, p95) in ops.items()],
+            columns=["Operation", "Samples", "p50 ms", "p95 ms"],
+        ).round(2), hide_index=True)
+
+    counters = REGISTRY.counters()
+    if counters:
+        cols = st.columns(4)
+        cols[0].metric("Sheets API calls", counters.get("sheets_api_calls", 0))
+        cols[1].metric("HTTP requests", counters.get("http_requests", 0))
+        cols[2].metric("Downloaded", f"{counters.get('http_bytes', 0) / 1024 / 1024:.1f} MB")
+        cols[3].metric("Cache hits", counters.get("sheets_hits", 0))
+
+    with st.expander("Recent reruns (structured log)"):
+        st.dataframe(pd.DataFrame(
+            [(r["page"], r["duration_ms"], r["counters"].get("sheets_api_calls", 0),
+              r["counters"].get("http_bytes", 0), ", ".join(f"{op} {ms:.0f}ms" for op, ms in r["spans"].items()))
+             for r in reversed(REGISTRY.reruns())],
+            columns=["Page", "ms", "API calls", "bytes", "spans"],
+        ), hide_index=True)
+
+    with st.expander("Prometheus export"):
+        text = REGISTRY.prometheus()
+        st.code(text, language="text")
+        st.download_button("Download metrics.prom", text, file_name="metrics.prom", mime="text/plain")
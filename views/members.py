@@ -0,0 +1,20 @@
+import streamlit as st
+
+from views.resources import MEMBER_PHOTO_WIDTH, get_image_pipeline, get_repository, load_members
+
+
+def render():
+    st.subheader("🎸 SiBuskerz Members")
+    members = load_members(get_repository())
+    images = get_image_pipeline()
+
+    for member in members:
+        with st.container():
+            cols = st.columns([1, 2])
+            with cols[0]:
+                st.image(images.thumbnail(member["Photo"], MEMBER_PHOTO_WIDTH), width='stretch')
+            with cols[1]:
+                st.markdown(f"### {member['Name']}")
+                st.markdown(f"**Role:** {member['Role']}")
+                st.markdown(f"*{member['Bio']}*")
+        st.markdown("---")
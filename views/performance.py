@@ -0,0 +1,188 @@
+import secrets
+
+import streamlit as st
+
+from sibuskerz.live import CODE_LENGTH
+from sibuskerz.setlist import MAX_SONGS, Setlist
+from views.resources import (
+    FOLLOW_INTERVAL, fragment, get_live_hub, get_repository, get_setlist_store, get_song_index,
+)
+
+
+def render():
+    st.subheader("🎤 SiBuskerz Performance Mode/Pilih Lagu-lagu untuk persembahan")
+    live = current_live()
+    if live is None and st.session_state.pop("live_code", None):
+        st.info("The shared performance has ended.")
+    if live is not None and live.driver != device_id():
+        live_follower()
+        return
+    setlist_picker()
+    setlist_controller()
+
+
+def device_id():
+    # tells the phones in a shared performance apart
+    return st.session_state.setdefault("device_id", secrets.token_hex(4))
+
+
+def current_live():
+    code = st.session_state.get("live_code")
+    return get_live_hub().get(code) if code else None
+
+
+def end_performance():
+    live = current_live()
+    if live is not None and live.driver == device_id():
+        get_live_hub().end(live.code)
+    st.session_state.pop("live_code", None)
+    st.session_state.pop("setlist", None)
+
+
+@fragment
+def setlist_picker():
+    # Performance Mode is served from local data only, so a stalled network
+    # never freezes the lyrics screen mid-set
+    song_index = get_song_index(get_repository(), local=True)
+    setlists = get_setlist_store()
+
+    search_term = st.text_input("🔍 Search and filter songs (Performance Mode)")
+    song_ids = song_index.search(search_term)
+
+    selected_songs = st.multiselect(f"🎶 Pilih maksima {MAX_SONGS} lagu untuk nyanyi", options=song_ids, format_func=song_index.label, max_selections=MAX_SONGS)
+
+    if selected_songs:
+        if st.button("🎬 Start Performance"):
+            # resolve every song now; moving through the set afterwards
+            # never touches the sheet
+            end_performance()
+            st.session_state.setlist = Setlist.build(song_index, selected_songs)
+            st.rerun()  # the controller is a separate fragment
+
+    saved_names = setlists.names()
+    if saved_names:
+        col1, col2 = st.columns([3, 1])
+        saved_choice = col1.selectbox("📂 Saved setlists", saved_names)
+        if col2.button("Load setlist"):
+            end_performance()
+            st.session_state.setlist = setlists.load(saved_choice).refreshed(song_index)
+            st.rerun()
+
+    # sessions aren't listed on this public page: the driver reads the code out
+    col1, col2 = st.columns([3, 1])
+    code = col1.text_input("📡 Follow a bandmate's performance", placeholder="Code, e.g. K7QF", max_chars=CODE_LENGTH)
+    if col2.button("Follow") and code.strip():
+        live = get_live_hub().join(code, device_id())
+        if live is None:
+            st.error("No shared performance with that code.")
+        else:
+            st.session_state.live_code = live.code
+            st.rerun()
+
+
+# --- CURRENT SETLIST ---
+@fragment
+def setlist_controller():
+    setlist = st.session_state.get("setlist")
+    if setlist is None:
+        return
+    live = current_live()
+    if live is not None and live.driver != device_id():
+        st.rerun()  # a bandmate took over: show the follower view
+    # while shared, moves go through the live session so followers see them
+    controls = live if live is not None else setlist
+
+    song = setlist.current
+    if song is not None:
+        st.markdown(f"### 🎶 Now Performing ({setlist.index + 1}/{len(setlist)}): **{song.title}** by *{song.artist}*")
+        st.markdown(song.html, unsafe_allow_html=True)
+
+        # st.text_area("Lyrics", value=song.lyrics, height=500, label_visibility="collapsed", disabled=True)
+
+        if setlist.upcoming is not None:
+            st.caption(f"Up next: {setlist.upcoming.label}")
+
+        # callbacks move the cursor before the rerun renders, so one
+        # click shows the new song straight away
+        col1, col2, col3 = st.columns([1, 1, 1])
+        col1.button("⏮️ Previous Song", on_click=controls.previous, disabled=setlist.index == 0)
+        col2.button("⏭️ Next Song", on_click=controls.next)
+        col3.button("🛑 End Performance", on_click=end_performance)
+
+        # keyed by position so the box follows Next/Previous
+        jump_key = f"jump_to_{setlist.index}"
+        st.selectbox(
+            "Jump to song", range(len(setlist)), index=setlist.index, key=jump_key,
+            format_func=lambda i: f"{i + 1}. {setlist.songs[i].label}",
+            on_change=lambda: controls.jump(st.session_state[jump_key]),
+        )
+
+        share_panel(setlist, live)
+        setlist.prefetch()  # the current song is already on its way to the browser
+
+        with st.expander("💾 Save this setlist for another gig"):
+            setlist_name = st.text_input("Setlist name", value=setlist.name)
+            if st.button("Save setlist") and setlist_name.strip():
+                get_setlist_store().save(setlist, setlist_name.strip())
+                st.success(f"Saved '{setlist_name.strip()}'.")
+
+    else:
+        st.success("✅ You've finished your performance!")
+        col1, col2 = st.columns([1, 1])
+        col1.button("🔁 Play Again", on_click=controls.restart)
+        col2.button("Reset", on_click=end_performance)
+
+
+# --- SHARED PERFORMANCE ---
+# The driver's phone publishes its cursor through the live hub; the others
+# follow it from a timed fragment that only reads that in-memory cursor.
+def share_panel(setlist, live):
+    if live is None:
+        st.button("📡 Share with the band", on_click=start_sharing, args=(setlist,))
+        return
+    col1, col2 = st.columns([3, 1])
+    col1.info(f"📡 Shared as **{live.code}** · {live.following()} phone(s) following")
+    col2.button("Stop sharing", on_click=stop_sharing, args=(live,))
+
+
+def start_sharing(setlist):
+    st.session_state.live_code = get_live_hub().start(setlist, device_id()).code
+
+
+def stop_sharing(live):
+    get_live_hub().end(live.code)
+    st.session_state.pop("live_code", None)
+
+
+def take_over(live):
+    live.take_over(device_id())  # only phones that joined with the code get here
+    st.session_state.setlist = live.setlist
+
+
+def stop_following(live):
+    live.leave(device_id())
+    st.session_state.pop("live_code", None)
+
+
+@fragment(run_every=FOLLOW_INTERVAL)
+def live_follower():
+    live = current_live()
+    if live is None or live.driver == device_id():
+        st.rerun()  # ended, or this phone took over: back to the full page
+
+    live.poll(device_id())
+    setlist = live.setlist
+    st.caption(f"📡 Following {live.code} · {live.following()} phone(s) following")
+    song = setlist.current
+    if song is not None:
+        st.markdown(f"### 🎶 Now Performing ({setlist.index + 1}/{len(setlist)}): **{song.title}** by *{song.artist}*")
+        st.markdown(song.html, unsafe_allow_html=True)
+        if setlist.upcoming is not None:
+            st.caption(f"Up next: {setlist.upcoming.label}")
+        setlist.prefetch()
+    else:
+        st.success("✅ The set is finished.")
+
+    col1, col2 = st.columns([1, 1])
+    col1.button("🎛️ Take over", on_click=take_over, args=(live,))
+    col2.button("Stop following", on_click=stop_following, args=(live,))
@@ -0,0 +1,113 @@
+import functools
+from collections import Counter
+from contextlib import contextmanager
+
+import streamlit as st
+
+from sibuskerz import metrics
+from sibuskerz.config import (
+    CACHE_TTL, IMAGE_CACHE_DIR, LEDGER_DB, LYRICS_CACHE_DB, OFFLINE_SHEETS, SETLIST_DB, SHEET_ID, SNAPSHOT_DB,
+    SYNC_INTERVAL, WORKSHEET_NAME1, WORKSHEET_NAME2, WORKSHEET_NAME3, WORKSHEET_NAME4, WORKSHEET_NAMES,
+)
+from sibuskerz.connect import open_repository, open_worksheets
+from sibuskerz.images import ImagePipeline
+from sibuskerz.ledger import Ledger
+from sibuskerz.live import LiveHub
+from sibuskerz.lyrics_ovh import LyricsClient, ResponseCache
+from sibuskerz.offline import SnapshotSync
+from sibuskerz.setlist import SetlistStore
+from sibuskerz.songs import LYRICS_HEADER, SongIndex, lyrics_row
+from sibuskerz.writes import WriteQueue
+from views import PAGES
+
+# Shared by every page module: sheet access, the offline store and the other
+# process-wide resources. Everything here is cached with st.cache_resource, so
+# a page only pays for what it actually calls.
+
+# --- CONFIG ---
+# sheet ids, worksheet names and cache paths: sibuskerz.config
+SIDEBAR_IMAGE_WIDTH = 600  # px needed for the sidebar on a 2x screen
+MEMBER_PHOTO_WIDTH = 640  # px needed for the 1/3 photo column
+FOLLOW_INTERVAL = 1  # seconds between checks of a shared performance's cursor
+PAGE_LABELS = {module: label for label, module in PAGES.items()}
+
+# --- GOOGLE SHEETS SETUP ---
+@st.cache_resource
+def get_worksheets():
+    worksheets = open_worksheets(dict(st.secrets["gcp_service_account"]), SHEET_ID, on_response=count_http)
+    return tuple(worksheets[name] for name in WORKSHEET_NAMES)
+
+def count_http(response, *args, **kwargs):
+    # every Sheets HTTP round-trip, retries included, and its payload size
+    metrics.count("http_requests")
+    metrics.count("http_bytes", len(response.content))
+
+@contextmanager
+def session_rerun(page):
+    # one rerun (or fragment run) of this session, reported to the metrics
+    # registry; its counters also add up in st.session_state.sheet_usage,
+    # which leaves out other sessions and the background sync
+    outer = metrics.REGISTRY.current() is None
+    record = None
+    try:
+        with metrics.REGISTRY.rerun(page) as record:
+            yield record
+    finally:
+        if outer and record is not None:
+            st.session_state.setdefault("sheet_usage", Counter()).update(record["counters"])
+
+def fragment(func=None, *, run_every=None):
+    # st.fragment that reports its own reruns to the metrics registry
+    if func is None:
+        return functools.partial(fragment, run_every=run_every)
+    label = f"{PAGE_LABELS.get(func.__module__, func.__module__)} › {func.__name__}"
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        with session_rerun(label):
+            return func(*args, **kwargs)
+    return st.fragment(run, run_every=run_every)
+
+@st.cache_resource
+def get_repository():
+    return open_repository(lambda: dict(zip(WORKSHEET_NAMES, get_worksheets())), snapshot_db=SNAPSHOT_DB, ttl=CACHE_TTL)
+
+@st.cache_resource
+def get_snapshot_sync():
+    # keeps the offline copy (and the song index) current while online
+    warm = lambda repo: get_song_index(repo, local=True)
+    return SnapshotSync(get_repository(), OFFLINE_SHEETS, interval=SYNC_INTERVAL, warm=warm).start()
+
+@st.cache_resource
+def get_image_pipeline():
+    return ImagePipeline(IMAGE_CACHE_DIR)
+
+@st.cache_resource
+def get_setlist_store():
+    return SetlistStore(SETLIST_DB)
+
+@st.cache_resource
+def get_live_hub():
+    return LiveHub()
+
+@st.cache_resource
+def get_ledger():
+    return Ledger(LEDGER_DB)
+
+def get_song_index(repo, local=False):
+    snapshot = repo.local(WORKSHEET_NAME1) if local else repo.snapshot(WORKSHEET_NAME1)
+    return snapshot.derived("song_index", SongIndex)
+
+def add_new_song(repo, title, artist, lyrics):
+    row = lyrics_row(title.strip(), artist.strip(), lyrics.strip())
+    queue = WriteQueue(repo, WORKSHEET_NAME1)
+    queue.append(row, record=dict(zip(LYRICS_HEADER, row)))
+    return queue.flush()
+
+def load_members(repo):
+    return repo.records(WORKSHEET_NAME2)
+
+
+@st.cache_resource
+def get_lyrics_client():
+    return LyricsClient(cache=ResponseCache(LYRICS_CACHE_DB))
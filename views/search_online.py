@@ -0,0 +1,37 @@
+import streamlit as st
+
+from sibuskerz.lyrics_ovh import ERROR
+from views.resources import add_new_song, fragment, get_lyrics_client, get_repository
+
+
+def render():
+    st.subheader("Search lyrics from the internet (Lyrics.ovh)")
+    online_search()
+
+
+@fragment
+def online_search():
+    with st.form("search_online"):
+        artist = st.text_input("Artist Name")
+        title = st.text_input("Song Title")
+        search = st.form_submit_button("Search")
+
+    # keep the result across reruns so the save button below still has it
+    if search and artist and title:
+        st.session_state.online_result = get_lyrics_client().lookup(artist, title)
+
+    result = st.session_state.get("online_result")
+    if result is not None:
+        if result.found:
+            st.text_area("Lyrics Result", value=result.lyrics, height=400)
+            if st.button("Save to Google Sheet"):
+                report = add_new_song(get_repository(), result.title, result.artist, result.lyrics)
+                if report.ok:
+                    st.success(f"✅ '{result.title}' by {result.artist} added!")
+                    st.session_state.pop("online_result", None)
+                else:
+                    st.error(f"❌ Could not save the song: {report.summary()}")
+        elif result.status == ERROR:
+            st.error("Error fetching lyrics.")
+        else:
+            st.info("Lyrics not found online.")
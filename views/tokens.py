@@ -0,0 +1,242 @@
+import pandas as pd
+import streamlit as st
+
+from sibuskerz.performances import PerformanceTable, StaleRowError
+from sibuskerz.settlement import settle, split_performance, to_ringgit
+from views.resources import WORKSHEET_NAME2, WORKSHEET_NAME4, fragment, get_ledger, get_repository
+
+
+def render():
+    st.subheader("🎪 Jadual Persembahan SiBuskerz & Token Penghargaan")
+    password = st.text_input("Enter admin password to continue:", type="password")
+
+    if password == st.secrets["admin_password"]:
+        st.success("Access granted.")
+        performances_admin()
+    elif password:
+        st.error("Incorrect password.")
+
+
+def performances_admin():
+    repo = get_repository()
+
+    # Load data
+    perf_table = PerformanceTable(repo, WORKSHEET_NAME4)
+    migration = perf_table.ensure_ids(extra_columns=["PaidStatus"])
+    if migration is not None and not migration.ok:
+        st.error(f"❌ Could not add the ID/Version columns: {migration.summary()}")
+        return
+
+    df_perf = perf_table.frame()
+    df_members = repo.frame(WORKSHEET_NAME2)
+    member_names = df_members['Name'].tolist() if not df_members.empty else []
+
+    ledger = get_ledger()
+    if ledger.is_empty():
+        for perf_id, exc in ledger.backfill(perf_table.snapshot().records):
+            st.warning(f"⚠️ {perf_id} not added to the ledger: {exc}")
+
+    # Display all performances
+    if not df_perf.empty:
+        st.markdown("### 🎤 All Performances (Upcoming & Done)")
+        st.dataframe(df_perf)
+
+        # --- PROCESS DONE PERFORMANCES (Unpaid only) ---
+        done_perf = perf_table.unpaid()
+
+        if done_perf.empty:
+            st.info("✅ Semua persembahan telah dibayar.")
+        else:
+            settlement = settle(done_perf)
+            totals = settlement.totals
+
+            st.markdown(f"""
+            ### 💰 Token Summary (Belum Dibayar Sahaja)
+
+            - 🧑‍🤝‍🧑 **Jumlah Ahli Kumpulan**: {len(df_members)}
+            - 👥 **Jumlah artis terlibat dalam persembahan ini**: {totals['performers']}
+            - 🎁 **Jumlah Token penghargaan (belum dibayar)**: RM {totals['total_token']:.2f}
+            - 💸 **Jumlah bersih untuk setiap ahli**: RM {totals['net_per_person']:.2f}
+            - 🎧 **Yuran Peralatan Audio (1 share)**: RM {totals['net_per_person']:.2f}
+            - 🧾 **Jumlah pembahagian token kepada ahli**: RM {totals['total_distributed']:.2f}
+            - 🎛️ **Jumlah Yuran Peralatan**: RM {totals['total_equipment']:.2f}
+            - ❓ **Token baki belum jelas**: RM {totals['total_undistributed']:.2f}
+            """)
+
+            # --- SUMMARY PER MEMBER ---
+            st.markdown("### 📊 Ringkasan Jumlah Yang Ahli Terima (Belum Dibayar)")
+            st.dataframe(settlement.members)
+
+            member_lookup(settlement)
+
+            # --- ✅ MARK AS PAID BUTTON ---
+            if st.button("✅ Tandakan Semua Persembahan Ini Sebagai Sudah Dibayar"):
+                # rows are addressed by ID and written in one batch request
+                try:
+                    report = perf_table.mark_paid(done_perf, ledger)
+                except (StaleRowError, ValueError) as exc:
+                    st.error(f"❗ {exc}")
+                    return
+                if report.ok:
+                    st.success("💸 Semua persembahan ini telah ditandakan sebagai 'Paid'.")
+                    st.rerun()
+                else:
+                    st.error(f"❌ {report.summary()}")
+
+            else:
+                st.info("Tiada rekod persembahan yang dijumpai.")
+
+    ledger_panel(member_names)
+    performance_form(perf_table, member_names)
+
+
+@fragment
+def member_lookup(settlement):
+    st.markdown("### 🔍 Ketahui Jumlah Token Anda")
+    selected_member = st.selectbox("Pilih Nama Anda", settlement.members["Member"].tolist())
+    personal_earning = settlement.earned(selected_member)
+    st.success(f"💰 {selected_member} punya jumlah token yang **belum dibayar**: **RM {personal_earning:.2f}**")
+
+
+# --- MEMBER EARNINGS LEDGER (paid and unpaid history) ---
+@fragment
+def ledger_panel(member_names):
+    ledger = get_ledger()
+    st.markdown("### 📒 Lejar Pendapatan Ahli")
+    ledger_member = st.selectbox("Pilih Ahli", member_names, key="ledger_member")
+    if ledger_member:
+        earned = ledger.earned(ledger_member)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Tahun ini", f"RM {earned['year']:.2f}")
+        col2.metric("Belum dibayar", f"RM {earned['unpaid']:.2f}")
+        col3.metric("Jumlah keseluruhan", f"RM {earned['total']:.2f}")
+    with st.expander("Semua ahli (jumlah keseluruhan)"):
+        st.dataframe(pd.DataFrame(
+            [(member, float(amount)) for member, amount in ledger.balances()],
+            columns=["Member", "TotalEarned"],
+        ))
+
+
+# --- ADD OR UPDATE PERFORMANCE FORM ---
+@fragment
+def performance_form(perf_table, member_names):
+    # a submit reruns only this form; a successful write reruns the app so
+    # the tables above pick up the change
+    ledger = get_ledger()
+    df_perf = perf_table.frame()
+    st.markdown("### ➕ Tambah atau Kemaskini Info Persembahan")
+
+    # Check for first occurrence of "Upcoming"
+    upcoming_perf = df_perf[df_perf['Status'] == 'Upcoming'] if not df_perf.empty else df_perf
+
+    if not upcoming_perf.empty:
+        first_upcoming = upcoming_perf.iloc[0]
+        st.info("📅 Satu persembahan akan datang dijumpai. Anda boleh kemaskini atau padamkan.")
+
+        with st.form("update_perf_form", clear_on_submit=False):
+            perf_date = st.date_input("📅 Tarikh Persembahan", pd.to_datetime(first_upcoming['Date']))
+            venue = st.text_input("📍 Nama Lokasi", first_upcoming['Venue'])
+            status = st.selectbox("Status", ["Upcoming", "Done"], index=1 if first_upcoming['Status'] == "Done" else 0)
+            token = st.number_input("🎁 Jumlah Token Diterima (untuk 'Done' sahaja)", min_value=0.0, value=float(first_upcoming['TotalToken']) if first_upcoming['TotalToken'] else 0.0
+, step=1.0)
+            notes = st.text_area("📝 Nota (pilihan)", first_upcoming.get('Notes', ''))
+            prev_performers = [p.strip() for p in str(first_upcoming.get('Performers', '')).split(',') if p.strip()]
+            attendees = st.multiselect("🎤 Siapa yang buat persembahan?", member_names, default=prev_performers)
+
+            col1, col2 = st.columns(2)
+            update_btn = col1.form_submit_button("✅ Kemaskini kepada Done or Edit")
+            cancel_btn = col2.form_submit_button("❌ Batal/Padam persembahan ini")
+
+            perf_id = first_upcoming['ID']
+            perf_version = first_upcoming['Version']
+
+            if cancel_btn:
+                try:
+                    report = perf_table.delete(perf_id, perf_version)
+                except StaleRowError as exc:
+                    st.error(f"❗ {exc}")
+                    return
+                if report.ok:
+                    st.success("❌ Persembahan Telah Dibatalkan dan dipadamkan.")
+                    st.rerun()
+                else:
+                    st.error(f"❌ {report.summary()}")
+
+            if update_btn:
+                if status == "Done" and not attendees:
+                    st.warning("⚠️ Sila pilih artis yang terlibat sebelum penandaan sebagai Done.")
+                    return
+
+                if status == "Done":
+                    # same half-up sen split as settle() and the ledger
+                    _, share_sen, _ = split_performance(token, ", ".join(attendees))
+                    shared = float(to_ringgit(share_sen))
+                    equipment = shared
+                else:
+                    shared = ""
+                    equipment = ""
+
+                try:
+                    report = perf_table.update(perf_id, {
+                        "Date": str(perf_date),
+                        "Venue": venue,
+                        "Status": status,
+                        "TotalToken": token if token else "",
+                        "SharedPerPerson": shared,
+                        "EquipmentShare": equipment,
+                        "Notes": notes,
+                        "Performers": ", ".join(attendees)
+                    }, perf_version)
+                except StaleRowError as exc:
+                    st.error(f"❗ {exc}")
+                    return
+                if report.ok:
+                    if status == "Done":
+                        ledger.record_done(perf_id, str(perf_date), token, ", ".join(attendees))
+                    st.success("✅ Persembahan telah dikemaskini.")
+                    st.rerun()
+                else:
+                    st.error(f"❌ {report.summary()}")
+    else:
+        st.info("🆕 Persembahan akan datang tidak dijumpai. Anda boleh tambah yang baru.")
+        with st.form("add_perf_form", clear_on_submit=True):
+            perf_date = st.date_input("📅 Tarikh Persembahan")
+            venue = st.text_input("📍 Nama Lokasi")
+            status = st.selectbox("Status", ["Upcoming", "Done"])
+            token = st.number_input("🎁 Jumlah Kutipan Token  (untuk 'Done' sahaja)", min_value=0.0, value=0.0, step=1.0)
+            notes = st.text_area("📝 Nota (pilihan sahaja)")
+            attendees = st.multiselect("🎤 Siapa akan buat persembahan?", member_names)
+
+            submitted = st.form_submit_button("➕ Tambah Persembahan")
+
+            if submitted:
+                if status == "Done" and not attendees:
+                    st.warning("⚠️ Pilih sekurang-kurangnya satu artis sebelum tanda sebagai Done.")
+                    return
+
+                if status == "Done":
+                    # same half-up sen split as settle() and the ledger
+                    _, share_sen, _ = split_performance(token, ", ".join(attendees))
+                    shared = float(to_ringgit(share_sen))
+                    equipment = shared
+                else:
+                    shared = ""
+                    equipment = ""
+
+                perf_id, report = perf_table.add({
+                    "Date": str(perf_date),
+                    "Venue": venue,
+                    "Status": status,
+                    "TotalToken": token if token else "",
+                    "SharedPerPerson": shared,
+                    "EquipmentShare": equipment,
+                    "Notes": notes,
+                    "Performers": ", ".join(attendees)
+                })
+                if report.ok:
+                    if status == "Done":
+                        ledger.record_done(perf_id, str(perf_date), token, ", ".join(attendees))
+                    st.success("✅ Persembahan baharu telah dimasukkan.")
+                    st.rerun()
+                else:
+                    st.error(f"❌ {report.summary()}")
@@ -0,0 +1,70 @@
+import streamlit as st
+
+from sibuskerz.videos import FILE, LINK, VideoGallery
+from views.resources import WORKSHEET_NAME3, fragment, get_repository
+
+
+def render():
+    st.subheader("🎬 SiBuskerz Video Performances")
+
+    gallery = get_repository().snapshot(WORKSHEET_NAME3).derived("video_gallery", VideoGallery)
+
+    # bad links are listed here once instead of breaking the grid
+    if gallery.problems:
+        with st.expander(f"⚠️ {len(gallery.problems)} video row(s) could not be shown"):
+            for row, title, reason in gallery.problems:
+                st.caption(f"Row {row} ({title or 'untitled'}): {reason}")
+
+    if gallery:
+        gallery_page(gallery)
+    else:
+        st.info("No video performances listed yet.")
+
+
+def play(position):
+    st.session_state.video_playing = position
+
+
+def turn_page(step, pages):
+    st.session_state.video_page = max(1, min(st.session_state.get("video_page", 1) + step, pages))
+    st.session_state.pop("video_playing", None)
+
+
+@fragment
+def gallery_page(gallery):
+    # only thumbnails are sent until a video is clicked, and only one
+    # player is loaded at a time
+    number = min(st.session_state.get("video_page", 1), gallery.pages)
+    playing = st.session_state.get("video_playing")
+
+    videos = gallery.page(number)
+    for i in range(0, len(videos), 2):
+        cols = st.columns(2)
+        for j in range(2):
+            if i + j < len(videos):
+                position, vid, embed = videos[i + j]
+                with cols[j]:
+                    st.markdown(f"**🎵 {vid.get('Title', '')}**")
+                    st.markdown(f"*{vid.get('Description', '')}*")
+
+                    if embed.kind == LINK:
+                        st.link_button("🔗 Open video", embed.url)
+                    elif position == playing:
+                        if embed.kind == FILE:
+                            st.video(embed.url, autoplay=True)
+                        else:
+                            st.markdown(f"""
+                                <iframe src="{embed.embed_url}" width="100%" height="315" allow="autoplay; fullscreen" allowfullscreen></iframe>
+                            """, unsafe_allow_html=True)
+                    else:
+                        if embed.thumbnail_url:
+                            st.image(embed.thumbnail_url, width='stretch')
+                        st.button("▶️ Play", key=f"play_{position}", on_click=play, args=(position,))
+
+                    st.markdown("---")
+
+    if gallery.pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        col1.button("⬅️ Previous", on_click=turn_page, args=(-1, gallery.pages), disabled=number == 1)
+        col2.caption(f"Page {number} of {gallery.pages} · {len(gallery)} videos")
+        col3.button("Next ➡️", on_click=turn_page, args=(1, gallery.pages), disabled=number == gallery.pages)
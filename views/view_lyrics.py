@@ -0,0 +1,23 @@
+import streamlit as st
+
+from sibuskerz.setlist import lyrics_html
+from views.resources import fragment, get_repository, get_song_index
+
+
+def render():
+    st.subheader("Select a song to view lyrics")
+    song_browser()
+
+
+@fragment
+def song_browser():
+    song_index = get_song_index(get_repository())
+
+    search_term = st.text_input("🔍 Search title, artist or a line of the lyrics")
+    song_ids = song_index.search(search_term)
+
+    selection = st.selectbox("Song List", song_ids, format_func=song_index.label)
+
+    if selection:
+        st.markdown(f"### 🎵 {song_index.title(selection)} by {song_index.artist(selection)}")
+        st.markdown(lyrics_html(song_index.lyrics(selection)), unsafe_allow_html=True)